@@ -0,0 +1,165 @@
+"""
+Throughput and recall of MinHash/LSH near-duplicate resume detection.
+
+Generates ``--resumes`` synthetic resumes (Zipf-distributed words) and
+plants edited copies of some of them, at several edit rates. Signs the
+corpus in one process and across ``--processes`` pool processes, then runs
+every signature through the LSH index the batch rebuild uses and compares
+the flagged pairs with exact shingle Jaccard similarity:
+
+- recall: planted pairs at or above the threshold that were flagged
+- precision: flagged pairs that really are at or above the threshold
+
+Runs in-process; no database needed.
+
+Usage:
+    python -m benchmarks.duplicates
+    python -m benchmarks.duplicates --resumes 100000 --processes 8
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.matching.duplicates import (
+    DUPLICATE_THRESHOLD,
+    LshIndex,
+    _signatures,
+    shingle_hashes,
+)
+
+VOCABULARY_SIZE = 20000
+EDIT_RATES = [0.005, 0.01, 0.02, 0.03, 0.04, 0.06, 0.1, 0.2]
+# planted pairs are reported by their exact Jaccard similarity
+SIMILARITY_BINS = [1.0, 0.95, 0.9, 0.85, 0.8, 0.75, 0.7, 0.5, 0.0]
+
+
+def build_corpus(args) -> tuple[list[tuple[str, str]], list[tuple[str, str, float]]]:
+    rng = random.Random(5)
+    words = [f"w{rank}" for rank in range(VOCABULARY_SIZE)]
+    cumulative = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE))
+    )
+    corpus = []
+    for number in range(args.resumes):
+        length = rng.randint(300, 900)
+        text = " ".join(rng.choices(words, cum_weights=cumulative, k=length))
+        corpus.append((f"r{number}", text))
+
+    planted = []
+    copies = int(args.resumes * args.duplicate_share)
+    originals = rng.sample(range(args.resumes), copies)
+    for number, original in enumerate(originals):
+        rate = EDIT_RATES[number % len(EDIT_RATES)]
+        tokens = corpus[original][1].split()
+        for _ in range(max(1, int(len(tokens) * rate))):
+            position = rng.randrange(len(tokens))
+            edit = rng.random()
+            if edit < 0.6:
+                tokens[position] = rng.choice(words)
+            elif edit < 0.8:
+                tokens.insert(position, rng.choice(words))
+            elif len(tokens) > 1:
+                del tokens[position]
+        key = f"d{number}"
+        corpus.append((key, " ".join(tokens)))
+        planted.append((corpus[original][0], key, rate))
+    rng.shuffle(corpus)
+    return corpus, planted
+
+
+def sign(corpus, processes: int, chunk_size: int) -> tuple[list, float]:
+    chunks = [corpus[i : i + chunk_size] for i in range(0, len(corpus), chunk_size)]
+    started = time.perf_counter()
+    if processes <= 1:
+        results = [result for chunk in chunks for result in _signatures(chunk)]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            results = [
+                result
+                for signed in executor.map(_signatures, chunks)
+                for result in signed
+            ]
+    return results, time.perf_counter() - started
+
+
+def jaccard(first: str, second: str) -> float:
+    a = set(shingle_hashes(first).tolist())
+    b = set(shingle_hashes(second).tolist())
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--resumes", type=int, default=20000)
+    parser.add_argument("--duplicate-share", type=float, default=0.1)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    corpus, planted = build_corpus(args)
+    texts = dict(corpus)
+    print(f"{len(corpus):,} resumes, {len(planted):,} planted near-duplicates")
+
+    report = {"resumes": len(corpus)}
+    for processes in sorted({1, args.processes}):
+        results, elapsed = sign(corpus, processes, args.chunk_size)
+        rate = len(corpus) / elapsed
+        report[f"signed_per_second_{processes}p"] = round(rate)
+        print(f"signing, {processes} process(es): {rate:,.0f} resumes/s")
+
+    index = LshIndex()
+    flagged = set()
+    started = time.perf_counter()
+    for resume_id, _, signature, keys in results:
+        if signature is not None:
+            signature = np.frombuffer(signature, dtype=np.uint32)
+            for duplicate in index.add(resume_id, signature, keys):
+                flagged.add(frozenset((resume_id, duplicate)))
+    elapsed = time.perf_counter() - started
+    report["lsh_per_second"] = round(len(results) / elapsed)
+    print(f"LSH lookup + verify: {len(results) / elapsed:,.0f} resumes/s")
+
+    planted_similarity = [
+        (jaccard(texts[a], texts[b]), frozenset((a, b)) in flagged)
+        for a, b, _ in planted
+    ]
+    print(f"{'exact J':>11} {'pairs':>6} {'flagged':>8}")
+    report["by_similarity"] = {}
+    for high, low in itertools.pairwise(SIMILARITY_BINS):
+        in_bin = [
+            hit
+            for similarity, hit in planted_similarity
+            if low <= similarity < high or similarity == high == 1.0
+        ]
+        share = round(sum(in_bin) / len(in_bin), 3) if in_bin else None
+        report["by_similarity"][f"{low}-{high}"] = {
+            "pairs": len(in_bin),
+            "flagged": share,
+        }
+        print(f"{low:>4} - {high:<4} {len(in_bin):>6} {str(share):>8}")
+
+    positives = [hit for s, hit in planted_similarity if s >= DUPLICATE_THRESHOLD]
+    true_flags = sum(
+        jaccard(*(texts[key] for key in pair)) >= DUPLICATE_THRESHOLD
+        for pair in flagged
+    )
+    report["recall"] = round(sum(positives) / len(positives), 4) if positives else None
+    report["precision"] = round(true_flags / len(flagged), 4) if flagged else None
+    print(
+        f"recall {report['recall']}, precision {report['precision']} "
+        f"({len(flagged)} flagged pairs, threshold {DUPLICATE_THRESHOLD})"
+    )
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Local stand-in for the Azure OpenAI endpoints the API calls.
+
+Serves the realtime session endpoint, a mock realtime WebSocket for the
+server-side relay, and chat completions (both the Azure deployment path and
+the plain OpenAI path) with a log-normal latency distribution, optional 429
+injection and canned evaluation/reconstruction JSON, so load tests never
+leave the machine.
+
+Point the API at it with:
+
+    AZURE_OPENAI_REALTIME_ENDPOINT=http://127.0.0.1:8100/openai/v1/realtime/client_secrets
+    AZURE_OPENAI_EVAL_ENDPOINT=http://127.0.0.1:8100
+    AZURE_OPENAI_EVAL_API_KEY=fake
+    REALTIME_RELAY_ENABLED=true
+    AZURE_OPENAI_REALTIME_WS_ENDPOINT=ws://127.0.0.1:8100/openai/v1/realtime
+
+Usage:
+    python -m benchmarks.loadtest.fake_azure --port 8100 --median-ms 800 --rate-429 0.02
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import secrets
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+
+CANNED_EVALUATION = {
+    "prescreening_summary": (
+        "Expressed interest in the role and described relevant backend "
+        "experience. Indicated availability within 30 days and openness to a "
+        "hybrid setup. Compensation expectation stated in the JR currency."
+    ),
+    "highlights": [
+        "Notice Period: 30 days",
+        "Expected CTC: 28 LPA",
+        "Relocation: Open",
+        "Work Preference: Hybrid",
+    ],
+    "fit_score": 72,
+}
+
+
+class FakeAzureConfig:
+    median_ms: float = 800.0
+    sigma: float = 0.5
+    rate_429: float = 0.0
+    realtime_median_ms: float = 300.0
+
+
+config = FakeAzureConfig()
+app = FastAPI()
+
+
+async def _simulate_latency(median_ms: float) -> None:
+    # log-normal keeps a realistic long tail around the configured median
+    delay_ms = random.lognormvariate(math.log(median_ms), config.sigma)
+    await asyncio.sleep(delay_ms / 1000)
+
+
+def _throttled() -> JSONResponse | None:
+    if random.random() < config.rate_429:
+        return JSONResponse(
+            status_code=429,
+            headers={"retry-after-ms": "200"},
+            content={"error": {"code": "429", "message": "Rate limit exceeded"}},
+        )
+    return None
+
+
+def _reconstruction(messages: list) -> list:
+    """Echoes the transcript embedded in a reconstruction prompt as turns."""
+    content = messages[-1]["content"] if messages else ""
+    turns = content.count("'ai':")
+    return [
+        {
+            "ai": f"Question {i + 1}",
+            "user": f"Reconstructed answer {i + 1}",
+            "time_stamp": "2025-01-01 00:00:00",
+        }
+        for i in range(max(turns, 1))
+    ]
+
+
+async def _chat_completion(request: Request):
+    body = await request.json()
+    await _simulate_latency(config.median_ms)
+    if throttled := _throttled():
+        return throttled
+
+    messages = body.get("messages", [])
+    is_evaluation = any(m.get("role") == "system" for m in messages)
+    payload = CANNED_EVALUATION if is_evaluation else _reconstruction(messages)
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    content = json.dumps(payload)
+
+    return {
+        "id": f"chatcmpl-{secrets.token_hex(8)}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": prompt_tokens + len(content) // 4,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        },
+    }
+
+
+@app.post("/openai/deployments/{deployment}/chat/completions")
+async def azure_chat_completion(deployment: str, request: Request):
+    return await _chat_completion(request)
+
+
+@app.post("/v1/chat/completions")
+async def openai_chat_completion(request: Request):
+    return await _chat_completion(request)
+
+
+@app.post("/openai/v1/realtime/client_secrets")
+async def realtime_session(request: Request):
+    body = await request.json()
+    await _simulate_latency(config.realtime_median_ms)
+    if throttled := _throttled():
+        return throttled
+    return {
+        "value": f"ek_{secrets.token_hex(16)}",
+        "expires_at": int(time.time()) + 600,
+        "session": body.get("session", {}),
+    }
+
+
+async def _send_event(websocket: WebSocket, event_type: str, **fields) -> None:
+    await websocket.send_text(
+        json.dumps(
+            {"type": event_type, "event_id": f"evt_{secrets.token_hex(6)}", **fields}
+        )
+    )
+
+
+async def _assistant_reply(websocket: WebSocket, text: str) -> None:
+    item_id = f"item_{secrets.token_hex(6)}"
+    await _send_event(
+        websocket,
+        "conversation.item.added",
+        item={"id": item_id, "type": "message", "role": "assistant", "content": []},
+    )
+    # a few audio chunks so the relay's pass-through path gets exercised
+    for _ in range(3):
+        await _send_event(
+            websocket,
+            "response.output_audio.delta",
+            item_id=item_id,
+            delta=base64.b64encode(random.randbytes(4800)).decode(),
+        )
+    await _send_event(
+        websocket,
+        "response.output_audio_transcript.done",
+        item_id=item_id,
+        transcript=text,
+    )
+    await _send_event(websocket, "response.done", response={"status": "completed"})
+
+
+@app.websocket("/openai/v1/realtime")
+async def realtime_websocket(websocket: WebSocket):
+    """
+    Mock realtime session: greets, then answers every committed audio buffer
+    with the next question. The user's transcription is delivered after the
+    reply, as the real service does, so turn reassembly gets tested.
+    """
+    await websocket.accept()
+    await _send_event(websocket, "session.created", session={"type": "realtime"})
+    await _assistant_reply(websocket, "Hello! Shall we begin with your notice period?")
+
+    turn = 0
+    while True:
+        try:
+            event = json.loads(await websocket.receive_text())
+        except WebSocketDisconnect:
+            return
+        if event.get("type") == "session.update":
+            await _send_event(
+                websocket, "session.updated", session=event.get("session", {})
+            )
+        elif event.get("type") == "input_audio_buffer.commit":
+            turn += 1
+            user_item = f"item_{secrets.token_hex(6)}"
+            await _send_event(
+                websocket,
+                "conversation.item.added",
+                item={
+                    "id": user_item,
+                    "type": "message",
+                    "role": "user",
+                    "content": [],
+                },
+            )
+            await _simulate_latency(config.realtime_median_ms)
+            await _assistant_reply(websocket, f"Thanks. Question {turn + 1}?")
+            await _send_event(
+                websocket,
+                "conversation.item.input_audio_transcription.completed",
+                item_id=user_item,
+                transcript=f"Spoken answer {turn}",
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--median-ms", type=float, default=config.median_ms)
+    parser.add_argument("--sigma", type=float, default=config.sigma)
+    parser.add_argument("--rate-429", type=float, default=config.rate_429)
+    parser.add_argument(
+        "--realtime-median-ms", type=float, default=config.realtime_median_ms
+    )
+    args = parser.parse_args()
+
+    config.median_ms = args.median_ms
+    config.sigma = args.sigma
+    config.rate_429 = args.rate_429
+    config.realtime_median_ms = args.realtime_median_ms
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Scripted end-to-end load test against a running API.
+
+Each virtual user logs in, lists interviews, starts one, posts N
+conversation turns and then ends it either abruptly or gracefully followed
+by /complete. Reports throughput and p50/p95/p99 per route, plus DB pool
+saturation sampled from /api/admin/pool.
+
+With ``--relay`` the turns go through the server-side realtime relay
+(``/api/interview/{id}/realtime``) against the fake Azure WebSocket instead
+of one POST per turn.
+
+Usage:
+    python -m benchmarks.loadtest.run --base-url http://127.0.0.1:8000 \
+        --users 50 --turns 60 --admin-token $ADMIN_API_TOKEN \
+        --output results.json --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+from websockets.asyncio.client import connect
+
+# 100 ms of 24 kHz 16-bit silence, as the browser would stream it
+SILENCE_CHUNK = base64.b64encode(bytes(4800)).decode()
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+)
+
+
+class Recorder:
+    """Collects per-route latencies and status codes."""
+
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.pool_samples: list[dict] = []
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str, **kw):
+        route = f"{method} {UUID_PATTERN.sub('{id}', url)}"
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kw)
+        except httpx.HTTPError:
+            self.errors[route] += 1
+            raise
+        self.latencies[route].append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+
+
+async def post_turns(
+    client: httpx.AsyncClient, recorder: Recorder, args, base: str, headers: dict
+) -> None:
+    """Reports ``args.turns`` turns the way the browser does today."""
+    for turn in range(args.turns):
+        await recorder.request(
+            client,
+            "POST",
+            f"{base}/conversation",
+            headers=headers,
+            json={
+                "ai": f"Could you tell me about topic {turn}?",
+                "user": "Sure, I have worked on that for a couple of years "
+                "and led the migration to Kubernetes last quarter.",
+            },
+        )
+        if args.think_ms:
+            await asyncio.sleep(random.expovariate(1000 / args.think_ms))
+
+
+async def relay_turns(recorder: Recorder, args, interview_id: str, token: str) -> None:
+    """Plays ``args.turns`` answers through the realtime relay."""
+    ws_url = args.base_url.replace("http", "ws", 1)
+    url = f"{ws_url}/api/interview/{interview_id}/realtime?token={token}"
+    route = "WS /api/interview/{id}/realtime turn"
+
+    async def wait_for_reply(ws) -> None:
+        async for message in ws:
+            if '"response.done"' in message[:120]:
+                return
+
+    async with connect(url, max_size=None) as ws:
+        await wait_for_reply(ws)  # greeting
+        for _ in range(args.turns):
+            started = time.perf_counter()
+            for _ in range(5):
+                await ws.send(
+                    json.dumps(
+                        {"type": "input_audio_buffer.append", "audio": SILENCE_CHUNK}
+                    )
+                )
+            await ws.send(json.dumps({"type": "input_audio_buffer.commit"}))
+            await wait_for_reply(ws)
+            recorder.latencies[route].append((time.perf_counter() - started) * 1000)
+            if args.think_ms:
+                await asyncio.sleep(random.expovariate(1000 / args.think_ms))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def virtual_user(
+    client: httpx.AsyncClient, recorder: Recorder, user: dict, args
+) -> None:
+    response = await recorder.request(
+        client,
+        "POST",
+        "/api/auth/login",
+        json={"username": user["email"], "password": user["password"]},
+    )
+    token = response.json().get("access_token")
+    if not token:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await recorder.request(client, "GET", "/api/interview/", headers=headers)
+    for interview_id in user["interview_ids"]:
+        base = f"/api/interview/{interview_id}"
+        if args.relay:
+            await relay_turns(recorder, args, interview_id, token)
+        else:
+            await recorder.request(client, "GET", f"{base}/start", headers=headers)
+            await post_turns(client, recorder, args, base, headers)
+
+        if random.random() < args.abrupt_ratio:
+            await recorder.request(client, "POST", f"{base}/abrupt", headers=headers)
+        else:
+            await recorder.request(client, "POST", f"{base}/graceful", headers=headers)
+            await recorder.request(client, "POST", f"{base}/complete", headers=headers)
+        await recorder.request(client, "GET", f"{base}/conversation", headers=headers)
+
+
+async def sample_pool(
+    client: httpx.AsyncClient, recorder: Recorder, token: str, stop: asyncio.Event
+) -> None:
+    while not stop.is_set():
+        try:
+            response = await client.get(
+                "/api/admin/pool", headers={"X-Admin-Token": token}
+            )
+            if response.status_code == 200:
+                recorder.pool_samples.append(response.json())
+        except httpx.HTTPError:
+            pass
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except TimeoutError:
+            pass
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    routes = {}
+    total = 0
+    for route, values in sorted(recorder.latencies.items()):
+        total += len(values)
+        routes[route] = {
+            "count": len(values),
+            "errors": recorder.errors.get(route, 0),
+            "mean_ms": round(statistics.fmean(values), 1),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "p99_ms": round(percentile(values, 99), 1),
+        }
+
+    pool = {}
+    if recorder.pool_samples:
+        pool = {
+            "max_size": max(s.get("pool_max", 0) for s in recorder.pool_samples),
+            "max_in_use": max(
+                s.get("pool_size", 0) - s.get("pool_available", 0)
+                for s in recorder.pool_samples
+            ),
+            "max_waiting": max(
+                s.get("requests_waiting", 0) for s in recorder.pool_samples
+            ),
+            "saturated_samples_pct": round(
+                100
+                * sum(s.get("requests_waiting", 0) > 0 for s in recorder.pool_samples)
+                / len(recorder.pool_samples),
+                1,
+            ),
+        }
+
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "requests": total,
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "routes": routes,
+        "pool": pool,
+    }
+
+
+def print_report(summary: dict) -> None:
+    print(
+        f"\n{summary['requests']} requests in {summary['elapsed_s']} s "
+        f"({summary['throughput_rps']} req/s)\n"
+    )
+    print(f"{'route':<48}{'count':>7}{'err':>6}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for route, stats in summary["routes"].items():
+        print(
+            f"{route:<48}{stats['count']:>7}{stats['errors']:>6}"
+            f"{stats['p50_ms']:>9}{stats['p95_ms']:>9}{stats['p99_ms']:>9}"
+        )
+    if summary["pool"]:
+        print(f"\npool: {summary['pool']}")
+
+
+def compare(summary: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns the routes whose p95 regressed by more than ``threshold``."""
+    regressions = []
+    for route, stats in summary["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous or not previous["p95_ms"]:
+            continue
+        change = stats["p95_ms"] / previous["p95_ms"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{route}: p95 {previous['p95_ms']} -> {stats['p95_ms']} ms "
+                f"(+{change:.0%})"
+            )
+    return regressions
+
+
+async def run(args) -> dict:
+    seed = json.loads(Path(args.seed_file).read_text())
+    users = seed["users"][: args.users]
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users + 5)
+
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        stop = asyncio.Event()
+        sampler = None
+        if args.admin_token:
+            sampler = asyncio.create_task(
+                sample_pool(client, recorder, args.admin_token, stop)
+            )
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(virtual_user(client, recorder, user, args) for user in users),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        if sampler:
+            await sampler
+
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        print(f"{len(failures)} virtual users failed, first: {failures[0]!r}")
+    return summarize(recorder, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--seed-file", default="benchmarks/loadtest/seed.json")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=60)
+    parser.add_argument("--think-ms", type=float, default=0.0)
+    parser.add_argument("--abrupt-ratio", type=float, default=0.2)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--admin-token", default="")
+    parser.add_argument("--relay", action="store_true")
+    parser.add_argument("--output")
+    parser.add_argument("--compare")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    print_report(summary)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(summary, baseline, args.max_regression)
+        if regressions:
+            print("\nregressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Worker scaling benchmark for the production runner (``src.serve``).
+
+For each worker count, starts ``python -m src.serve`` against the seeded
+database, then runs a closed loop of virtual users alternating
+``GET /api/interview/`` (list_interview) and
+``POST /api/interview/{id}/conversation`` (conversation ingestion) for a
+fixed duration. Reports throughput, p95 and the speedup/efficiency relative
+to the smallest worker count; near-linear scaling shows up as efficiency
+close to 100% until the DB or the machine runs out of cores.
+
+Usage:
+    DATABASE_URL=postgresql://localhost/resume_ai_bench \
+        python -m benchmarks.loadtest.scaling --workers 1 2 4 8 --users 64 \
+        --duration 30 --db-connection-budget 80
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest.run import Recorder, percentile
+
+
+async def wait_until_serving(base_url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/api/status/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    raise TimeoutError(f"{base_url} did not come up within {timeout} s")
+
+
+async def closed_loop_user(
+    client: httpx.AsyncClient, recorder: Recorder, user: dict, deadline: float
+) -> None:
+    response = await client.post(
+        "/api/auth/login",
+        json={"username": user["email"], "password": user["password"]},
+    )
+    token = response.json().get("access_token")
+    if not token or not user["interview_ids"]:
+        return
+    headers = {"Authorization": f"Bearer {token}"}
+    conversation = f"/api/interview/{user['interview_ids'][0]}/conversation"
+
+    turn = 0
+    while time.monotonic() < deadline:
+        await recorder.request(client, "GET", "/api/interview/", headers=headers)
+        await recorder.request(
+            client,
+            "POST",
+            conversation,
+            headers=headers,
+            json={
+                "ai": f"Could you tell me about topic {turn}?",
+                "user": "I led the migration of our billing service to Kubernetes.",
+            },
+        )
+        turn += 1
+
+
+async def measure(args, users: list[dict]) -> dict:
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users + 5)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        deadline = time.monotonic() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(closed_loop_user(client, recorder, user, deadline) for user in users),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started
+
+    routes = {}
+    total = 0
+    for route, values in sorted(recorder.latencies.items()):
+        total += len(values)
+        routes[route] = {
+            "rps": round(len(values) / elapsed, 1),
+            "p95_ms": round(percentile(values, 95), 1),
+            "errors": recorder.errors.get(route, 0),
+        }
+    return {"throughput_rps": round(total / elapsed, 1), "routes": routes}
+
+
+def run_with_workers(workers: int, args, users: list[dict]) -> dict:
+    command = [
+        sys.executable,
+        "-m",
+        "src.serve",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(args.port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+    ]
+    if args.db_connection_budget:
+        command += ["--db-connection-budget", str(args.db_connection_budget)]
+    server = subprocess.Popen(command, env=os.environ.copy())
+    try:
+        asyncio.run(wait_until_serving(args.base_url, 60))
+        return asyncio.run(measure(args, users))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed-file", default="benchmarks/loadtest/seed.json")
+    parser.add_argument("--users", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--db-connection-budget", type=int)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    args.base_url = f"http://127.0.0.1:{args.port}"
+
+    users = json.loads(Path(args.seed_file).read_text())["users"][: args.users]
+    results = {}
+    for workers in sorted(args.workers):
+        results[workers] = run_with_workers(workers, args, users)
+
+    base_workers = min(results)
+    base_rps = results[base_workers]["throughput_rps"] or 1.0
+    print(f"\n{'workers':>8}{'req/s':>10}{'speedup':>10}{'efficiency':>12}")
+    for workers, result in results.items():
+        speedup = result["throughput_rps"] / base_rps
+        efficiency = speedup / (workers / base_workers)
+        result["speedup"] = round(speedup, 2)
+        result["efficiency"] = round(efficiency, 2)
+        print(
+            f"{workers:>8}{result['throughput_rps']:>10}"
+            f"{speedup:>10.2f}{efficiency:>12.0%}"
+        )
+        for route, stats in result["routes"].items():
+            print(
+                f"{'':>8}  {route:<44}{stats['rps']:>8} req/s  p95 {stats['p95_ms']} ms"
+            )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
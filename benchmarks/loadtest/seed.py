@@ -0,0 +1,185 @@
+"""
+Seeds a local Postgres with candidates, jobs and pending interviews for
+load testing.
+
+Optionally applies ``schema.sql`` first. Writes the seeded logins and
+interview ids to a JSON file consumed by ``benchmarks.loadtest.run``.
+
+Usage:
+    DATABASE_URL=postgresql://localhost/resume_ai_bench \
+        python -m benchmarks.loadtest.seed --apply-schema --candidates 200
+"""
+
+import argparse
+import json
+import os
+import random
+from pathlib import Path
+
+import psycopg
+from argon2 import PasswordHasher
+
+SCHEMA_PATH = Path(__file__).resolve().parents[2] / "schema.sql"
+PASSWORD = "loadtest-password"
+SKILLS = [
+    "Python",
+    "FastAPI",
+    "PostgreSQL",
+    "Kubernetes",
+    "Docker",
+    "AWS",
+    "React",
+    "TypeScript",
+    "Kafka",
+    "Redis",
+    "Terraform",
+    "Go",
+]
+PRESCREEN_QUESTIONS = [
+    "What is your current notice period?",
+    "What is your expected annual CTC in LPA?",
+    "Are you open to relocating to Bengaluru?",
+    "Do you prefer remote, hybrid or onsite work?",
+    "Are you comfortable with occasional on-call rotations?",
+]
+
+
+def resume_text(name: str, skills: list[str], yoe: int) -> str:
+    projects = "\n".join(
+        f"- Built a {random.choice(['payments', 'search', 'analytics', 'billing'])} "
+        f"service using {', '.join(random.sample(skills, 2))}; "
+        f"improved latency by {random.randint(10, 60)}%."
+        for _ in range(8)
+    )
+    return (
+        f"{name}\nSoftware Engineer with {yoe} years of experience.\n"
+        f"Skills: {', '.join(skills)}\n\nExperience\n{projects}\n"
+    )
+
+
+def seed(conn, candidates: int, jobs: int, interviews_per_candidate: int) -> dict:
+    ph = PasswordHasher()
+    password_hash = ph.hash(PASSWORD)
+    cur = conn.cursor()
+
+    requisitions = []
+    for j in range(jobs):
+        must_have = random.sample(SKILLS, 4)
+        cur.execute(
+            """
+            INSERT INTO job_description
+                (job_title, job_description, min_yoe, max_yoe,
+                 must_have_skills, nice_to_have_skills)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING id
+            """,
+            (
+                f"Backend Engineer {j}",
+                "We are hiring a backend engineer to build interview services. " * 40,
+                2,
+                8,
+                must_have,
+                random.sample([s for s in SKILLS if s not in must_have], 3),
+            ),
+        )
+        (jd_id,) = cur.fetchone()
+        cur.execute(
+            "INSERT INTO job_requisition (job_description_id, open_positions) "
+            "VALUES (%s, %s) RETURNING id",
+            (jd_id, random.randint(1, 5)),
+        )
+        (jr_id,) = cur.fetchone()
+        cur.executemany(
+            """
+            INSERT INTO candidate_question_prescreening
+                (job_requisition_id, jod_description_id, question_text,
+                 preferred_answer, is_mandatory, created_by)
+            VALUES (%s, %s, %s, %s, %s, 'recruiter')
+            """,
+            [(jr_id, jd_id, q, "", True) for q in PRESCREEN_QUESTIONS],
+        )
+        requisitions.append((jr_id, jd_id))
+
+    users = []
+    for c in range(candidates):
+        email = f"candidate{c}@loadtest.local"
+        name = f"Candidate {c}"
+        skills = random.sample(SKILLS, 6)
+        yoe = random.randint(1, 12)
+        cur.execute(
+            """
+            INSERT INTO candidate_user (name, email, password, is_reset_password)
+            VALUES (%s, %s, %s, TRUE)
+            RETURNING id
+            """,
+            (name, email, password_hash),
+        )
+        (user_id,) = cur.fetchone()
+        cur.execute(
+            """
+            INSERT INTO resume_detail
+                (id, name, email, yoe, skill_set, work_experience, cf_text,
+                 normalized_skills, details, applicant_status)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, '{}'::jsonb, 'active')
+            """,
+            (
+                user_id,
+                name,
+                email,
+                yoe,
+                ", ".join(skills),
+                f"{yoe} years building backend services",
+                resume_text(name, skills, yoe),
+                [s.lower() for s in skills],
+            ),
+        )
+        interview_ids = []
+        for _ in range(interviews_per_candidate):
+            jr_id, jd_id = random.choice(requisitions)
+            cur.execute(
+                """
+                INSERT INTO candidate_interview_question_session
+                    (resume_detail_id, job_description_id, job_requisition_id,
+                     interview_mode, status, metadata)
+                VALUES (%s, %s, %s, 'prescreen', 'pending', %s)
+                RETURNING id
+                """,
+                (
+                    user_id,
+                    jd_id,
+                    jr_id,
+                    json.dumps({"job_type": "full_time", "location": "hybrid"}),
+                ),
+            )
+            (interview_id,) = cur.fetchone()
+            interview_ids.append(str(interview_id))
+        users.append(
+            {"email": email, "password": PASSWORD, "interview_ids": interview_ids}
+        )
+
+    conn.commit()
+    return {"users": users}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", ""))
+    parser.add_argument("--apply-schema", action="store_true")
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--interviews-per-candidate", type=int, default=1)
+    parser.add_argument("--output", default="benchmarks/loadtest/seed.json")
+    args = parser.parse_args()
+
+    with psycopg.connect(args.database_url) as conn:
+        if args.apply_schema:
+            conn.execute(SCHEMA_PATH.read_text())
+            conn.commit()
+        result = seed(conn, args.candidates, args.jobs, args.interviews_per_candidate)
+
+    Path(args.output).write_text(json.dumps(result, indent=2))
+    print(f"seeded {args.candidates} candidates -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
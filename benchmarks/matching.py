@@ -0,0 +1,100 @@
+"""
+Top-K latency of the skill matching engine on synthetic candidates.
+
+Fills a ``CandidatePool`` with ``--candidates`` resumes (100k by default)
+drawing skills from a Zipf-weighted vocabulary, then times scoring every
+candidate for a mix of job descriptions, with and without a YOE band, and
+for a requisition's applicant subset. Runs in-process; no database needed.
+
+Usage:
+    python -m benchmarks.matching
+    python -m benchmarks.matching --candidates 500000 --vocabulary 5000 --rounds 50
+"""
+
+import argparse
+import itertools
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.matching.engine import CandidatePool
+
+
+def build_pool(args) -> tuple[CandidatePool, list[str]]:
+    rng = random.Random(7)
+    skills = [f"skill {rank}" for rank in range(args.vocabulary)]
+    cumulative = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(args.vocabulary))
+    )
+    pool = CandidatePool()
+    started = time.perf_counter()
+    for number in range(args.candidates):
+        pool.upsert(
+            f"resume-{number}",
+            rng.choices(skills, cum_weights=cumulative, k=rng.randint(5, 30)),
+            None if rng.random() < 0.05 else round(rng.uniform(0, 20), 1),
+        )
+    pool.build_postings()
+    elapsed = time.perf_counter() - started
+    print(
+        f"loaded {args.candidates:,} candidates, {len(pool.vocabulary):,} skills "
+        f"in {elapsed:.2f}s "
+        f"({(pool.skills.nbytes + pool.skill_rows.nbytes) / 2**20:.1f} MiB "
+        "of skill entries)"
+    )
+    return pool, skills
+
+
+def run(pool: CandidatePool, skills: list[str], args) -> dict:
+    rng = random.Random(11)
+    applicants = np.array(rng.sample(range(len(pool)), min(2000, len(pool))))
+    cases = [
+        ("common skills", (skills[:5], skills[5:10], None, None), None),
+        ("rare skills", (skills[-8:], skills[-16:-8], None, None), None),
+        ("mixed + yoe", (rng.sample(skills, 8), rng.sample(skills, 6), 3.0, 8.0), None),
+        ("unknown skill", (["cobol on mars"] + skills[:4], [], 5.0, None), None),
+        ("applicants only", (skills[:5], skills[5:10], 3.0, 8.0), applicants),
+    ]
+    results = {}
+    print(f"{'job':<16} {'scored':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for label, job, rows in cases:
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            _, scored = pool.top_k(args.k, *job, rows=rows)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        stats = {
+            "scored": scored,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 2),
+            "max_ms": round(timings[-1], 2),
+        }
+        results[label] = stats
+        print(
+            f"{label:<16} {scored:>8} {stats['p50_ms']:>8} "
+            f"{stats['p95_ms']:>8} {stats['max_ms']:>8}"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=100_000)
+    parser.add_argument("--vocabulary", type=int, default=2000)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=30)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    pool, skills = build_pool(args)
+    results = run(pool, skills, args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Microbenchmarks for the CPU-side hot paths of an interview.
+
+Covers prompt building (base instructions, evaluation prompt, reconstruction
+prompt, condensed resume/JD contexts), JSON extraction from model output, highlight normalization and
+Jsonb encoding of transcripts, each on realistic and 10x-sized synthetic
+inputs.
+
+Results can be saved as a baseline and later runs compared against it; the
+run fails when any benchmark's fastest round regressed by more than the
+threshold. The minimum is compared rather than the median: noise from other
+processes only ever adds time, so the minimum is what stays put between
+runs of unchanged code. A case over the threshold is re-measured
+(``--confirm``) and its best result kept before it counts as a regression;
+``--save-baseline`` keeps the best of as many measurements of every case.
+
+Absolute timings only compare on one machine, so every run also times a
+fixed calibration workload and the gate compares each case relative to
+it: a faster or slower host moves both alike. The baseline records the
+host it was taken on; compare there when the numbers need to be exact.
+
+Usage:
+    python -m benchmarks.micro --save-baseline
+    python -m benchmarks.micro --compare --max-regression 0.25
+    python -m benchmarks.micro -k evaluation
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+from pathlib import Path
+
+from psycopg.adapt import PyFormat, Transformer
+from psycopg.types.json import Jsonb
+
+from src.interview.context import (
+    build_job_description_context,
+    build_resume_context,
+)
+from src.interview.prompts import (
+    InstructionType,
+    conversation_reconstruct_prompt,
+    get_base_instructions,
+    get_evaluation_prompt,
+)
+from src.interview.service import (
+    JSON_OBJECT_PATTERN,
+    JSON_VALUE_PATTERN,
+    _extract_json,
+    _normalize_highlights,
+)
+
+BASELINE_PATH = Path(__file__).with_name("micro_baseline.json")
+WORDS = (
+    "designed built scaled migrated python fastapi postgres kubernetes kafka "
+    "latency throughput service platform team customers reliability pipeline "
+    "cloud aws terraform observability oncall mentoring roadmap api billing"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def make_resume(rng: random.Random, scale: int) -> dict:
+    return {
+        "name": "Candidate",
+        "raw_text": "\n".join(sentence(rng, 18) for _ in range(40 * scale)),
+        "skills": ", ".join(rng.sample(WORDS, 12)),
+        "experience": "\n".join(sentence(rng, 14) for _ in range(10 * scale)),
+        "details": {"location": "Bengaluru", "notice_period": "30 days"},
+    }
+
+
+def make_job_description(rng: random.Random, scale: int) -> str:
+    return "\n".join(sentence(rng, 16) for _ in range(30 * scale))
+
+
+def make_transcript(rng: random.Random, turns: int) -> list[dict]:
+    return [
+        {
+            "ai": sentence(rng, 15),
+            "user": sentence(rng, 45),
+            "time_stamp": f"2025-01-01 10:{i // 60:02d}:{i % 60:02d}.123456",
+        }
+        for i in range(turns)
+    ]
+
+
+def calibration_workload(data=tuple(range(20_000))) -> None:
+    """Plain interpreter work with no repo code in it, to scale timings by."""
+    text = json.dumps([str(n) for n in data])
+    sorted(json.loads(text), key=len)
+
+
+def run_sync(coro):
+    """Drives a coroutine that never suspends without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as done:
+        return done.value
+    raise RuntimeError("coroutine suspended")
+
+
+def build_cases() -> dict:
+    rng = random.Random(42)
+    cases = {}
+    for label, scale, turns in (("realistic", 1, 30), ("10x", 10, 300)):
+        resume = make_resume(rng, scale)
+        jd = make_job_description(rng, scale)
+        transcript = make_transcript(rng, turns)
+        metadata = {"job_type": "full_time", "salary": "25 LPA", "location": "hybrid"}
+        evaluation_output = "Here is the evaluation:\n" + json.dumps(
+            {
+                "prescreening_summary": sentence(rng, 60),
+                "highlights": [
+                    "Notice Period: 30 days",
+                    "Expected CTC: 28 LPA",
+                    "Relocation: Open",
+                ],
+                "fit_score": 74,
+            }
+        )
+        reconstruction_output = "```json\n" + json.dumps(transcript) + "\n```"
+        highlights = [sentence(rng, 6) for _ in range(2 * scale)] + [
+            "Expected CTC: 28 LPA",
+            "Work Preference: Hybrid",
+        ]
+
+        cases[f"get_base_instructions[{label}]"] = lambda r=resume, j=jd: run_sync(
+            get_base_instructions(
+                InstructionType.PRESCREENING, "Backend Engineer", r, j, "None", "None"
+            )
+        )
+        cases[f"get_evaluation_prompt[{label}]"] = (
+            lambda t=transcript, j=jd, r=resume, m=metadata: run_sync(
+                get_evaluation_prompt(InstructionType.PRESCREENING, t, j, r, m)
+            )
+        )
+        resume_row = {
+            "name": resume["name"],
+            "job_title": "Backend Engineer",
+            "current_company": "Acme",
+            "yoe": 6.5,
+            "skill_set": resume["skills"],
+            "work_experience": resume["experience"],
+            "cf_text": resume["raw_text"],
+        }
+        jd_row = {
+            "job_title": "Backend Engineer",
+            "min_yoe": 4,
+            "max_yoe": 8,
+            "must_have_skills": rng.sample(WORDS, 6),
+            "responsibilities": [sentence(rng, 10) for _ in range(12)],
+            "job_description": jd,
+        }
+        cases[f"build_resume_context[{label}]"] = lambda r=resume_row: (
+            build_resume_context(r)
+        )
+        cases[f"build_job_description_context[{label}]"] = lambda j=jd_row: (
+            build_job_description_context(j)
+        )
+        cases[f"conversation_reconstruct_prompt[{label}]"] = lambda t=transcript: (
+            conversation_reconstruct_prompt(t)
+        )
+        cases[f"extract_json_object[{label}]"] = lambda o=evaluation_output: (
+            _extract_json(o, JSON_OBJECT_PATTERN)
+        )
+        cases[f"extract_json_array[{label}]"] = lambda o=reconstruction_output: (
+            _extract_json(o, JSON_VALUE_PATTERN)
+        )
+        cases[f"normalize_highlights[{label}]"] = lambda h=highlights: (
+            _normalize_highlights(h)
+        )
+
+        transformer = Transformer()
+        cases[f"jsonb_encode_transcript[{label}]"] = (
+            lambda t=transcript, tx=transformer: tx.get_dumper(
+                Jsonb(t), PyFormat.BINARY
+            ).dump(Jsonb(t))
+        )
+    return cases
+
+
+def measure(func, repeat: int) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = [t / number * 1e6 for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        "median_us": round(statistics.median(runs), 2),
+        "min_us": round(min(runs), 2),
+        "rounds": repeat,
+        "iterations": number,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="keyword", default="")
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--max-regression", type=float, default=0.25)
+    parser.add_argument(
+        "--confirm",
+        type=int,
+        default=2,
+        help="times a case over the threshold is re-measured before it counts",
+    )
+    args = parser.parse_args()
+
+    machine = {
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    # the first measurement in a fresh process runs cold; keep the best
+    calibration = min(
+        (measure(calibration_workload, args.repeat) for _ in range(args.confirm + 1)),
+        key=lambda stats: stats["min_us"],
+    )
+    # the host speed: current calibration time over the baseline's
+    scale = 1.0
+    baseline = {}
+    if args.compare:
+        saved = json.loads(Path(args.baseline).read_text())
+        baseline = saved["benchmarks"]
+        if "calibration" in saved:
+            scale = calibration["min_us"] / saved["calibration"]["min_us"]
+        if saved["machine"] != machine:
+            print(
+                f"baseline taken on {saved['machine']}; comparing relative to "
+                f"the calibration workload ({scale:.2f}x the baseline's time)\n"
+            )
+
+    def regression(name: str, stats: dict) -> float | None:
+        if name not in baseline:
+            return None
+        return stats["min_us"] / (baseline[name]["min_us"] * scale) - 1
+
+    cases = build_cases()
+    results = {}
+    for name, func in cases.items():
+        if args.keyword and args.keyword not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+        # a burst of load elsewhere can slow every round of one case: only a
+        # slowdown that survives re-measuring counts, and a baseline keeps
+        # the best of all attempts
+        for _ in range(args.confirm):
+            if (
+                not args.save_baseline
+                and (regression(name, results[name]) or 0) <= args.max_regression
+            ):
+                break
+            retry = measure(func, args.repeat)
+            if retry["min_us"] < results[name]["min_us"]:
+                results[name] = retry
+
+    regressions = []
+    print(f"{'benchmark':<48}{'median us':>12}{'min us':>12}{'vs base':>10}")
+    for name, stats in results.items():
+        change = ""
+        if (ratio := regression(name, stats)) is not None:
+            change = f"{ratio:+.0%}"
+            if ratio > args.max_regression:
+                regressions.append(name)
+        print(f"{name:<48}{stats['median_us']:>12}{stats['min_us']:>12}{change:>10}")
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(
+            json.dumps(
+                {
+                    "machine": machine,
+                    "calibration": calibration,
+                    "benchmarks": results,
+                },
+                indent=2,
+            )
+        )
+        print(f"\nbaseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\nregressed more than {args.max_regression:.0%}: {regressions}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Query latency of the BM25 search index on a synthetic corpus.
+
+Loads ``--turns`` candidate answers (1M by default) into interviews spread
+over ``--requisitions`` requisitions, indexing them through
+``SearchIndexer`` exactly as ingestion does, then times a fixed query mix:
+rare and common terms, conjunctions, phrases and filtered searches.
+
+Needs a scratch Postgres database; the corpus is written to the real
+tables. Pass ``--skip-load`` to re-run the queries against an already
+loaded corpus.
+
+Usage:
+    createdb resume_ai_search_bench
+    DATABASE_URL=postgresql://localhost/resume_ai_search_bench \
+        python -m benchmarks.search --apply-schema --turns 1000000
+    DATABASE_URL=... python -m benchmarks.search --skip-load --rounds 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+from pathlib import Path
+
+import psycopg
+from psycopg.rows import dict_row
+
+from src.search.index import SearchIndexer
+from src.search.service import search
+
+SCHEMA_PATH = Path(__file__).resolve().parents[1] / "schema.sql"
+VOCABULARY_SIZE = 5000
+SKILLS = ["kubernetes", "terraform", "postgres", "kafka", "react", "golang", "airflow"]
+STATUSES = ["pending", "in_progress", "completed", "terminated"]
+QUERIES = [
+    ("rare term", "airflow", {}),
+    ("common term", "w12", {}),
+    ("two terms", "kubernetes notice", {}),
+    ("any of three", "kafka airflow golang", {"match_all": False}),
+    ("phrase", '"30 day notice"', {}),
+    ("term + phrase", 'kubernetes "30 day notice"', {}),
+    ("filtered", "kubernetes", {"requisition": True, "interview_status": "completed"}),
+]
+
+
+def make_sampler(rng: random.Random):
+    # Zipf-like word frequencies, like natural text
+    words = [f"w{rank}" for rank in range(VOCABULARY_SIZE)]
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+
+    def answer(length: int = 40) -> str:
+        text = rng.choices(words, weights, k=length)
+        if rng.random() < 0.05:
+            text.insert(rng.randrange(len(text)), rng.choice(SKILLS))
+        if rng.random() < 0.01:
+            text.insert(rng.randrange(len(text)), "my notice period is 30-day notice")
+        return " ".join(text)
+
+    return answer
+
+
+async def load(conn, args) -> None:
+    rng = random.Random(7)
+    answer = make_sampler(rng)
+    indexer = SearchIndexer()
+    async with conn.cursor() as cur:
+        await cur.execute(
+            """
+            INSERT INTO job_requisition (open_positions)
+            SELECT 1 FROM generate_series(1, %s)
+            RETURNING id
+            """,
+            (args.requisitions,),
+        )
+        requisitions = [row["id"] for row in await cur.fetchall()]
+    await conn.commit()
+
+    interviews = args.turns // args.turns_per_interview
+    started = time.perf_counter()
+    for batch_start in range(0, interviews, args.batch_interviews):
+        batch = min(args.batch_interviews, interviews - batch_start)
+        async with conn.cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO candidate_interview_question_session
+                    (job_requisition_id, interview_mode, status)
+                SELECT r, 'prescreen', s
+                FROM unnest(%s::uuid[], %s::text[]) AS u(r, s)
+                RETURNING id
+                """,
+                (
+                    [rng.choice(requisitions) for _ in range(batch)],
+                    [rng.choice(STATUSES) for _ in range(batch)],
+                ),
+            )
+            ids = [str(row["id"]) for row in await cur.fetchall()]
+            items = [
+                ("append", "transcript", interview_id, turn_index, answer())
+                for interview_id in ids
+                for turn_index in range(args.turns_per_interview)
+            ]
+            await indexer.write(cur, items)
+        await conn.commit()
+        done = (batch_start + batch) * args.turns_per_interview
+        elapsed = time.perf_counter() - started
+        print(f"\rindexed {done:,} turns ({done / elapsed:,.0f}/s)", end="", flush=True)
+    print()
+
+
+async def run_queries(conn, rounds: int) -> dict:
+    async with conn.cursor() as cur:
+        await cur.execute("SELECT id FROM job_requisition LIMIT 1")
+        requisition = (await cur.fetchone())["id"]
+    results = {}
+    print(f"{'query':<16} {'hits':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for label, query, options in QUERIES:
+        timings = []
+        hits = 0
+        for _ in range(rounds):
+            async with conn.cursor() as cur:
+                started = time.perf_counter()
+                response = await search(
+                    query,
+                    "transcript",
+                    requisition if options.get("requisition") else None,
+                    options.get("interview_status"),
+                    options.get("match_all", True),
+                    20,
+                    0,
+                    (conn, cur),
+                )
+                timings.append((time.perf_counter() - started) * 1000)
+            hits = len(response["results"])
+            await conn.rollback()
+        timings.sort()
+        stats = {
+            "hits": hits,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[int(0.95 * (len(timings) - 1))], 2),
+            "max_ms": round(timings[-1], 2),
+        }
+        results[label] = stats
+        print(
+            f"{label:<16} {hits:>6} {stats['p50_ms']:>9} "
+            f"{stats['p95_ms']:>9} {stats['max_ms']:>9}"
+        )
+    return results
+
+
+async def main_async(args) -> None:
+    async with await psycopg.AsyncConnection.connect(
+        args.database_url, row_factory=dict_row
+    ) as conn:
+        if args.apply_schema:
+            await conn.execute(SCHEMA_PATH.read_text())
+            await conn.commit()
+        if not args.skip_load:
+            await load(conn, args)
+        async with conn.cursor() as cur:
+            await cur.execute("ANALYZE search_posting, search_document, search_term")
+        await conn.commit()
+        results = await run_queries(conn, args.rounds)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", ""))
+    parser.add_argument("--apply-schema", action="store_true")
+    parser.add_argument("--skip-load", action="store_true")
+    parser.add_argument("--turns", type=int, default=1_000_000)
+    parser.add_argument("--turns-per-interview", type=int, default=30)
+    parser.add_argument("--requisitions", type=int, default=50)
+    parser.add_argument("--batch-interviews", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--output")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Cold-start benchmark for the API.
+
+Measures, each in a fresh interpreter:
+  * import time of ``src.main`` (plus the heaviest modules it pulls in), and
+  * time-to-first-request: from spawning uvicorn until ``/api/status/``
+    answers 200.
+
+Usage:
+    python -m benchmarks.startup --runs 5
+    python -m benchmarks.startup --runs 5 --top 15
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)")
+
+
+def measure_import(top: int) -> tuple[float, list[tuple[str, float]]]:
+    """
+    Imports ``src.main`` under ``-X importtime`` and returns the total in ms
+    and the ``top`` heaviest top-level packages and ``src`` modules by
+    cumulative import time.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_ms = 0.0
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative_ms, name = int(match.group(1)) / 1000, match.group(2)
+        if name == "src.main":
+            total_ms = cumulative_ms
+        elif "." not in name or name.startswith("src."):
+            modules[name] = max(modules.get(name, 0.0), cumulative_ms)
+    heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)
+    return total_ms, heaviest[:top]
+
+
+def measure_first_request(port: int, timeout: float) -> float:
+    """Returns ms from spawning uvicorn to the first 200 on /api/status/."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "src.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    try:
+        url = f"http://127.0.0.1:{port}/api/status/"
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(url, timeout=0.5).status_code == 200:
+                    return (time.perf_counter() - started) * 1000
+            except httpx.HTTPError:
+                pass
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {server.returncode}")
+            time.sleep(0.01)
+        raise TimeoutError(f"no response from {url} within {timeout} s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    imports, first_requests, heaviest = [], [], []
+    for _ in range(args.runs):
+        total_ms, heaviest = measure_import(args.top)
+        imports.append(total_ms)
+        first_requests.append(measure_first_request(args.port, args.timeout))
+
+    print(
+        f"import src.main        median {statistics.median(imports):8.1f} ms"
+        f"   min {min(imports):8.1f} ms"
+    )
+    print(
+        f"time to first request  median {statistics.median(first_requests):8.1f} ms"
+        f"   min {min(first_requests):8.1f} ms"
+    )
+    print("\nheaviest imports (last run, cumulative):")
+    for name, ms in heaviest:
+        print(f"  {name:<40}{ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Size and speed of the compact transcript encoding against JSONB.
+
+Generates synthetic transcripts (Zipf-distributed words, realistic turn
+lengths and timestamps) and, for each size, compares:
+
+- jsonb: what psycopg sends for ``Jsonb(transcript)`` and ``json.loads``
+  on the way back; the zlib-compressed size is given as a generous stand-in
+  for TOAST (pglz compresses less)
+- codec/zlib, codec/zstd and codec/zstd+dict: ``TranscriptCodec``, the
+  dictionary trained on a separate set of transcripts
+
+zstd rows need ``pip install zstandard``. Runs in-process; no database
+needed.
+
+Usage:
+    python -m benchmarks.transcript_codec
+    python -m benchmarks.transcript_codec --turns 30 300 --output codec.json
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import random
+import statistics
+import timeit
+import zlib
+from pathlib import Path
+
+from psycopg.adapt import PyFormat, Transformer
+from psycopg.types.json import Jsonb
+
+from src.interview import transcript_codec
+from src.interview.transcript_codec import TranscriptCodec, train_dictionary
+
+VOCABULARY_SIZE = 5000
+QUESTION_OPENERS = [
+    "Can you walk me through",
+    "Tell me about a time when",
+    "How would you approach",
+    "What was your role in",
+    "Could you explain how",
+]
+
+
+def make_transcript(rng: random.Random, turns: int, cumulative) -> list[dict]:
+    words = [f"w{rank}" for rank in range(VOCABULARY_SIZE)]
+    started = datetime.datetime(2025, 1, 1, 10) + datetime.timedelta(
+        minutes=rng.randrange(60 * 24 * 300)
+    )
+    transcript = []
+    for _ in range(turns):
+        started += datetime.timedelta(seconds=rng.uniform(15, 120))
+        question = " ".join(rng.choices(words, cum_weights=cumulative, k=12))
+        answer = " ".join(
+            rng.choices(words, cum_weights=cumulative, k=rng.randint(15, 90))
+        )
+        transcript.append(
+            {
+                "ai": f"{rng.choice(QUESTION_OPENERS)} {question}?",
+                "user": answer.capitalize() + ".",
+                "time_stamp": str(started),
+            }
+        )
+    return transcript
+
+
+def measure_us(func, repeat: int) -> float:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return round(
+        statistics.median(timer.repeat(repeat=repeat, number=number)) / number * 1e6, 1
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--turns", type=int, nargs="+", default=[30, 300])
+    parser.add_argument("--transcripts", type=int, default=50)
+    parser.add_argument("--training-transcripts", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    cumulative = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE))
+    )
+
+    codecs = {"codec/zlib": TranscriptCodec(use_zstd=False)}
+    if transcript_codec.zstandard is not None:
+        zstd = TranscriptCodec()
+        codecs["codec/zstd"] = zstd
+        training = [
+            make_transcript(rng, rng.randint(10, 60), cumulative)
+            for _ in range(args.training_transcripts)
+        ]
+        with_dictionary = TranscriptCodec()
+        with_dictionary.add_dictionary(1, train_dictionary(training))
+        codecs["codec/zstd+dict"] = with_dictionary
+
+    transformer = Transformer()
+    report = {}
+    print(
+        f"{'turns':>5}  {'format':<16}{'bytes':>10}{'ratio':>8}"
+        f"{'encode us':>12}{'decode us':>12}"
+    )
+    for turns in args.turns:
+        transcripts = [
+            make_transcript(rng, turns, cumulative) for _ in range(args.transcripts)
+        ]
+        sample = transcripts[0]
+
+        def dump_jsonb(transcript):
+            return bytes(
+                transformer.get_dumper(Jsonb(transcript), PyFormat.BINARY).dump(
+                    Jsonb(transcript)
+                )
+            )
+
+        jsonb_sizes = [len(dump_jsonb(t)) for t in transcripts]
+        jsonb_bytes = statistics.mean(jsonb_sizes)
+        encoded_json = dump_jsonb(sample)[1:]
+        rows = {
+            "jsonb": {
+                "bytes": jsonb_bytes,
+                "encode_us": measure_us(lambda: dump_jsonb(sample), args.repeat),
+                "decode_us": measure_us(lambda: json.loads(encoded_json), args.repeat),
+            },
+            "jsonb+zlib": {
+                "bytes": statistics.mean(
+                    len(zlib.compress(dump_jsonb(t))) for t in transcripts
+                ),
+            },
+        }
+        for name, codec in codecs.items():
+            blobs = [codec.encode(t) for t in transcripts]
+            assert all(codec.decode(b) == t for b, t in zip(blobs, transcripts))
+            rows[name] = {
+                "bytes": statistics.mean(len(blob) for blob in blobs),
+                "encode_us": measure_us(lambda c=codec: c.encode(sample), args.repeat),
+                "decode_us": measure_us(
+                    lambda c=codec, b=blobs[0]: c.decode(b), args.repeat
+                ),
+            }
+
+        report[turns] = rows
+        for name, row in rows.items():
+            row["bytes"] = round(row["bytes"])
+            row["ratio"] = round(jsonb_bytes / row["bytes"], 2)
+            print(
+                f"{turns:>5}  {name:<16}{row['bytes']:>10}{row['ratio']:>8}"
+                f"{row.get('encode_us', ''):>12}{row.get('decode_us', ''):>12}"
+            )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -244,7 +244,7 @@ CREATE TABLE prompt_config(
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     prompt TEXT,
     prompt_code VARCHAR(100)
-)
+);
 
 
 ----------------------------------------------------------
@@ -322,3 +322,723 @@ FOREIGN KEY (job_requisition_id) REFERENCES job_requisition(id);
 ALTER TABLE interview_violation
 ADD CONSTRAINT inv_vol_inv_question_sess
 FOREIGN KEY (interview_session_id) REFERENCES candidate_interview_question_session(id);
+
+
+----------------------------------------------------------
+-- TABLE: llm_usage_ledger
+----------------------------------------------------------
+-- One row per LLM call (reconstruction, evaluation, realtime session),
+-- written in batches by src/interview/ledger.py
+CREATE TABLE llm_usage_ledger (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    interview_session_id UUID,
+    purpose VARCHAR(50) NOT NULL,
+    model VARCHAR(100),
+    prompt_tokens INTEGER DEFAULT 0,
+    completion_tokens INTEGER DEFAULT 0,
+    cached_tokens INTEGER DEFAULT 0,
+    latency_ms DOUBLE PRECISION,
+    retries INTEGER DEFAULT 0,
+    cache_hit BOOLEAN DEFAULT FALSE,
+    cost_usd NUMERIC(12, 6) DEFAULT 0,
+    -- why a failed call failed (exception, with the HTTP status if any);
+    -- NULL for calls that succeeded
+    error VARCHAR(200),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT check_llm_purpose CHECK (purpose IN ('reconstruction', 'evaluation', 'realtime_session'))
+);
+
+CREATE INDEX idx_llm_usage_ledger_created_at ON llm_usage_ledger (created_at);
+CREATE INDEX idx_llm_usage_ledger_session ON llm_usage_ledger (interview_session_id);
+
+----------------------------------------------------------
+-- NOTIFY: candidate_interview_question_session status changes
+----------------------------------------------------------
+-- Published on channel interview_events whenever status or
+-- termination_reason changes (start, abrupt/graceful end + reconstruction,
+-- completion + evaluation). Fanned out to SSE clients by
+-- src/interview/events.py.
+CREATE OR REPLACE FUNCTION notify_interview_session_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'interview_events',
+        json_build_object(
+            'id', NEW.id,
+            'status', NEW.status,
+            'termination_reason', NEW.termination_reason,
+            'reconstructed', NEW.ai_detected_response IS NOT NULL
+        )::text
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_interview_session_notify
+AFTER UPDATE OF status, termination_reason ON candidate_interview_question_session
+FOR EACH ROW
+WHEN (
+    OLD.status IS DISTINCT FROM NEW.status
+    OR OLD.termination_reason IS DISTINCT FROM NEW.termination_reason
+)
+EXECUTE FUNCTION notify_interview_session_change();
+
+----------------------------------------------------------
+-- TABLE: interview_audio_upload / interview_audio_upload_part
+----------------------------------------------------------
+-- Resumable chunked audio uploads (src/interview/audio.py). Parts are
+-- streamed to the object store and recorded here with their SHA-256; on
+-- completion they are joined into one object and audio_url is set.
+CREATE TABLE interview_audio_upload (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    interview_session_id UUID NOT NULL,
+    content_type VARCHAR(100) NOT NULL,
+    total_size BIGINT,
+    status VARCHAR(50) NOT NULL DEFAULT 'uploading',
+    object_key TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+
+    CONSTRAINT check_audio_upload_status CHECK (status IN ('uploading', 'completed', 'aborted')),
+    CONSTRAINT fk_audio_upload_session FOREIGN KEY (interview_session_id)
+        REFERENCES candidate_interview_question_session(id)
+);
+
+CREATE INDEX idx_audio_upload_session ON interview_audio_upload (interview_session_id);
+
+CREATE TABLE interview_audio_upload_part (
+    upload_id UUID NOT NULL,
+    part_number INTEGER NOT NULL,
+    size BIGINT NOT NULL,
+    sha256 CHAR(64) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (upload_id, part_number),
+    CONSTRAINT fk_audio_part_upload FOREIGN KEY (upload_id)
+        REFERENCES interview_audio_upload(id) ON DELETE CASCADE
+);
+
+----------------------------------------------------------
+-- TABLE: prompt_context
+----------------------------------------------------------
+-- Condensed, token-bounded resume / JD text used in interview prompts
+-- (src/interview/context.py). One row per source row; it is current while
+-- source_updated_at matches the source's updated_at, and rebuilt otherwise.
+CREATE TABLE prompt_context (
+    source VARCHAR(50) NOT NULL,
+    source_id UUID NOT NULL,
+    source_updated_at TIMESTAMP,
+    context TEXT NOT NULL,
+    token_estimate INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (source, source_id),
+    CONSTRAINT check_prompt_context_source CHECK (source IN ('resume', 'job_description'))
+);
+
+-- edits to any column a context is built from move updated_at, which is
+-- what marks the stored context stale
+CREATE OR REPLACE FUNCTION touch_prompt_context_source() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_resume_detail_context_fields
+BEFORE UPDATE OF name, job_title, current_company, yoe, best_fit_role,
+    qualification, skill_set, work_experience, introduction, cf_text
+ON resume_detail
+FOR EACH ROW
+EXECUTE FUNCTION touch_prompt_context_source();
+
+CREATE TRIGGER trg_job_description_context_fields
+BEFORE UPDATE OF job_title, job_description, min_yoe, max_yoe, education,
+    must_have_skills, nice_to_have_skills, responsibilities
+ON job_description
+FOR EACH ROW
+EXECUTE FUNCTION touch_prompt_context_source();
+
+----------------------------------------------------------
+-- TABLE: prescreen_question_snapshot
+----------------------------------------------------------
+-- The prescreening questions of a requisition, aggregated once
+-- (src/interview/questions.py). Kept current by the trigger below, which
+-- also NOTIFYs 'prescreen_questions' so every worker drops its cached copy.
+CREATE TABLE prescreen_question_snapshot (
+    job_requisition_id UUID PRIMARY KEY,
+    questions JSONB NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_prescreening_job_requisition
+ON candidate_question_prescreening (job_requisition_id);
+
+CREATE OR REPLACE FUNCTION refresh_prescreen_question_snapshot(requisition_id UUID)
+RETURNS void AS $$
+DECLARE
+    aggregated JSONB;
+BEGIN
+    -- one refresh per requisition at a time: a concurrent transaction's
+    -- rows are committed by the time the lock is ours, and under READ
+    -- COMMITTED the aggregate below sees them, so the last upsert is never
+    -- missing the other's changes
+    PERFORM pg_advisory_xact_lock(
+        hashtext('prescreen_question_snapshot'), hashtext(requisition_id::text)
+    );
+
+    SELECT jsonb_agg(
+        jsonb_build_object(
+            'question_text', question_text,
+            'preferred_answer', preferred_answer,
+            'is_mandatory', is_mandatory,
+            'created_by', created_by
+        )
+        ORDER BY created_at, id
+    )
+    INTO aggregated
+    FROM candidate_question_prescreening
+    WHERE job_requisition_id = requisition_id;
+
+    IF aggregated IS NULL THEN
+        DELETE FROM prescreen_question_snapshot
+        WHERE job_requisition_id = requisition_id;
+    ELSE
+        INSERT INTO prescreen_question_snapshot (job_requisition_id, questions)
+        VALUES (requisition_id, aggregated)
+        ON CONFLICT (job_requisition_id) DO UPDATE
+        SET questions = EXCLUDED.questions, updated_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    PERFORM pg_notify('prescreen_questions', requisition_id::text);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION prescreen_questions_changed() RETURNS trigger AS $$
+BEGIN
+    -- a question moved between requisitions locks both; take them in a
+    -- fixed order so two such moves can't deadlock
+    IF TG_OP = 'UPDATE'
+        AND NEW.job_requisition_id IS DISTINCT FROM OLD.job_requisition_id
+        AND NEW.job_requisition_id IS NOT NULL
+        AND OLD.job_requisition_id IS NOT NULL
+    THEN
+        PERFORM pg_advisory_xact_lock(
+            hashtext('prescreen_question_snapshot'), hashtext(r::text)
+        )
+        FROM unnest(ARRAY[OLD.job_requisition_id, NEW.job_requisition_id]) AS r
+        ORDER BY hashtext(r::text);
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.job_requisition_id IS NOT NULL THEN
+        PERFORM refresh_prescreen_question_snapshot(OLD.job_requisition_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.job_requisition_id IS NOT NULL
+        AND (TG_OP = 'INSERT' OR NEW.job_requisition_id IS DISTINCT FROM OLD.job_requisition_id)
+    THEN
+        PERFORM refresh_prescreen_question_snapshot(NEW.job_requisition_id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_prescreen_questions_changed
+AFTER INSERT OR UPDATE OR DELETE ON candidate_question_prescreening
+FOR EACH ROW
+EXECUTE FUNCTION prescreen_questions_changed();
+
+-- backfill for requisitions created before the trigger existed
+INSERT INTO prescreen_question_snapshot (job_requisition_id, questions)
+SELECT
+    job_requisition_id,
+    jsonb_agg(
+        jsonb_build_object(
+            'question_text', question_text,
+            'preferred_answer', preferred_answer,
+            'is_mandatory', is_mandatory,
+            'created_by', created_by
+        )
+        ORDER BY created_at, id
+    )
+FROM candidate_question_prescreening
+WHERE job_requisition_id IS NOT NULL
+GROUP BY job_requisition_id
+ON CONFLICT (job_requisition_id) DO NOTHING;
+
+----------------------------------------------------------
+-- TABLES: search_document / search_posting / search_term / search_corpus_stats
+----------------------------------------------------------
+-- BM25 inverted index over candidate answers and resumes (src/search).
+-- Maintained incrementally by SearchIndexer: turns are appended as they
+-- are ingested and changed resumes are re-indexed. Transcripts are
+-- append-only; the backfill picks up any the appends missed.
+CREATE TABLE search_document (
+    id BIGSERIAL PRIMARY KEY,
+    source VARCHAR(50) NOT NULL,
+    source_id UUID NOT NULL,
+    length INTEGER NOT NULL,          -- indexed terms, for BM25 length normalisation
+    next_position INTEGER NOT NULL,   -- where the next appended turn starts
+    content_hash TEXT,                -- of the text last fully (re)indexed
+    rebuilt_turns INTEGER NOT NULL DEFAULT 0, -- turns the last rebuild read; their appends are skipped
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT uq_search_document_source UNIQUE (source, source_id),
+    CONSTRAINT check_search_document_source CHECK (source IN ('transcript', 'resume'))
+);
+
+-- no FK to search_document: removals delete postings explicitly so the
+-- per-term document frequencies can be decremented in the same statement
+CREATE TABLE search_posting (
+    term TEXT NOT NULL,
+    document_id BIGINT NOT NULL,
+    term_frequency INTEGER NOT NULL,
+    positions INTEGER[] NOT NULL,
+
+    PRIMARY KEY (term, document_id)
+);
+
+CREATE INDEX idx_search_posting_document ON search_posting (document_id);
+
+CREATE TABLE search_term (
+    source VARCHAR(50) NOT NULL,
+    term TEXT NOT NULL,
+    document_frequency INTEGER NOT NULL,
+
+    PRIMARY KEY (source, term)
+);
+
+CREATE TABLE search_corpus_stats (
+    source VARCHAR(50) PRIMARY KEY,
+    document_count BIGINT NOT NULL,
+    total_length BIGINT NOT NULL
+);
+
+-- resumes are written outside this service; ask the workers to re-index
+CREATE OR REPLACE FUNCTION notify_resume_search_reindex() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'search_reindex',
+        json_build_object('source', 'resume', 'id', NEW.id)::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_resume_search_reindex
+AFTER INSERT OR UPDATE OF cf_text ON resume_detail
+FOR EACH ROW
+EXECUTE FUNCTION notify_resume_search_reindex();
+
+----------------------------------------------------------
+-- Skill matching: workers keep an in-memory copy of every resume's skills
+-- and re-read the rows whose updated_at moved since their last refresh
+----------------------------------------------------------
+CREATE INDEX idx_resume_detail_updated_at ON resume_detail (updated_at);
+
+CREATE OR REPLACE FUNCTION touch_resume_detail_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_resume_detail_match_fields
+BEFORE UPDATE OF normalized_skills, yoe, applicant_status, archived_at ON resume_detail
+FOR EACH ROW
+EXECUTE FUNCTION touch_resume_detail_updated_at();
+
+----------------------------------------------------------
+-- Near-duplicate resumes: MinHash signature per resume and its LSH
+-- bucket in each band; resumes sharing a bucket are duplicate candidates
+----------------------------------------------------------
+CREATE TABLE resume_minhash (
+    resume_detail_id UUID PRIMARY KEY REFERENCES resume_detail (id) ON DELETE CASCADE,
+    -- 128 little-endian uint32 minima; NULL when cf_text has no words
+    signature BYTEA,
+    content_hash TEXT NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE resume_lsh_bucket (
+    band SMALLINT NOT NULL,
+    bucket BIGINT NOT NULL,
+    resume_detail_id UUID NOT NULL REFERENCES resume_detail (id) ON DELETE CASCADE,
+    PRIMARY KEY (band, bucket, resume_detail_id)
+);
+
+CREATE INDEX idx_resume_lsh_bucket_resume ON resume_lsh_bucket (resume_detail_id);
+CREATE INDEX idx_resume_detail_duplicate_group
+    ON resume_detail (duplicate_group_id)
+    WHERE duplicate_group_id IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION notify_resume_dedupe() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('resume_dedupe', json_build_object('id', NEW.id)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_resume_dedupe
+AFTER INSERT OR UPDATE OF cf_text ON resume_detail
+FOR EACH ROW
+EXECUTE FUNCTION notify_resume_dedupe();
+
+----------------------------------------------------------
+-- Interview credits: starts and completions append deltas here instead of
+-- updating the organization's interview_credits row; a background rollup
+-- folds them in. (interview_session_id, kind) makes both idempotent.
+----------------------------------------------------------
+CREATE TABLE interview_credit_delta (
+    id BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    organization_id UUID NOT NULL,
+    interview_type TEXT NOT NULL,
+    interview_session_id UUID NOT NULL,
+    kind VARCHAR(20) NOT NULL,
+    reserved_credits INTEGER NOT NULL DEFAULT 0,
+    available_minutes INTEGER NOT NULL DEFAULT 0,
+    completed_minutes INTEGER NOT NULL DEFAULT 0,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    rolled_up_at TIMESTAMP,
+
+    CONSTRAINT check_credit_delta_kind CHECK (kind IN ('reserve', 'settle')),
+    UNIQUE (interview_session_id, kind)
+);
+
+CREATE INDEX idx_interview_credit_delta_pending
+    ON interview_credit_delta (organization_id, id)
+    WHERE rolled_up_at IS NULL;
+
+-- the rollup upserts one row per organization and interview type
+CREATE UNIQUE INDEX idx_interview_credits_organization_type
+    ON interview_credits (organization_id, interview_type);
+
+----------------------------------------------------------
+-- Versioned annotations: ai_detected_response is written once by the
+-- reconstruction; reviewer edits are per-turn patches over it
+-- (annotation_patch, keyed by turn index) and every edit is kept in
+-- interview_response_version. annotated_response is no longer written.
+----------------------------------------------------------
+ALTER TABLE candidate_interview_question_session
+    ADD COLUMN annotation_patch JSONB,
+    ADD COLUMN annotation_version INTEGER NOT NULL DEFAULT 0;
+
+CREATE TABLE interview_response_version (
+    interview_session_id UUID NOT NULL
+        REFERENCES candidate_interview_question_session (id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    -- {"<turn index>": {"user": ..., "edited_at": ...}, ...}
+    patch JSONB NOT NULL,
+    edited_by UUID,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (interview_session_id, version)
+);
+
+-- existing edits: the turns where annotated_response differs become version 1
+UPDATE candidate_interview_question_session ciqs
+SET
+    annotation_patch = diff.patch,
+    annotation_version = 1
+FROM (
+    SELECT
+        s.id,
+        jsonb_object_agg((a.ordinality - 1)::text, a.turn) AS patch
+    FROM
+        candidate_interview_question_session s,
+        jsonb_array_elements(s.annotated_response) WITH ORDINALITY AS a(turn, ordinality)
+        JOIN jsonb_array_elements(s.ai_detected_response) WITH ORDINALITY
+            AS o(turn, ordinality) USING (ordinality)
+    WHERE
+        jsonb_typeof(s.annotated_response) = 'array'
+        AND jsonb_typeof(s.ai_detected_response) = 'array'
+        AND a.turn IS DISTINCT FROM o.turn
+    GROUP BY
+        s.id
+) diff
+WHERE
+    ciqs.id = diff.id;
+
+INSERT INTO interview_response_version (interview_session_id, version, patch)
+SELECT id, 1, annotation_patch
+FROM candidate_interview_question_session
+WHERE annotation_patch IS NOT NULL;
+
+----------------------------------------------------------
+-- Keyset pagination of interview listings on (created_at, id), newest
+-- first. The status and mode filters are answered from the index.
+----------------------------------------------------------
+UPDATE candidate_interview_question_session
+SET created_at = COALESCE(start_time, updated_at, CURRENT_TIMESTAMP)
+WHERE created_at IS NULL;
+
+ALTER TABLE candidate_interview_question_session
+    ALTER COLUMN created_at SET NOT NULL;
+
+-- a candidate's own interviews
+CREATE INDEX idx_ciqs_candidate_created
+    ON candidate_interview_question_session (resume_detail_id, created_at DESC, id DESC)
+    INCLUDE (status, interview_mode);
+
+-- one requisition's interviews
+CREATE INDEX idx_ciqs_requisition_created
+    ON candidate_interview_question_session (job_requisition_id, created_at DESC, id DESC)
+    INCLUDE (status, interview_mode);
+
+-- every requisition's interviews
+CREATE INDEX idx_ciqs_created
+    ON candidate_interview_question_session (created_at DESC, id DESC)
+    INCLUDE (status, interview_mode, job_requisition_id);
+
+----------------------------------------------------------
+-- Partitioning: candidate_interview_question_session by month of
+-- created_at. The existing table is attached as the partition holding
+-- everything before next month, so no rows are copied;
+-- ensure_interview_session_partitions() creates the months ahead and is
+-- run by the archiver (src/interview/archive.py).
+-- The primary key of a partitioned table must contain the partition key,
+-- so it becomes (id, created_at), and foreign keys can no longer reference
+-- id alone. The ones referencing the table are replaced by triggers that
+-- enforce the same: see check_interview_session_exists() below.
+----------------------------------------------------------
+ALTER TABLE candidate_question_prescreen_response DROP CONSTRAINT fk_prescreen_resp_session;
+ALTER TABLE candidate_ai_interview_evaluation DROP CONSTRAINT fk_evaluation_session;
+ALTER TABLE interview_violation DROP CONSTRAINT inv_vol_inv_question_sess;
+ALTER TABLE interview_audio_upload DROP CONSTRAINT fk_audio_upload_session;
+ALTER TABLE interview_response_version
+    DROP CONSTRAINT interview_response_version_interview_session_id_fkey;
+
+DROP TRIGGER trg_interview_session_notify ON candidate_interview_question_session;
+
+ALTER TABLE candidate_interview_question_session
+    RENAME TO candidate_interview_question_session_legacy;
+ALTER TABLE candidate_interview_question_session_legacy
+    RENAME CONSTRAINT candidate_interview_question_session_pkey
+    TO candidate_interview_question_session_legacy_pkey;
+ALTER INDEX idx_ciqs_candidate_created RENAME TO idx_ciqs_legacy_candidate_created;
+ALTER INDEX idx_ciqs_requisition_created RENAME TO idx_ciqs_legacy_requisition_created;
+ALTER INDEX idx_ciqs_created RENAME TO idx_ciqs_legacy_created;
+
+CREATE TABLE candidate_interview_question_session (
+    LIKE candidate_interview_question_session_legacy
+        INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMPRESSION,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+-- a validated CHECK matching the partition bound spares ATTACH its scan
+-- under an exclusive lock
+DO $$
+DECLARE
+    cutover TIMESTAMP := date_trunc('month', CURRENT_TIMESTAMP) + INTERVAL '1 month';
+BEGIN
+    EXECUTE format(
+        'ALTER TABLE candidate_interview_question_session_legacy
+         ADD CONSTRAINT legacy_partition_bound CHECK (created_at < %L) NOT VALID',
+        cutover
+    );
+    ALTER TABLE candidate_interview_question_session_legacy
+        VALIDATE CONSTRAINT legacy_partition_bound;
+    EXECUTE format(
+        'ALTER TABLE candidate_interview_question_session
+         ATTACH PARTITION candidate_interview_question_session_legacy
+         FOR VALUES FROM (MINVALUE) TO (%L)',
+        cutover
+    );
+    ALTER TABLE candidate_interview_question_session_legacy
+        DROP CONSTRAINT legacy_partition_bound;
+END;
+$$;
+
+-- rows no monthly partition covers yet (the archiver fell behind)
+CREATE TABLE candidate_interview_question_session_default
+    PARTITION OF candidate_interview_question_session DEFAULT;
+
+-- equivalent indexes and foreign keys already on the legacy partition are
+-- attached rather than rebuilt
+ALTER TABLE candidate_interview_question_session
+    ADD CONSTRAINT fk_session_resume
+    FOREIGN KEY (resume_detail_id) REFERENCES resume_detail(id),
+    ADD CONSTRAINT fk_session_job_description
+    FOREIGN KEY (job_description_id) REFERENCES job_description(id),
+    ADD CONSTRAINT fk_session_job_req
+    FOREIGN KEY (job_requisition_id) REFERENCES job_requisition(id);
+
+-- stands in for the dropped foreign keys to the session: a referencing row
+-- needs an existing session, locked FOR KEY SHARE like a foreign key check
+-- does so a concurrent delete waits
+CREATE OR REPLACE FUNCTION check_interview_session_exists() RETURNS trigger AS $$
+BEGIN
+    IF NEW.interview_session_id IS NOT NULL THEN
+        PERFORM 1
+        FROM candidate_interview_question_session
+        WHERE id = NEW.interview_session_id
+        FOR KEY SHARE;
+        IF NOT FOUND THEN
+            RAISE foreign_key_violation USING MESSAGE = format(
+                '%s.interview_session_id %s has no candidate_interview_question_session',
+                TG_TABLE_NAME, NEW.interview_session_id
+            );
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE CONSTRAINT TRIGGER trg_prescreen_resp_session
+AFTER INSERT OR UPDATE OF interview_session_id ON candidate_question_prescreen_response
+FOR EACH ROW EXECUTE FUNCTION check_interview_session_exists();
+
+CREATE CONSTRAINT TRIGGER trg_evaluation_session
+AFTER INSERT OR UPDATE OF interview_session_id ON candidate_ai_interview_evaluation
+FOR EACH ROW EXECUTE FUNCTION check_interview_session_exists();
+
+CREATE CONSTRAINT TRIGGER trg_violation_session
+AFTER INSERT OR UPDATE OF interview_session_id ON interview_violation
+FOR EACH ROW EXECUTE FUNCTION check_interview_session_exists();
+
+CREATE CONSTRAINT TRIGGER trg_audio_upload_session
+AFTER INSERT OR UPDATE OF interview_session_id ON interview_audio_upload
+FOR EACH ROW EXECUTE FUNCTION check_interview_session_exists();
+
+CREATE CONSTRAINT TRIGGER trg_response_version_session
+AFTER INSERT OR UPDATE OF interview_session_id ON interview_response_version
+FOR EACH ROW EXECUTE FUNCTION check_interview_session_exists();
+
+-- and the delete side: a session still referenced can't be deleted, except
+-- that its response versions go with it (their foreign key cascaded)
+CREATE OR REPLACE FUNCTION restrict_interview_session_delete() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM interview_response_version WHERE interview_session_id = OLD.id;
+    IF EXISTS (
+        SELECT 1 FROM candidate_question_prescreen_response
+        WHERE interview_session_id = OLD.id
+    ) OR EXISTS (
+        SELECT 1 FROM candidate_ai_interview_evaluation
+        WHERE interview_session_id = OLD.id
+    ) OR EXISTS (
+        SELECT 1 FROM interview_violation WHERE interview_session_id = OLD.id
+    ) OR EXISTS (
+        SELECT 1 FROM interview_audio_upload WHERE interview_session_id = OLD.id
+    ) THEN
+        RAISE foreign_key_violation USING MESSAGE = format(
+            'candidate_interview_question_session %s is still referenced', OLD.id
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_interview_session_delete
+AFTER DELETE ON candidate_interview_question_session
+FOR EACH ROW
+EXECUTE FUNCTION restrict_interview_session_delete();
+
+CREATE INDEX idx_ciqs_candidate_created
+    ON candidate_interview_question_session (resume_detail_id, created_at DESC, id DESC)
+    INCLUDE (status, interview_mode);
+
+CREATE INDEX idx_ciqs_requisition_created
+    ON candidate_interview_question_session (job_requisition_id, created_at DESC, id DESC)
+    INCLUDE (status, interview_mode);
+
+CREATE INDEX idx_ciqs_created
+    ON candidate_interview_question_session (created_at DESC, id DESC)
+    INCLUDE (status, interview_mode, job_requisition_id);
+
+CREATE TRIGGER trg_interview_session_notify
+AFTER UPDATE OF status, termination_reason ON candidate_interview_question_session
+FOR EACH ROW
+WHEN (
+    OLD.status IS DISTINCT FROM NEW.status
+    OR OLD.termination_reason IS DISTINCT FROM NEW.termination_reason
+)
+EXECUTE FUNCTION notify_interview_session_change();
+
+-- creates the monthly partitions from next month to months_ahead months
+-- out; returns how many were missing
+CREATE OR REPLACE FUNCTION ensure_interview_session_partitions(months_ahead INTEGER)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start TIMESTAMP;
+    partition_name TEXT;
+    created INTEGER := 0;
+BEGIN
+    -- every worker runs this; creating the same partition twice would fail
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_interview_session_partitions'));
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', CURRENT_TIMESTAMP) + INTERVAL '1 month',
+            date_trunc('month', CURRENT_TIMESTAMP) + make_interval(months => months_ahead),
+            INTERVAL '1 month'
+        )
+    LOOP
+        partition_name := 'candidate_interview_question_session_'
+            || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF candidate_interview_question_session
+             FOR VALUES FROM (%L) TO (%L)',
+            partition_name,
+            month_start,
+            month_start + INTERVAL '1 month'
+        );
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_interview_session_partitions(3);
+
+----------------------------------------------------------
+-- Cold archival: the JSONB of interviews that ended more than
+-- INTERVIEW_ARCHIVE_AFTER_DAYS ago moves, zlib-compressed, into
+-- interview_session_archive and is rehydrated on first access
+-- (src/interview/archive.py). last_read_at is set by the read paths at
+-- most once a day; an interview is only archived once it has also gone
+-- unread for INTERVIEW_ARCHIVE_AFTER_DAYS.
+----------------------------------------------------------
+ALTER TABLE candidate_interview_question_session
+    ADD COLUMN archived_at TIMESTAMP,
+    ADD COLUMN rehydrated_at TIMESTAMP,
+    ADD COLUMN last_read_at TIMESTAMP;
+
+CREATE TABLE interview_session_archive (
+    interview_session_id UUID PRIMARY KEY,
+    interview_created_at TIMESTAMP NOT NULL,
+    -- zlib-compressed JSON object of the archived JSONB columns
+    payload BYTEA NOT NULL,
+    -- moved as is: it is compressed already
+    transcript_blob BYTEA,
+    archived_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- already compressed; keep TOAST from trying again
+ALTER TABLE interview_session_archive ALTER COLUMN payload SET STORAGE EXTERNAL;
+ALTER TABLE interview_session_archive
+    ALTER COLUMN transcript_blob SET STORAGE EXTERNAL;
+
+CREATE INDEX idx_ciqs_archive_pending
+    ON candidate_interview_question_session (end_time)
+    WHERE archived_at IS NULL AND end_time IS NOT NULL;
+
+----------------------------------------------------------
+-- Compact transcripts: with TRANSCRIPT_COMPACT_ON_CLOSE, a closed
+-- interview's transcript moves from JSONB to transcript_blob, a columnar
+-- zstd/zlib encoding (src/interview/transcript_codec.py). zstd blobs may
+-- name a dictionary trained on earlier transcripts.
+----------------------------------------------------------
+ALTER TABLE candidate_interview_question_session
+    ADD COLUMN transcript_blob BYTEA;
+
+-- already compressed; keep TOAST from trying again
+ALTER TABLE candidate_interview_question_session
+    ALTER COLUMN transcript_blob SET STORAGE EXTERNAL;
+
+CREATE TABLE transcript_codec_dictionary (
+    id SERIAL PRIMARY KEY,
+    dictionary BYTEA NOT NULL,
+    sample_count INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
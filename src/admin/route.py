@@ -0,0 +1,88 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from src.admin.service import llm_usage_by_day, llm_usage_by_interview_mode
+from src.interview.archive import interview_archiver
+from src.interview.context import precompute_prompt_contexts
+from src.interview.credits import credit_rollup, get_credit_balance
+from src.interview.questions import prescreen_questions
+from src.search.index import backfill_search_index, search_indexer
+from src.shared import profiler
+from src.shared.config import settings
+from src.shared.db import get_connection, pool
+from src.shared.dependency import has_admin_access
+from src.shared.tracing import TracedRoute
+
+route = APIRouter(route_class=TracedRoute)
+ADMIN = [Depends(has_admin_access)]
+
+
+@route.get("/llm-usage/daily", dependencies=ADMIN)
+async def llm_usage_daily_route(days: int = 30, db=Depends(get_connection)):
+    return await llm_usage_by_day(days, db)
+
+
+@route.get("/llm-usage/by-mode", dependencies=ADMIN)
+async def llm_usage_by_mode_route(days: int = 30, db=Depends(get_connection)):
+    return await llm_usage_by_interview_mode(days, db)
+
+
+@route.post("/prompt-contexts/precompute", dependencies=ADMIN)
+async def precompute_prompt_contexts_route(
+    limit: int = 500, db=Depends(get_connection)
+):
+    return await precompute_prompt_contexts(limit, db)
+
+
+@route.get("/cache/prescreen-questions", dependencies=ADMIN)
+async def prescreen_question_cache_route():
+    return prescreen_questions.stats()
+
+
+@route.post("/search/backfill", dependencies=ADMIN)
+async def backfill_search_index_route(limit: int = 500, db=Depends(get_connection)):
+    queued = await backfill_search_index(limit, db)
+    await search_indexer.flush()
+    return queued
+
+
+@route.get("/credits/{organization_id}", dependencies=ADMIN)
+async def credit_balance_route(organization_id: UUID, db=Depends(get_connection)):
+    return await get_credit_balance(str(organization_id), db)
+
+
+@route.post("/credits/rollup", dependencies=ADMIN)
+async def credit_rollup_route():
+    return {"deltas": await credit_rollup.rollup()}
+
+
+@route.post("/interviews/archive", dependencies=ADMIN)
+async def archive_interviews_route():
+    partitions = await interview_archiver.ensure_partitions()
+    return {"partitions": partitions, "archived": await interview_archiver.archive()}
+
+
+@route.get("/pool", dependencies=ADMIN)
+async def pool_stats_route():
+    return pool.get_stats()
+
+
+@route.post("/profile", dependencies=ADMIN, response_class=PlainTextResponse)
+async def profile_worker_route(seconds: float = 10):
+    if not settings.profiler_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return await profiler.profile_worker(seconds)
+
+
+@route.get(
+    "/profile/requests/{profile_id}",
+    dependencies=ADMIN,
+    response_class=PlainTextResponse,
+)
+async def request_profile_route(profile_id: str):
+    result = await profiler.get_request_profile(profile_id)
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return result
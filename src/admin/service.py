@@ -0,0 +1,53 @@
+async def llm_usage_by_day(days: int, db):
+    conn, cur = db
+    get_usage_query = """
+    SELECT
+        date_trunc('day', l.created_at)::date AS day,
+        l.purpose,
+        COUNT(*) AS calls,
+        COUNT(*) FILTER (WHERE l.error IS NOT NULL) AS errors,
+        SUM(l.prompt_tokens) AS prompt_tokens,
+        SUM(l.completion_tokens) AS completion_tokens,
+        SUM(l.cost_usd) AS cost_usd,
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY l.latency_ms) AS p95_latency_ms,
+        AVG(l.cache_hit::int) AS cache_hit_rate,
+        SUM(l.retries) AS retries
+    FROM
+        llm_usage_ledger l
+    WHERE
+        l.created_at >= CURRENT_DATE - %(days)s::int
+    GROUP BY
+        1, 2
+    ORDER BY
+        1 DESC, 2
+    """
+    await cur.execute(get_usage_query, {"days": days})
+    return await cur.fetchall()
+
+
+async def llm_usage_by_interview_mode(days: int, db):
+    conn, cur = db
+    get_usage_query = """
+    SELECT
+        ciqs.interview_mode,
+        l.purpose,
+        COUNT(*) AS calls,
+        COUNT(*) FILTER (WHERE l.error IS NOT NULL) AS errors,
+        COUNT(DISTINCT l.interview_session_id) AS interviews,
+        SUM(l.cost_usd) AS cost_usd,
+        SUM(l.cost_usd) / NULLIF(COUNT(DISTINCT l.interview_session_id), 0)
+            AS cost_per_interview_usd,
+        percentile_cont(0.95) WITHIN GROUP (ORDER BY l.latency_ms) AS p95_latency_ms
+    FROM
+        llm_usage_ledger l
+    LEFT JOIN
+        candidate_interview_question_session ciqs ON l.interview_session_id = ciqs.id
+    WHERE
+        l.created_at >= CURRENT_DATE - %(days)s::int
+    GROUP BY
+        1, 2
+    ORDER BY
+        1, 2
+    """
+    await cur.execute(get_usage_query, {"days": days})
+    return await cur.fetchall()
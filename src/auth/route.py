@@ -1,8 +1,6 @@
-import os
 from typing import Annotated
 
 import jwt
-from dotenv import load_dotenv
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
 
 from src.auth.model import (
@@ -15,13 +13,11 @@ from src.auth.service import (
     process_password_reset,
     user_login,
 )
+from src.shared.config import settings
 from src.shared.db import get_connection
+from src.shared.tracing import TracedRoute
 
-route = APIRouter()
-
-
-load_dotenv()
-JWT_SECRET_EMAIL: str = os.getenv("JWT_SECRET", "")
+route = APIRouter(route_class=TracedRoute)
 
 
 @route.post("/reset-password")
@@ -31,7 +27,7 @@ async def reset_password_route(
     db=Depends(get_connection),
 ):
     try:
-        payload = jwt.decode(x_token, key=JWT_SECRET_EMAIL, algorithms=["HS256"])
+        payload = jwt.decode(x_token, key=settings.jwt_secret, algorithms=["HS256"])
 
         user_id = payload.get("user_id")
         if not user_id:
@@ -1,21 +1,16 @@
 from fastapi import HTTPException, status, Request
 import json
-import os
 import secrets
 
 import jwt
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
-from dotenv import load_dotenv
 
 from src.auth.model import (
     LoginRequest,
     PasswordResetRequest,
 )
-
-load_dotenv()
-JWT_SECRET: str = os.getenv("JWT_SECRET", "")
-JWT_SECRET_EMAIL: str = os.getenv("JWT_SECRET", "")
+from src.shared.config import settings
 
 
 async def process_password_reset(request: PasswordResetRequest, user_id: int, db):
@@ -83,7 +78,7 @@ async def user_login(client_req: Request, request: LoginRequest, db):
         data = {
             "user_id": str(user_record["user_id"]),
         }
-        encoded_jwt = jwt.encode(data, JWT_SECRET_EMAIL, algorithm="HS256")
+        encoded_jwt = jwt.encode(data, settings.jwt_secret, algorithm="HS256")
         return {"is_reset_password": False, "token": encoded_jwt}
 
     refresh_token = secrets.token_urlsafe(64)
@@ -136,5 +131,5 @@ async def exchange(refresh_token: str, db):
         return {"error": "Invalid refresh token"}
     data = {"user_id": str(token_record["user_id"])}
 
-    encoded_jwt = jwt.encode(data, JWT_SECRET, algorithm="HS256")
+    encoded_jwt = jwt.encode(data, settings.jwt_secret, algorithm="HS256")
     return {"access_token": encoded_jwt}
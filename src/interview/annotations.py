@@ -0,0 +1,294 @@
+import datetime
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from psycopg.types.json import Jsonb
+
+from src.interview.archive import rehydrate_interview
+
+# the conversation's entity tag: the annotation version changes with every
+# edit, end_time with every reconstruction of ai_detected_response
+CONVERSATION_ETAG_SQL = """
+(
+    '"' || annotation_version || '-'
+    || COALESCE(FLOOR(EXTRACT(EPOCH FROM end_time) * 1000000)::bigint, 0)
+    || '"'
+)
+"""
+
+
+def reconstruction_conflict() -> JSONResponse:
+    """
+    ``ai_detected_response`` is stored but is not a list of turns (written
+    from an LLM reply that was a JSON object), so turns can't be addressed.
+    """
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"message": "Reconstructed conversation is not a list of turns"},
+    )
+
+
+def materialize(
+    original: list | None, patches: dict | None, offset: int = 0
+) -> list | None:
+    """
+    The annotated transcript: ``ai_detected_response`` with each edited
+    turn's patch (keyed by turn index) merged over it. ``original`` may be
+    a slice of the transcript starting at turn ``offset``.
+    """
+    if not original or not patches:
+        return original
+    return [
+        {**turn, **patches.get(str(offset + index), {})}
+        for index, turn in enumerate(original)
+    ]
+
+
+def entity_tags(header: str | None, weak: bool) -> list[str] | None:
+    """
+    The entity tags listed in an ``If-Match``/``If-None-Match`` header; None
+    when the header is absent or ``*``. ``If-Match`` compares strongly, so
+    unless ``weak`` weak tags are dropped; otherwise ``W/`` is ignored.
+    """
+    if header is None or header.strip() == "*":
+        return None
+    tags = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            if not weak:
+                continue
+            tag = tag.removeprefix("W/")
+        tags.append(tag)
+    return tags
+
+
+async def apply_annotation_edits(
+    interview_id: str, edits: dict[int, str], edited_by, if_match: str | None, db
+):
+    """
+    Applies reviewer edits (turn index -> new answer) as one new version.
+
+    A single statement checks the indexes against the transcript length
+    and ``If-Match`` against the conversation's ETag, merges the per-turn
+    patches into ``annotation_patch`` and appends them to
+    ``interview_response_version``. The original transcript is neither
+    read nor rewritten. Only when nothing was updated is the interview
+    read again to tell a missing interview (404), a bad index (400) and a
+    concurrent edit (412) apart, or to rehydrate an archived one and retry.
+    """
+    conn, cur = db
+    if min(edits) < 0:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid conversation index"},
+        )
+    edited_at = str(datetime.datetime.now())
+    patches = {
+        str(index): {"user": text, "edited_at": edited_at}
+        for index, text in edits.items()
+    }
+    record_annotation_query = f"""
+    WITH edited AS (
+        UPDATE
+            candidate_interview_question_session
+        SET
+            annotation_patch = COALESCE(annotation_patch, '{{}}'::jsonb) || %(patches)s,
+            annotation_version = annotation_version + 1
+        WHERE
+            id = %(interview_id)s
+            -- jsonb_array_length raises on anything but an array
+            AND CASE
+                WHEN jsonb_typeof(ai_detected_response) = 'array'
+                THEN jsonb_array_length(ai_detected_response) > %(max_index)s
+                ELSE FALSE
+            END
+            AND (
+                %(if_match)s::text[] IS NULL
+                OR {CONVERSATION_ETAG_SQL} = ANY(%(if_match)s::text[])
+            )
+        RETURNING
+            id,
+            annotation_version,
+            {CONVERSATION_ETAG_SQL} AS etag
+    ),
+    recorded AS (
+        INSERT INTO
+            interview_response_version
+        (interview_session_id, version, patch, edited_by)
+        SELECT
+            id, annotation_version, %(patches)s, %(edited_by)s
+        FROM
+            edited
+        RETURNING
+            version
+    )
+    SELECT
+        recorded.version,
+        edited.etag
+    FROM
+        recorded, edited
+    """
+    await cur.execute(
+        record_annotation_query,
+        {
+            "interview_id": interview_id,
+            "patches": Jsonb(patches),
+            "max_index": max(edits),
+            "if_match": entity_tags(if_match, weak=False),
+            "edited_by": edited_by,
+        },
+    )
+    recorded = await cur.fetchone()
+    if recorded:
+        return JSONResponse(
+            content={
+                "message": "Conversation Updated",
+                "annotation_version": recorded["version"],
+            },
+            headers={"ETag": recorded["etag"]},
+        )
+
+    get_interview_query = f"""
+    SELECT
+        jsonb_typeof(ai_detected_response) AS response_type,
+        CASE
+            WHEN jsonb_typeof(ai_detected_response) = 'array'
+            THEN jsonb_array_length(ai_detected_response)
+        END AS turns,
+        annotation_version,
+        archived_at IS NOT NULL AS archived,
+        {CONVERSATION_ETAG_SQL} AS etag
+    FROM
+        candidate_interview_question_session
+    WHERE
+        id = %(interview_id)s
+    """
+    await cur.execute(get_interview_query, {"interview_id": interview_id})
+    interview = await cur.fetchone()
+    if not interview:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Interview Not Found"},
+        )
+    if interview["archived"] and await rehydrate_interview(interview_id, db):
+        return await apply_annotation_edits(
+            interview_id, edits, edited_by, if_match, db
+        )
+    if interview["response_type"] not in (None, "array"):
+        return reconstruction_conflict()
+    if max(edits) >= (interview["turns"] or 0):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid conversation index"},
+        )
+    return JSONResponse(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        content={
+            "message": "Conversation was edited by someone else",
+            "annotation_version": interview["annotation_version"],
+        },
+        headers={"ETag": interview["etag"]},
+    )
+
+
+async def list_response_versions(interview_id: str, db):
+    """
+    The annotation history of an interview, oldest first. Version 0 is
+    the reconstruction itself; each later version lists the turns it
+    edited.
+    """
+    conn, cur = db
+    get_interview_query = """
+    SELECT
+        end_time,
+        ai_detected_response IS NOT NULL OR archived_at IS NOT NULL
+            AS reconstructed,
+        annotation_version
+    FROM
+        candidate_interview_question_session
+    WHERE
+        id = %(interview_id)s
+    """
+    await cur.execute(get_interview_query, {"interview_id": interview_id})
+    interview = await cur.fetchone()
+    if not interview:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Interview Not Found"},
+        )
+
+    list_versions_query = """
+    SELECT
+        version,
+        ARRAY(SELECT jsonb_object_keys(patch)::int ORDER BY 1) AS turns,
+        edited_by,
+        created_at
+    FROM
+        interview_response_version
+    WHERE
+        interview_session_id = %(interview_id)s
+    ORDER BY
+        version
+    """
+    await cur.execute(list_versions_query, {"interview_id": interview_id})
+    versions = await cur.fetchall()
+    if interview["reconstructed"]:
+        versions.insert(
+            0,
+            {
+                "version": 0,
+                "turns": [],
+                "edited_by": None,
+                "created_at": interview["end_time"],
+            },
+        )
+    return {"current_version": interview["annotation_version"], "versions": versions}
+
+
+async def get_response_version(interview_id: str, version: int, db):
+    """The annotated transcript as it was at ``version``."""
+    conn, cur = db
+    get_version_query = """
+    SELECT
+        ciqs.ai_detected_response,
+        ciqs.annotation_version,
+        ciqs.archived_at IS NOT NULL AS archived,
+        (
+            SELECT
+                jsonb_object_agg(turn.key, turn.value ORDER BY v.version)
+            FROM
+                interview_response_version v,
+                jsonb_each(v.patch) AS turn
+            WHERE
+                v.interview_session_id = ciqs.id AND v.version <= %(version)s
+        ) AS patches
+    FROM
+        candidate_interview_question_session ciqs
+    WHERE
+        ciqs.id = %(interview_id)s
+    """
+    await cur.execute(
+        get_version_query, {"interview_id": interview_id, "version": version}
+    )
+    interview = await cur.fetchone()
+    if not interview:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Interview Not Found"},
+        )
+    if interview["archived"] and await rehydrate_interview(interview_id, db):
+        return await get_response_version(interview_id, version, db)
+    if not isinstance(interview["ai_detected_response"], (list, type(None))):
+        return reconstruction_conflict()
+    if version > interview["annotation_version"]:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Version Not Found"},
+        )
+    return {
+        "version": version,
+        "annotated_response": materialize(
+            interview["ai_detected_response"], interview["patches"]
+        ),
+    }
@@ -0,0 +1,277 @@
+import asyncio
+import json
+import logging
+import zlib
+
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+
+from src.shared.config import settings
+from src.shared.db import pool
+
+logger = logging.getLogger(__name__)
+
+# one worker archives at a time; the others skip their turn
+ARCHIVER_LOCK = 0xA2C41E
+ARCHIVE_INTERVAL_SECONDS = 3600.0
+ARCHIVE_BATCH = 200
+PARTITION_MONTHS_AHEAD = 3
+
+# the bulky JSONB moved out of candidate_interview_question_session, packed
+# together into one payload
+ARCHIVED_JSONB_COLUMNS = (
+    "transcript",
+    "ai_detected_response",
+    "annotated_response",
+    "annotation_patch",
+)
+# transcript_blob is compressed already and moves as is
+ARCHIVED_COLUMNS = (*ARCHIVED_JSONB_COLUMNS, "transcript_blob")
+
+# closed interviews read since this long are marked read again; keeps the
+# read paths from writing on every request
+READ_MARK_INTERVAL = "1 day"
+NEEDS_READ_MARK_SQL = f"""(
+    end_time IS NOT NULL
+    AND (
+        last_read_at IS NULL
+        OR last_read_at < CURRENT_TIMESTAMP - INTERVAL '{READ_MARK_INTERVAL}'
+    )
+)"""
+
+
+def pack(row: dict) -> bytes:
+    """The archived JSONB columns of ``row`` as zlib-compressed JSON."""
+    columns = {column: row[column] for column in ARCHIVED_JSONB_COLUMNS}
+    return zlib.compress(json.dumps(columns, separators=(",", ":")).encode(), 6)
+
+
+def unpack(payload: bytes) -> dict:
+    return json.loads(zlib.decompress(payload))
+
+
+def _pack_all(rows: list[dict]) -> list[bytes]:
+    return [pack(row) for row in rows]
+
+
+class InterviewArchiver:
+    """
+    Moves the JSONB of interviews that ended more than
+    ``INTERVIEW_ARCHIVE_AFTER_DAYS`` ago into ``interview_session_archive``,
+    compressed, and keeps the monthly partitions of
+    ``candidate_interview_question_session`` created ahead of time.
+
+    Archived rows keep everything but ``ARCHIVED_COLUMNS``;
+    ``rehydrate_interview`` restores those on first access. Reads mark an
+    interview (``last_read_at``, see ``mark_interview_read``), and one that
+    was rehydrated is archived again only once it has gone unread for as
+    long.
+    """
+
+    def __init__(self, interval: float = ARCHIVE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.ensure_partitions()
+                while await self.archive() == ARCHIVE_BATCH:
+                    pass
+            except Exception:
+                logger.exception("interview archival failed")
+            await asyncio.sleep(self.interval)
+
+    async def ensure_partitions(self) -> int:
+        """Creates the missing monthly partitions; returns how many."""
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT ensure_interview_session_partitions(%s)",
+                    (PARTITION_MONTHS_AHEAD,),
+                )
+                (created,) = await cur.fetchone()
+        if created:
+            logger.info("created %d interview session partition(s)", created)
+        return created
+
+    async def archive(self) -> int:
+        """Archives up to ``ARCHIVE_BATCH`` interviews; returns how many."""
+        if settings.interview_archive_after_days <= 0:
+            return 0
+        get_archivable_query = """
+        SELECT
+            id,
+            created_at,
+            transcript,
+            ai_detected_response,
+            annotated_response,
+            annotation_patch,
+            transcript_blob
+        FROM
+            candidate_interview_question_session
+        WHERE
+            archived_at IS NULL
+            AND end_time IS NOT NULL
+            AND end_time < CURRENT_TIMESTAMP - make_interval(days => %(days)s)
+            AND (
+                last_read_at IS NULL
+                OR last_read_at < CURRENT_TIMESTAMP - make_interval(days => %(days)s)
+            )
+        ORDER BY
+            end_time
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+        """
+        insert_archive_query = """
+        INSERT INTO
+            interview_session_archive
+        (interview_session_id, interview_created_at, payload, transcript_blob)
+        VALUES
+            (%(id)s, %(created_at)s, %(payload)s, %(transcript_blob)s)
+        ON CONFLICT (interview_session_id) DO UPDATE
+        SET
+            payload = EXCLUDED.payload,
+            transcript_blob = EXCLUDED.transcript_blob,
+            archived_at = CURRENT_TIMESTAMP
+        """
+        clear_archived_query = """
+        UPDATE
+            candidate_interview_question_session
+        SET
+            transcript = NULL,
+            ai_detected_response = NULL,
+            annotated_response = NULL,
+            annotation_patch = NULL,
+            transcript_blob = NULL,
+            archived_at = CURRENT_TIMESTAMP,
+            rehydrated_at = NULL
+        WHERE
+            id = ANY(%(ids)s)
+        """
+        async with pool.connection() as conn:
+            conn.row_factory = dict_row
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT pg_try_advisory_xact_lock(%s) AS locked",
+                    (ARCHIVER_LOCK,),
+                )
+                if not (await cur.fetchone())["locked"]:
+                    return 0
+                await cur.execute(
+                    get_archivable_query,
+                    {
+                        "days": settings.interview_archive_after_days,
+                        "limit": ARCHIVE_BATCH,
+                    },
+                )
+                rows = await cur.fetchall()
+                if not rows:
+                    return 0
+                payloads = await asyncio.to_thread(_pack_all, rows)
+                await cur.executemany(
+                    insert_archive_query,
+                    [
+                        {
+                            "id": row["id"],
+                            "created_at": row["created_at"],
+                            "payload": payload,
+                            "transcript_blob": row["transcript_blob"],
+                        }
+                        for row, payload in zip(rows, payloads)
+                    ],
+                )
+                await cur.execute(
+                    clear_archived_query, {"ids": [row["id"] for row in rows]}
+                )
+        return len(rows)
+
+
+interview_archiver = InterviewArchiver()
+
+
+async def rehydrate_interview(interview_id: str, db) -> bool:
+    """
+    Restores an archived interview's JSONB into
+    ``candidate_interview_question_session``; False when it is not archived.
+    """
+    conn, cur = db
+    get_archive_query = """
+    SELECT
+        payload,
+        transcript_blob
+    FROM
+        interview_session_archive
+    WHERE
+        interview_session_id = %(interview_id)s
+    """
+    await cur.execute(get_archive_query, {"interview_id": interview_id})
+    archived = await cur.fetchone()
+    if not archived:
+        return False
+
+    columns = unpack(archived["payload"])
+    # archives written before annotation_patch and transcript_blob were
+    # archived lack them, and the row still has them
+    restore_interview_query = """
+    UPDATE
+        candidate_interview_question_session
+    SET
+        transcript = COALESCE(%(transcript)s, transcript),
+        ai_detected_response = COALESCE(
+            %(ai_detected_response)s, ai_detected_response
+        ),
+        annotated_response = COALESCE(%(annotated_response)s, annotated_response),
+        annotation_patch = COALESCE(%(annotation_patch)s, annotation_patch),
+        transcript_blob = COALESCE(%(transcript_blob)s::bytea, transcript_blob),
+        archived_at = NULL,
+        rehydrated_at = CURRENT_TIMESTAMP,
+        last_read_at = CURRENT_TIMESTAMP
+    WHERE
+        id = %(interview_id)s AND archived_at IS NOT NULL
+    """
+    await cur.execute(
+        restore_interview_query,
+        {
+            "interview_id": interview_id,
+            "transcript_blob": archived["transcript_blob"],
+            **{
+                column: None if columns.get(column) is None else Jsonb(columns[column])
+                for column in ARCHIVED_JSONB_COLUMNS
+            },
+        },
+    )
+    delete_archive_query = """
+    DELETE FROM
+        interview_session_archive
+    WHERE
+        interview_session_id = %(interview_id)s
+    """
+    await cur.execute(delete_archive_query, {"interview_id": interview_id})
+    return True
+
+
+async def mark_interview_read(interview_id: str, db) -> None:
+    """
+    Records a read of a closed interview, so the archiver leaves it alone
+    while it is still in use. Callers only call this when their row matched
+    ``NEEDS_READ_MARK_SQL``.
+    """
+    conn, cur = db
+    mark_read_query = """
+    UPDATE
+        candidate_interview_question_session
+    SET
+        last_read_at = CURRENT_TIMESTAMP
+    WHERE
+        id = %(interview_id)s
+    """
+    await cur.execute(mark_read_query, {"interview_id": interview_id})
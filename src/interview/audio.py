@@ -0,0 +1,288 @@
+import re
+from uuid import UUID
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from src.interview.model import CompleteAudioUploadRequest, CreateAudioUploadRequest
+from src.shared.db import open_connection
+from src.shared.storage import (
+    ChecksumMismatch,
+    PartTooLarge,
+    UploadSealed,
+    object_store,
+)
+
+# recommended part size handed to clients; parts may be up to twice that
+AUDIO_PART_SIZE = 8 * 1024 * 1024
+MAX_PART_BYTES = 2 * AUDIO_PART_SIZE
+MAX_PARTS = 10_000
+AUDIO_EXTENSIONS = {
+    "audio/webm": ".webm",
+    "audio/ogg": ".ogg",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/mpeg": ".mp3",
+    "audio/mp4": ".m4a",
+}
+SHA256_PATTERN = re.compile(r"[0-9a-fA-F]{64}")
+
+
+def _message(status_code: int, message: str, **extra) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"message": message, **extra})
+
+
+async def create_audio_upload(interview_id: str, request: CreateAudioUploadRequest, db):
+    conn, cur = db
+    if request.content_type not in AUDIO_EXTENSIONS:
+        return _message(
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            f"Unsupported audio type {request.content_type}",
+        )
+
+    create_upload_query = """
+    INSERT INTO
+        interview_audio_upload
+    (interview_session_id, content_type, total_size)
+    SELECT
+        id, %(content_type)s, %(total_size)s
+    FROM
+        candidate_interview_question_session
+    WHERE
+        id = %(interview_id)s
+    RETURNING id
+    """
+    await cur.execute(
+        create_upload_query,
+        {
+            "interview_id": interview_id,
+            "content_type": request.content_type,
+            "total_size": request.total_size,
+        },
+    )
+    upload = await cur.fetchone()
+    if not upload:
+        return _message(status.HTTP_404_NOT_FOUND, "Interview Not Found")
+
+    return {
+        "upload_id": upload["id"],
+        "part_size": AUDIO_PART_SIZE,
+        "max_part_size": MAX_PART_BYTES,
+    }
+
+
+async def _get_upload(interview_id: str, upload_id: UUID, db, lock: bool = False):
+    conn, cur = db
+    get_upload_query = f"""
+    SELECT
+        id,
+        interview_session_id,
+        content_type,
+        total_size,
+        status,
+        object_key
+    FROM
+        interview_audio_upload
+    WHERE
+        id = %(upload_id)s AND interview_session_id = %(interview_id)s
+    {"FOR UPDATE" if lock else ""}
+    """
+    await cur.execute(
+        get_upload_query, {"upload_id": upload_id, "interview_id": interview_id}
+    )
+    return await cur.fetchone()
+
+
+async def _get_parts(upload_id: UUID, db) -> list[dict]:
+    conn, cur = db
+    get_parts_query = """
+    SELECT
+        part_number,
+        size,
+        sha256
+    FROM
+        interview_audio_upload_part
+    WHERE
+        upload_id = %(upload_id)s
+    ORDER BY
+        part_number
+    """
+    await cur.execute(get_parts_query, {"upload_id": upload_id})
+    return await cur.fetchall()
+
+
+async def upload_audio_part(
+    interview_id: str,
+    upload_id: UUID,
+    part_number: int,
+    request: Request,
+    sha256: str,
+):
+    """
+    Streams one chunk of the request body straight into the object store.
+
+    No pool connection is held while the body streams in: the upload is
+    checked and the part recorded in two short checkouts around it, so slow
+    uploaders can't exhaust the pool. Re-sending a part replaces it.
+    """
+    if not 1 <= part_number <= MAX_PARTS:
+        return _message(status.HTTP_400_BAD_REQUEST, "Invalid part number")
+    if not SHA256_PATTERN.fullmatch(sha256):
+        return _message(status.HTTP_400_BAD_REQUEST, "Invalid X-Chunk-SHA256 header")
+
+    async with open_connection() as db:
+        upload = await _get_upload(interview_id, upload_id, db)
+    if not upload:
+        return _message(status.HTTP_404_NOT_FOUND, "Upload Not Found")
+    if upload["status"] != "uploading":
+        return _message(status.HTTP_409_CONFLICT, f"Upload is {upload['status']}")
+
+    try:
+        size = await object_store.put_part(
+            str(upload_id), part_number, request.stream(), sha256, MAX_PART_BYTES
+        )
+    except ChecksumMismatch:
+        return _message(
+            status.HTTP_422_UNPROCESSABLE_CONTENT, "Chunk checksum mismatch"
+        )
+    except PartTooLarge:
+        return _message(
+            status.HTTP_413_CONTENT_TOO_LARGE,
+            f"Chunk exceeds {MAX_PART_BYTES} bytes",
+        )
+    except UploadSealed:
+        return _message(status.HTTP_409_CONFLICT, "Upload is being completed")
+
+    record_part_query = """
+    INSERT INTO
+        interview_audio_upload_part
+    (upload_id, part_number, size, sha256)
+    VALUES
+        (%(upload_id)s, %(part_number)s, %(size)s, %(sha256)s)
+    ON CONFLICT (upload_id, part_number) DO UPDATE
+    SET
+        size = EXCLUDED.size,
+        sha256 = EXCLUDED.sha256,
+        created_at = CURRENT_TIMESTAMP
+    """
+    async with open_connection() as (conn, cur):
+        await cur.execute(
+            record_part_query,
+            {
+                "upload_id": upload_id,
+                "part_number": part_number,
+                "size": size,
+                "sha256": sha256.lower(),
+            },
+        )
+
+    return {"part_number": part_number, "size": size, "sha256": sha256.lower()}
+
+
+async def get_audio_upload(interview_id: str, upload_id: UUID, db):
+    """Upload state and received parts, for resuming after a disconnect."""
+    upload = await _get_upload(interview_id, upload_id, db)
+    if not upload:
+        return _message(status.HTTP_404_NOT_FOUND, "Upload Not Found")
+    return {**upload, "parts": await _get_parts(upload_id, db)}
+
+
+async def complete_audio_upload(
+    interview_id: str, upload_id: UUID, request: CompleteAudioUploadRequest, db
+):
+    conn, cur = db
+    upload = await _get_upload(interview_id, upload_id, db, lock=True)
+    if not upload:
+        return _message(status.HTTP_404_NOT_FOUND, "Upload Not Found")
+    if upload["status"] == "completed":
+        return {
+            "message": "Upload already completed",
+            "object_key": upload["object_key"],
+            "audio_url": object_store.url(upload["object_key"]),
+        }
+    if upload["status"] != "uploading":
+        return _message(status.HTTP_409_CONFLICT, f"Upload is {upload['status']}")
+
+    parts = await _get_parts(upload_id, db)
+    received = {part["part_number"] for part in parts}
+    expected = list(range(1, request.part_count + 1))
+    missing = [number for number in expected if number not in received]
+    if missing or len(received) != len(expected):
+        return _message(
+            status.HTTP_409_CONFLICT,
+            "Upload parts do not match part_count",
+            missing_parts=missing,
+        )
+    total_size = sum(part["size"] for part in parts)
+    if upload["total_size"] is not None and total_size != upload["total_size"]:
+        return _message(
+            status.HTTP_409_CONFLICT,
+            f"Received {total_size} bytes, expected {upload['total_size']}",
+        )
+
+    object_key = (
+        f"interview-audio/{upload['interview_session_id']}/"
+        f"{upload_id}{AUDIO_EXTENSIONS[upload['content_type']]}"
+    )
+    await object_store.complete(str(upload_id), expected, object_key)
+    audio_url = object_store.url(object_key)
+
+    complete_upload_query = """
+    UPDATE
+        interview_audio_upload
+    SET
+        status = 'completed',
+        object_key = %(object_key)s,
+        total_size = %(total_size)s,
+        completed_at = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE
+        id = %(upload_id)s
+    """
+    await cur.execute(
+        complete_upload_query,
+        {"upload_id": upload_id, "object_key": object_key, "total_size": total_size},
+    )
+    update_audio_url_query = """
+    UPDATE
+        candidate_interview_question_session
+    SET
+        audio_url = %(audio_url)s,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE
+        id = %(interview_id)s
+    """
+    await cur.execute(
+        update_audio_url_query,
+        {"audio_url": audio_url, "interview_id": upload["interview_session_id"]},
+    )
+    # the parts go only once the upload is recorded as completed; until
+    # then a failed completion can be retried from them
+    await conn.commit()
+    await object_store.abort(str(upload_id))
+
+    return {"object_key": object_key, "audio_url": audio_url, "size": total_size}
+
+
+async def abort_audio_upload(interview_id: str, upload_id: UUID, db):
+    conn, cur = db
+    abort_upload_query = """
+    UPDATE
+        interview_audio_upload
+    SET
+        status = 'aborted',
+        updated_at = CURRENT_TIMESTAMP
+    WHERE
+        id = %(upload_id)s
+        AND interview_session_id = %(interview_id)s
+        AND status = 'uploading'
+    RETURNING id
+    """
+    await cur.execute(
+        abort_upload_query, {"upload_id": upload_id, "interview_id": interview_id}
+    )
+    if not await cur.fetchone():
+        return _message(status.HTTP_404_NOT_FOUND, "Upload Not Found")
+    await conn.commit()
+    await object_store.abort(str(upload_id))
+    return {"message": "Upload Aborted"}
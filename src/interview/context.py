@@ -0,0 +1,228 @@
+import re
+
+from src.shared.tracing import traced
+
+# rough chars-per-token for English prose; keeps us free of a tokenizer
+CHARS_PER_TOKEN = 4
+RESUME_CONTEXT_TOKENS = 700
+JOB_DESCRIPTION_CONTEXT_TOKENS = 600
+MAX_RESPONSIBILITIES = 8
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _squeeze(value, max_chars: int) -> str:
+    """Collapses whitespace; only looks at a prefix of long text."""
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(item) for item in value if item)
+    # whitespace rarely more than halves text, so twice the budget is plenty
+    return WHITESPACE_PATTERN.sub(" ", str(value)[: max_chars * 2]).strip()
+
+
+def _clip(text: str, max_chars: int) -> str:
+    """Cuts ``text`` to ``max_chars`` at a word boundary."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(" ", 0, max_chars)
+    return text[: cut if cut > 0 else max_chars].rstrip(" ,.;") + " …"
+
+
+def _assemble(sections: list[tuple[str, object, int | None]], max_tokens: int) -> str:
+    """
+    Joins ``(label, value, token cap)`` sections into ``label: value`` lines,
+    clipping each to its cap and the whole to ``max_tokens``. A ``None`` cap
+    lets the section take whatever budget is left, so free text goes last.
+    """
+    remaining = max_tokens * CHARS_PER_TOKEN
+    lines = []
+    for label, value, cap in sections:
+        budget = remaining - len(label) - 3
+        if cap is not None:
+            budget = min(budget, cap * CHARS_PER_TOKEN)
+        if budget <= 0:
+            continue
+        text = _squeeze(value, budget)
+        if not text:
+            continue
+        line = f"{label}: {_clip(text, budget)}"
+        lines.append(line)
+        remaining -= len(line) + 1
+    return "\n".join(lines)
+
+
+@traced()
+def build_resume_context(resume: dict) -> str:
+    """
+    Condenses a ``resume_detail`` row into a token-bounded prompt context.
+
+    Structured fields come first; the raw resume text only fills whatever
+    budget they leave.
+    """
+    current = " at ".join(
+        part
+        for part in (resume.get("job_title"), resume.get("current_company"))
+        if part
+    )
+    if resume.get("yoe") is not None:
+        current = f"{current} ({resume['yoe']:g} yrs experience)".strip()
+    return _assemble(
+        [
+            ("Name", resume.get("name"), 20),
+            ("Current role", current, 40),
+            ("Best fit role", resume.get("best_fit_role"), 20),
+            ("Qualification", resume.get("qualification"), 40),
+            ("Skills", resume.get("skill_set"), 120),
+            ("Experience", resume.get("work_experience"), 220),
+            ("Summary", resume.get("introduction"), 80),
+            ("Resume", resume.get("cf_text"), None),
+        ],
+        RESUME_CONTEXT_TOKENS,
+    )
+
+
+@traced()
+def build_job_description_context(job_description: dict) -> str:
+    """Condenses a ``job_description`` row into a token-bounded prompt context."""
+    min_yoe, max_yoe = job_description.get("min_yoe"), job_description.get("max_yoe")
+    experience = ""
+    if min_yoe is not None or max_yoe is not None:
+        if max_yoe is not None:
+            experience = f"{min_yoe or 0:g}-{max_yoe:g} yrs"
+        else:
+            experience = f"{min_yoe:g}+ yrs"
+    responsibilities = (job_description.get("responsibilities") or [])[
+        :MAX_RESPONSIBILITIES
+    ]
+    return _assemble(
+        [
+            ("Title", job_description.get("job_title"), 20),
+            ("Experience", experience, 10),
+            ("Education", job_description.get("education"), 40),
+            ("Must have", job_description.get("must_have_skills"), 80),
+            ("Nice to have", job_description.get("nice_to_have_skills"), 60),
+            ("Responsibilities", "; ".join(responsibilities), 150),
+            ("Description", job_description.get("job_description"), None),
+        ],
+        JOB_DESCRIPTION_CONTEXT_TOKENS,
+    )
+
+
+async def _upsert_contexts(source: str, rows: list[dict], build, db) -> dict:
+    conn, cur = db
+    contexts = {row["id"]: build(row) for row in rows}
+    upsert_context_query = """
+    INSERT INTO
+        prompt_context
+    (source, source_id, source_updated_at, context, token_estimate)
+    VALUES
+        (%(source)s, %(source_id)s, %(source_updated_at)s, %(context)s,
+         %(token_estimate)s)
+    ON CONFLICT (source, source_id) DO UPDATE
+    SET
+        source_updated_at = EXCLUDED.source_updated_at,
+        context = EXCLUDED.context,
+        token_estimate = EXCLUDED.token_estimate,
+        updated_at = CURRENT_TIMESTAMP
+    """
+    await cur.executemany(
+        upsert_context_query,
+        [
+            {
+                "source": source,
+                "source_id": row["id"],
+                "source_updated_at": row["updated_at"],
+                "context": contexts[row["id"]],
+                "token_estimate": estimate_tokens(contexts[row["id"]]),
+            }
+            for row in rows
+        ],
+    )
+    return contexts
+
+
+async def refresh_resume_contexts(resume_detail_ids: list, db) -> dict:
+    """Rebuilds and stores the contexts of the given resumes; returns them by id."""
+    conn, cur = db
+    get_resumes_query = """
+    SELECT
+        id, updated_at, name, job_title, current_company, yoe, best_fit_role,
+        qualification, skill_set, work_experience, introduction, cf_text
+    FROM
+        resume_detail
+    WHERE
+        id = ANY(%(ids)s)
+    """
+    await cur.execute(get_resumes_query, {"ids": resume_detail_ids})
+    rows = await cur.fetchall()
+    return await _upsert_contexts("resume", rows, build_resume_context, db)
+
+
+async def refresh_job_description_contexts(job_description_ids: list, db) -> dict:
+    """Rebuilds and stores the contexts of the given JDs; returns them by id."""
+    conn, cur = db
+    get_job_descriptions_query = """
+    SELECT
+        id, updated_at, job_title, job_description, min_yoe, max_yoe, education,
+        must_have_skills, nice_to_have_skills, responsibilities
+    FROM
+        job_description
+    WHERE
+        id = ANY(%(ids)s)
+    """
+    await cur.execute(get_job_descriptions_query, {"ids": job_description_ids})
+    rows = await cur.fetchall()
+    return await _upsert_contexts(
+        "job_description", rows, build_job_description_context, db
+    )
+
+
+async def resolve_prompt_contexts(interview: dict, db) -> None:
+    """
+    Fills in ``candidate_resume``/``job_description`` on an interview row
+    whose stored context was missing or stale, building and storing it.
+    """
+    if interview["candidate_resume"] is None and interview["resume_detail_id"]:
+        contexts = await refresh_resume_contexts([interview["resume_detail_id"]], db)
+        interview["candidate_resume"] = contexts.get(interview["resume_detail_id"])
+    if interview["job_description"] is None and interview["job_description_id"]:
+        contexts = await refresh_job_description_contexts(
+            [interview["job_description_id"]], db
+        )
+        interview["job_description"] = contexts.get(interview["job_description_id"])
+
+
+async def precompute_prompt_contexts(limit: int, db) -> dict:
+    """
+    Builds contexts for up to ``limit`` resumes and JDs that have none or
+    whose source row changed since; meant to run ahead of interviews.
+    """
+    conn, cur = db
+    stale_query = """
+    SELECT
+        src.id
+    FROM
+        {table} src
+    LEFT JOIN
+        prompt_context pc ON pc.source = %(source)s AND pc.source_id = src.id
+    WHERE
+        pc.source_id IS NULL
+        OR pc.source_updated_at IS DISTINCT FROM src.updated_at
+    LIMIT %(limit)s
+    """
+    refreshed = {}
+    for source, table, refresh in (
+        ("resume", "resume_detail", refresh_resume_contexts),
+        ("job_description", "job_description", refresh_job_description_contexts),
+    ):
+        await cur.execute(
+            stale_query.format(table=table), {"source": source, "limit": limit}
+        )
+        ids = [row["id"] for row in await cur.fetchall()]
+        refreshed[source] = len(await refresh(ids, db)) if ids else 0
+    return refreshed
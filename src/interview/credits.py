@@ -0,0 +1,267 @@
+import asyncio
+import logging
+
+from psycopg.rows import dict_row
+
+from src.shared.db import pool
+
+logger = logging.getLogger(__name__)
+
+# one worker rolls up at a time; the others skip their turn
+CREDIT_ROLLUP_LOCK = 0xC2ED17
+ROLLUP_INTERVAL_SECONDS = 10.0
+ROLLUP_BATCH = 5000
+
+# interviews carry their organization in metadata; anything that is not a
+# UUID (interview_credits.organization_id) is not billed
+ORGANIZATION_ID_SQL = """
+CASE
+    WHEN ciqs.metadata->>'organization_id'
+        ~* '^[0-9a-f]{8}-([0-9a-f]{4}-){3}[0-9a-f]{12}$'
+    THEN (ciqs.metadata->>'organization_id')::uuid
+END
+"""
+
+
+async def reserve_interview_credit(interview_id: str, db) -> None:
+    """
+    Reserves one credit for a starting interview.
+
+    Appends to ``interview_credit_delta`` instead of updating the
+    organization's ``interview_credits`` row, so concurrent starts never
+    wait on each other; a second reservation for the same interview is a
+    no-op.
+    """
+    conn, cur = db
+    reserve_credit_query = f"""
+    INSERT INTO
+        interview_credit_delta
+    (organization_id, interview_type, interview_session_id, kind, reserved_credits)
+    SELECT
+        organization_id,
+        interview_type,
+        id,
+        'reserve',
+        1
+    FROM (
+        SELECT
+            {ORGANIZATION_ID_SQL} AS organization_id,
+            UPPER(ciqs.interview_mode) AS interview_type,
+            ciqs.id
+        FROM
+            candidate_interview_question_session ciqs
+        WHERE
+            ciqs.id = %(interview_id)s
+    ) interview
+    WHERE
+        organization_id IS NOT NULL
+    ON CONFLICT (interview_session_id, kind) DO NOTHING
+    """
+    await cur.execute(reserve_credit_query, {"interview_id": interview_id})
+
+
+async def settle_interview_credit(interview_id: str, db) -> None:
+    """
+    Settles an ended interview: releases its reservation and moves
+    ``total_duration_minutes`` from available to completed minutes.
+
+    Called once ``total_duration_minutes`` is set, in the same transaction;
+    only the first settlement of an interview counts.
+    """
+    conn, cur = db
+    settle_credit_query = f"""
+    INSERT INTO
+        interview_credit_delta
+    (organization_id, interview_type, interview_session_id, kind,
+     reserved_credits, available_minutes, completed_minutes, completed_count)
+    SELECT
+        organization_id,
+        interview_type,
+        id,
+        'settle',
+        -- interviews started before reservations existed hold none
+        -reserved.reservations,
+        -minutes,
+        minutes,
+        1
+    FROM (
+        SELECT
+            {ORGANIZATION_ID_SQL} AS organization_id,
+            UPPER(ciqs.interview_mode) AS interview_type,
+            ciqs.id,
+            COALESCE(ciqs.total_duration_minutes, 0) AS minutes
+        FROM
+            candidate_interview_question_session ciqs
+        WHERE
+            ciqs.id = %(interview_id)s
+    ) interview,
+    LATERAL (
+        SELECT
+            COUNT(*) AS reservations
+        FROM
+            interview_credit_delta d
+        WHERE
+            d.interview_session_id = interview.id AND d.kind = 'reserve'
+    ) reserved
+    WHERE
+        organization_id IS NOT NULL
+    ON CONFLICT (interview_session_id, kind) DO NOTHING
+    """
+    await cur.execute(settle_credit_query, {"interview_id": interview_id})
+
+
+class CreditRollup:
+    """
+    Periodically folds pending ``interview_credit_delta`` rows into
+    ``interview_credits``, one upsert per organization and interview type.
+
+    Deltas are marked rolled up rather than deleted: they stay as the
+    audit trail and keep reservations and settlements idempotent.
+    """
+
+    def __init__(self, interval: float = ROLLUP_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.rollup()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                while await self.rollup() == ROLLUP_BATCH:
+                    pass
+            except Exception:
+                logger.exception("credit rollup failed")
+
+    async def rollup(self) -> int:
+        """Applies up to ``ROLLUP_BATCH`` deltas; returns how many."""
+        rollup_query = """
+        WITH drained AS (
+            UPDATE
+                interview_credit_delta d
+            SET
+                rolled_up_at = CURRENT_TIMESTAMP
+            WHERE
+                d.id IN (
+                    SELECT id
+                    FROM interview_credit_delta
+                    WHERE rolled_up_at IS NULL
+                    ORDER BY id
+                    LIMIT %(limit)s
+                )
+            RETURNING
+                d.organization_id,
+                d.interview_type,
+                d.reserved_credits,
+                d.available_minutes,
+                d.completed_minutes,
+                d.completed_count
+        ),
+        applied AS (
+            INSERT INTO
+                interview_credits
+            (organization_id, interview_type, reserved_credits,
+             available_minutes, completed_minutes, completed_count)
+            SELECT
+                organization_id,
+                interview_type,
+                SUM(reserved_credits),
+                SUM(available_minutes),
+                SUM(completed_minutes),
+                SUM(completed_count)
+            FROM
+                drained
+            GROUP BY
+                organization_id, interview_type
+            ON CONFLICT (organization_id, interview_type) DO UPDATE
+            SET
+                reserved_credits = COALESCE(interview_credits.reserved_credits, 0)
+                    + EXCLUDED.reserved_credits,
+                available_minutes = COALESCE(interview_credits.available_minutes, 0)
+                    + EXCLUDED.available_minutes,
+                completed_minutes = COALESCE(interview_credits.completed_minutes, 0)
+                    + EXCLUDED.completed_minutes,
+                completed_count = COALESCE(interview_credits.completed_count, 0)
+                    + EXCLUDED.completed_count,
+                updated_at = CURRENT_TIMESTAMP
+        )
+        SELECT
+            COUNT(*) AS deltas
+        FROM
+            drained
+        """
+        async with pool.connection() as conn:
+            conn.row_factory = dict_row
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT pg_try_advisory_xact_lock(%s) AS locked",
+                    (CREDIT_ROLLUP_LOCK,),
+                )
+                if not (await cur.fetchone())["locked"]:
+                    return 0
+                await cur.execute(rollup_query, {"limit": ROLLUP_BATCH})
+                return (await cur.fetchone())["deltas"]
+
+
+credit_rollup = CreditRollup()
+
+
+async def get_credit_balance(organization_id: str, db) -> list:
+    """
+    An organization's credits per interview type: the rolled-up row plus
+    the deltas still pending, so reads are exact between rollups.
+    """
+    conn, cur = db
+    credit_balance_query = """
+    WITH pending AS (
+        SELECT
+            interview_type,
+            SUM(reserved_credits) AS reserved_credits,
+            SUM(available_minutes) AS available_minutes,
+            SUM(completed_minutes) AS completed_minutes,
+            SUM(completed_count) AS completed_count,
+            COUNT(*) AS deltas
+        FROM
+            interview_credit_delta
+        WHERE
+            organization_id = %(organization_id)s AND rolled_up_at IS NULL
+        GROUP BY
+            interview_type
+    ),
+    credits AS (
+        SELECT
+            *
+        FROM
+            interview_credits
+        WHERE
+            organization_id = %(organization_id)s
+    )
+    SELECT
+        COALESCE(c.interview_type, p.interview_type) AS interview_type,
+        COALESCE(c.available_minutes, 0) + COALESCE(p.available_minutes, 0)
+            AS available_minutes,
+        COALESCE(c.reserved_credits, 0) + COALESCE(p.reserved_credits, 0)
+            AS reserved_credits,
+        COALESCE(c.completed_minutes, 0) + COALESCE(p.completed_minutes, 0)
+            AS completed_minutes,
+        COALESCE(c.completed_count, 0) + COALESCE(p.completed_count, 0)
+            AS completed_count,
+        c.unused_links,
+        c.expired_links,
+        COALESCE(p.deltas, 0) AS pending_deltas
+    FROM
+        credits c
+        FULL JOIN pending p ON p.interview_type = c.interview_type
+    ORDER BY
+        interview_type
+    """
+    await cur.execute(credit_balance_query, {"organization_id": organization_id})
+    return await cur.fetchall()
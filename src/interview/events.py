@@ -0,0 +1,133 @@
+import asyncio
+import json
+from collections import defaultdict
+from uuid import UUID
+
+from fastapi import status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from src.interview.service import get_interview_status
+from src.shared.db import open_connection
+from src.shared.notify import listener
+
+INTERVIEW_EVENTS_CHANNEL = "interview_events"
+TERMINAL_STATUSES = ("completed", "terminated")
+KEEPALIVE_SECONDS = 15.0
+SUBSCRIBER_QUEUE_SIZE = 8
+
+# queued for every subscriber when events may have been missed
+RESYNC = object()
+
+
+class InterviewEventHub:
+    """
+    Fans ``interview_events`` notifications out to the SSE streams waiting
+    on each interview.
+
+    Every event is a full snapshot of the interview's state, so a slow
+    subscriber whose queue is full just loses the oldest snapshot.
+    Subscriptions are keyed on the canonical (lowercase) UUID, the form
+    notification payloads carry.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, interview_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[str(UUID(interview_id))].add(queue)
+        return queue
+
+    def unsubscribe(self, interview_id: str, queue: asyncio.Queue) -> None:
+        key = str(UUID(interview_id))
+        subscribers = self._subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[key]
+
+    def publish(self, payload: str | None) -> None:
+        if payload is None:
+            for subscribers in self._subscribers.values():
+                for queue in subscribers:
+                    self._offer(queue, RESYNC)
+            return
+        event = json.loads(payload)
+        for queue in self._subscribers.get(str(UUID(event["id"])), ()):
+            self._offer(queue, event)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event) -> None:
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+hub = InterviewEventHub()
+listener.register(INTERVIEW_EVENTS_CHANNEL, hub.publish)
+
+
+def _format_event(event: dict) -> str:
+    return f"event: status\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def _read_status(interview_id: str) -> dict | None:
+    # short checkout: released before streaming starts
+    async with open_connection() as db:
+        return await get_interview_status(interview_id, db)
+
+
+async def interview_events(interview_id: str):
+    """
+    Streams the interview's status as Server-Sent Events.
+
+    Sends the current state first, then one event per status or termination
+    change published by the database trigger, and ends the stream once the
+    interview reaches a terminal status. Waiting clients hold no database
+    connection.
+    """
+    try:
+        interview_id = str(UUID(interview_id))
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Interview Not Found"},
+        )
+    # subscribe before reading so no transition can slip in between
+    queue = hub.subscribe(interview_id)
+    try:
+        current = await _read_status(interview_id)
+    except BaseException:
+        hub.unsubscribe(interview_id, queue)
+        raise
+    if not current:
+        hub.unsubscribe(interview_id, queue)
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Interview Not Found"},
+        )
+
+    async def stream():
+        event = current
+        try:
+            while True:
+                if event is RESYNC:
+                    event = await _read_status(interview_id)
+                if event is not None:
+                    yield _format_event(event)
+                    if event["status"] in TERMINAL_STATUSES:
+                        return
+                try:
+                    event = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    event = None
+                    yield ": keepalive\n\n"
+        finally:
+            hub.unsubscribe(interview_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,107 @@
+from enum import Enum
+
+from src.shared.batch import BatchWriter
+
+# USD per 1M tokens: (input, cached input, output)
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+
+class LLMPurpose(str, Enum):
+    """What an LLM call was made for; stored in ``llm_usage_ledger.purpose``."""
+
+    RECONSTRUCTION = "reconstruction"
+    EVALUATION = "evaluation"
+    REALTIME_SESSION = "realtime_session"
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int
+) -> float:
+    """Estimates the USD cost of a call from its token usage."""
+    if model not in MODEL_PRICING:
+        return 0.0
+    input_price, cached_price, output_price = MODEL_PRICING[model]
+    uncached = prompt_tokens - cached_tokens
+    return (
+        uncached * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+
+
+class LLMUsageLedger(BatchWriter):
+    """Batches rows for ``llm_usage_ledger``; one row per LLM call."""
+
+    async def write(self, cur, items: list) -> None:
+        insert_ledger_query = """
+        INSERT INTO
+            llm_usage_ledger
+        (interview_session_id, purpose, model, prompt_tokens, completion_tokens,
+         cached_tokens, latency_ms, retries, cache_hit, cost_usd, error)
+        VALUES
+            (%(interview_id)s, %(purpose)s, %(model)s, %(prompt_tokens)s,
+             %(completion_tokens)s, %(cached_tokens)s, %(latency_ms)s,
+             %(retries)s, %(cache_hit)s, %(cost_usd)s, %(error)s)
+        """
+        await cur.executemany(insert_ledger_query, items)
+
+
+ledger = LLMUsageLedger()
+
+
+def llm_error(exc: BaseException) -> str:
+    """What a failed LLM call records in ``llm_usage_ledger.error``."""
+    status_code = getattr(exc, "status_code", None) or getattr(
+        getattr(exc, "response", None), "status_code", None
+    )
+    if status_code:
+        return f"{type(exc).__name__} ({status_code})"
+    return type(exc).__name__
+
+
+def record_llm_call(
+    interview_id: str | None,
+    purpose: LLMPurpose,
+    model: str,
+    latency_ms: float,
+    usage=None,
+    retries: int = 0,
+    error: str | None = None,
+) -> None:
+    """
+    Queues a ledger row for an LLM call, failed ones included; never blocks
+    the caller.
+
+    Args:
+        interview_id: Interview the call was made for.
+        purpose: Why the call was made.
+        model: Model or deployment name.
+        latency_ms: Wall-clock latency including client retries.
+        usage: The ``usage`` object from the API response, if any.
+        retries: Number of retries the client performed.
+        error: Why the call failed (see ``llm_error``); None if it succeeded.
+    """
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) or 0
+
+    ledger.add(
+        {
+            "interview_id": interview_id,
+            "purpose": purpose.value,
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "latency_ms": round(latency_ms, 1),
+            "retries": retries,
+            "cache_hit": cached_tokens > 0,
+            "cost_usd": estimate_cost(
+                model, prompt_tokens, completion_tokens, cached_tokens
+            ),
+            "error": error,
+        }
+    )
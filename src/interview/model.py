@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ConversationRequest(BaseModel):
@@ -10,6 +10,24 @@ class EditConversationRequest(BaseModel):
     user: str
 
 
+class ConversationEdit(BaseModel):
+    index: int = Field(ge=0)
+    user: str
+
+
+class BatchEditConversationRequest(BaseModel):
+    edits: list[ConversationEdit] = Field(min_length=1, max_length=500)
+
+
 class PatchInterviewViolation(BaseModel):
-    violation: str
+    violation: str = Field(max_length=100)
     description: str
+
+
+class CreateAudioUploadRequest(BaseModel):
+    content_type: str = "audio/webm"
+    total_size: int | None = None
+
+
+class CompleteAudioUploadRequest(BaseModel):
+    part_count: int
@@ -1,5 +1,7 @@
 from enum import Enum
 
+from src.shared.tracing import traced
+
 
 class InstructionType(str, Enum):
     """Defines the available interview types (Prescreening or L1)."""
@@ -8,6 +10,7 @@ class InstructionType(str, Enum):
     L1 = "L1"
 
 
+@traced()
 async def get_base_instructions(
     instruction_type: InstructionType,
     job_title: str,
@@ -323,6 +326,7 @@ async def get_base_instructions(
         return instructions
 
 
+@traced()
 async def get_evaluation_prompt(
     instruction_type: InstructionType,
     conversation_text: str,
@@ -520,6 +524,7 @@ async def get_evaluation_prompt(
     return final_prompt
 
 
+@traced()
 def conversation_reconstruct_prompt(conversation):
     """
     Generates the prompt used to clean and reconstruct the interview transcript.
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+from src.shared.config import settings
+from src.shared.notify import listener
+
+PRESCREEN_QUESTIONS_CHANNEL = "prescreen_questions"
+
+
+class PrescreenQuestionCache:
+    """
+    Per-worker TTL cache of each requisition's prescreening questions.
+
+    Every candidate on a requisition gets the same questions, so they are
+    read once per worker from ``prescreen_question_snapshot`` (the shared,
+    trigger-maintained tier) and kept for ``ttl`` seconds. Edits NOTIFY
+    ``prescreen_questions`` with the requisition id, which drops the entry
+    on every worker; the TTL only bounds staleness while the listener is
+    reconnecting. Concurrent misses for one requisition share a single read
+    (counted as ``coalesced``); if the caller doing it is cancelled, one of
+    the waiters reads instead.
+
+    Args:
+        ttl: Seconds an entry is served without re-reading.
+        max_entries: Entries kept before the oldest are evicted.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[str, tuple[float, list | None]] = {}
+        self._loading: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        # lookups that waited on another caller's read of the same requisition
+        self.coalesced = 0
+        self.invalidations = 0
+        self._generation = 0
+
+    async def get(self, job_requisition_id, db) -> list | None:
+        key = str(job_requisition_id)
+        while True:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            loading = self._loading.get(key)
+            if loading is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                # only the loader was cancelled, not us: load it ourselves
+                if not loading.cancelled():
+                    raise
+
+        self.misses += 1
+        loading = asyncio.get_running_loop().create_future()
+        self._loading[key] = loading
+        generation = self._generation
+        try:
+            questions = await self._load(key, db)
+        except Exception as error:
+            loading.set_exception(error)
+            # nobody else may be waiting; don't warn about an unread exception
+            loading.exception()
+            raise
+        except BaseException:
+            loading.cancel()
+            raise
+        finally:
+            del self._loading[key]
+        loading.set_result(questions)
+        # an edit notified mid-read may not be in what we read; don't keep it
+        if generation == self._generation:
+            self._store(key, questions)
+        return questions
+
+    async def _load(self, key: str, db) -> list | None:
+        conn, cur = db
+        get_questions_query = """
+        SELECT
+            questions
+        FROM
+            prescreen_question_snapshot
+        WHERE
+            job_requisition_id = %(job_requisition_id)s
+        """
+        await cur.execute(get_questions_query, {"job_requisition_id": key})
+        snapshot = await cur.fetchone()
+        return snapshot["questions"] if snapshot else None
+
+    def _store(self, key: str, questions: list | None) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # dicts keep insertion order, so the first key is the oldest
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = (time.monotonic() + self.ttl, questions)
+
+    def invalidate(self, payload: str | None) -> None:
+        """NOTIFY handler: drops one requisition, or everything after a reconnect."""
+        self.invalidations += 1
+        self._generation += 1
+        if payload is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(payload, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl,
+        }
+
+
+prescreen_questions = PrescreenQuestionCache(settings.prescreen_cache_ttl_seconds)
+listener.register(PRESCREEN_QUESTIONS_CHANNEL, prescreen_questions.invalidate)
@@ -0,0 +1,327 @@
+import asyncio
+import datetime
+import json
+import logging
+import time
+from collections import defaultdict, deque
+
+from fastapi import WebSocket, WebSocketDisconnect, status
+from psycopg.types.json import Jsonb
+from starlette.websockets import WebSocketState
+
+from src.interview.ledger import LLMPurpose, llm_error, record_llm_call
+from src.interview.prompts import InstructionType, get_base_instructions
+from src.interview.service import get_interview_details, mark_interview_started
+from src.interview.timing import QuestionTimer, question_timing
+from src.search.index import index_turn
+from src.shared.batch import BatchWriter
+from src.shared.config import settings
+from src.shared.db import open_connection
+from src.shared.dependency import decode_access_token
+
+logger = logging.getLogger(__name__)
+
+REALTIME_TRANSCRIPTION_MODEL = "whisper-1"
+WS_INTERVIEW_NOT_FOUND = 4404
+WS_INTERVIEW_NOT_ACTIVE = 4409
+
+# Event types are matched on the head of the raw frame so the bulk of the
+# traffic (base64 audio deltas/appends) is forwarded without a json.loads.
+TRANSCRIPT_EVENT_MARKERS = (
+    '"conversation.item.added"',
+    '"conversation.item.created"',
+    '"conversation.item.input_audio_transcription.',
+    '"response.output_audio_transcript.done"',
+    '"response.audio_transcript.done"',
+    '"response.output_text.done"',
+)
+EVENT_HEAD_CHARS = 200
+
+
+def _has_marker(message: str, markers) -> bool:
+    head = message[:EVENT_HEAD_CHARS]
+    return any(marker in head for marker in markers)
+
+
+class TranscriptCollector:
+    """
+    Rebuilds ``{"ai", "user", "time_stamp"}`` turns from realtime events.
+
+    Input transcription finishes asynchronously, often after the assistant
+    has started its next reply, so transcripts are keyed by conversation
+    item and turns are only emitted once every earlier item has its text.
+    """
+
+    def __init__(self):
+        self._order: deque[tuple[str, str]] = deque()
+        self._texts: dict[str, str] = {}
+        self._ai: list[str] = []
+
+    def feed(self, event: dict) -> list[dict]:
+        """Consumes one server event; returns turns that became complete."""
+        event_type = event.get("type", "")
+        if event_type in ("conversation.item.added", "conversation.item.created"):
+            item = event.get("item") or {}
+            if item.get("type") == "message" and item.get("role") in (
+                "user",
+                "assistant",
+            ):
+                self._order.append((item["id"], item["role"]))
+                # typed (not spoken) user input carries its text inline
+                typed = [
+                    part["text"]
+                    for part in item.get("content") or []
+                    if part.get("type") == "input_text" and part.get("text")
+                ]
+                if typed:
+                    self._texts[item["id"]] = " ".join(typed)
+        elif event_type == "conversation.item.input_audio_transcription.completed":
+            self._texts[event["item_id"]] = event.get("transcript", "").strip()
+        elif event_type == "conversation.item.input_audio_transcription.failed":
+            self._texts[event["item_id"]] = ""
+        elif event_type in (
+            "response.output_audio_transcript.done",
+            "response.audio_transcript.done",
+            "response.output_text.done",
+        ):
+            text = (event.get("transcript") or event.get("text") or "").strip()
+            previous = self._texts.get(event["item_id"])
+            self._texts[event["item_id"]] = f"{previous} {text}" if previous else text
+        else:
+            return []
+        return self._drain()
+
+    def _drain(self, final: bool = False) -> list[dict]:
+        turns = []
+        while self._order:
+            item_id, role = self._order[0]
+            if item_id not in self._texts and not final:
+                break
+            self._order.popleft()
+            text = self._texts.pop(item_id, "")
+            if role == "assistant":
+                self._ai.append(text)
+            else:
+                turns.append(self._turn(text))
+        return turns
+
+    def _turn(self, user: str) -> dict:
+        turn = {
+            "ai": " ".join(text for text in self._ai if text),
+            "user": user,
+            "time_stamp": str(datetime.datetime.now()),
+        }
+        self._ai = []
+        return turn
+
+    def finish(self) -> list[dict]:
+        """Flushes everything left, including a trailing unanswered question."""
+        turns = self._drain(final=True)
+        if any(self._ai):
+            turns.append(self._turn(""))
+        return turns
+
+
+class TranscriptWriter(BatchWriter):
+    """
+    Appends relayed turns to ``transcript``; one UPDATE per interview.
+    Turns arriving once the transcript was compacted or archived are
+    dropped; until then late turns still reach the evaluation.
+    """
+
+    async def write(self, cur, items: list) -> None:
+        turns_by_interview = defaultdict(list)
+        for interview_id, turn in items:
+            turns_by_interview[interview_id].append(turn)
+
+        append_transcript_query = """
+        UPDATE candidate_interview_question_session
+        SET
+            transcript = COALESCE(transcript, '[]'::jsonb) || %(turns)s,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE
+            id = %(interview_id)s
+            AND transcript_blob IS NULL
+            AND archived_at IS NULL
+        """
+        await cur.executemany(
+            append_transcript_query,
+            [
+                {"interview_id": interview_id, "turns": Jsonb(turns)}
+                for interview_id, turns in turns_by_interview.items()
+            ],
+        )
+
+
+transcript_writer = TranscriptWriter(flush_interval=1.0)
+
+
+def _session_update(instructions: str) -> str:
+    return json.dumps(
+        {
+            "type": "session.update",
+            "session": {
+                "type": "realtime",
+                "model": "gpt-realtime",
+                "instructions": instructions,
+                "audio": {
+                    "input": {"transcription": {"model": REALTIME_TRANSCRIPTION_MODEL}},
+                    "output": {"voice": "marin"},
+                },
+            },
+        }
+    )
+
+
+async def _prepare_session(
+    interview_id: str,
+) -> tuple[int | None, str, QuestionTimer | None]:
+    """
+    Checks the interview can run and marks it started; returns the
+    instructions and a timer positioned after any existing turns.
+    """
+    async with open_connection() as db:
+        interview = await get_interview_details(interview_id, db)
+        if not interview:
+            return WS_INTERVIEW_NOT_FOUND, "", None
+        if interview["status"] not in ("pending", "in_progress"):
+            return WS_INTERVIEW_NOT_ACTIVE, "", None
+        instructions = await get_base_instructions(
+            InstructionType("PRESCREENING"),
+            interview["job_title"],
+            interview["candidate_resume"],
+            interview["job_description"],
+            "None",
+            "None",
+        )
+        if interview["status"] == "pending":
+            await mark_interview_started(interview_id, db)
+    transcript = interview["transcript"] or []
+    if transcript:
+        last_time_stamp = transcript[-1].get("time_stamp")
+    else:
+        last_time_stamp = interview["start_time"] or datetime.datetime.now()
+    return (
+        None,
+        instructions,
+        QuestionTimer(interview_id, len(transcript), last_time_stamp),
+    )
+
+
+async def relay_realtime_session(websocket: WebSocket, interview_id: str, token: str):
+    """
+    Proxies a realtime session between the browser and Azure OpenAI.
+
+    The browser speaks the realtime protocol to this endpoint as it would to
+    Azure; the server owns the session configuration (client
+    ``session.update`` events are dropped), captures transcription events
+    as they stream past and writes completed turns through
+    ``transcript_writer``, so no per-turn ``/conversation`` POST is needed
+    and turns are kept even if the tab closes mid-interview.
+    """
+    # imported lazily like the other LLM client libraries
+    from websockets.asyncio.client import connect
+    from websockets.exceptions import WebSocketException
+
+    if not settings.realtime_relay_enabled:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    try:
+        decode_access_token(token)
+    except Exception:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    close_code, instructions, timer = await _prepare_session(interview_id)
+    if close_code:
+        await websocket.close(code=close_code)
+        return
+
+    error = None
+    started = time.perf_counter()
+    try:
+        upstream = await connect(
+            settings.azure_openai_realtime_ws_endpoint,
+            additional_headers={
+                "Authorization": f"Bearer {settings.azure_openai_realtime_api_key}"
+            },
+            max_size=None,
+        )
+    except (OSError, WebSocketException) as exc:
+        error = llm_error(exc)
+        logger.exception("could not open realtime session for %s", interview_id)
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+        return
+    except BaseException as exc:
+        error = llm_error(exc)
+        raise
+    finally:
+        record_llm_call(
+            interview_id,
+            LLMPurpose.REALTIME_SESSION,
+            "gpt-realtime",
+            (time.perf_counter() - started) * 1000,
+            error=error,
+        )
+
+    await websocket.accept()
+    collector = TranscriptCollector()
+
+    async def client_to_upstream():
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if text := message.get("text"):
+                if _has_marker(text, ('"session.update"',)):
+                    continue
+                await upstream.send(text)
+            elif data := message.get("bytes"):
+                await upstream.send(data)
+
+    async def upstream_to_client():
+        async for message in upstream:
+            if isinstance(message, str):
+                if _has_marker(message, TRANSCRIPT_EVENT_MARKERS):
+                    for turn in collector.feed(json.loads(message)):
+                        transcript_writer.add((interview_id, turn))
+                        index_turn(interview_id, timer.next_index, turn["user"])
+                        timer.record(turn["time_stamp"])
+                await websocket.send_text(message)
+            else:
+                await websocket.send_bytes(message)
+
+    try:
+        async with upstream:
+            await upstream.send(_session_update(instructions))
+            tasks = [
+                asyncio.create_task(client_to_upstream()),
+                asyncio.create_task(upstream_to_client()),
+            ]
+            done, pending = await asyncio.wait(
+                tasks, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in pending:
+                task.cancel()
+            for task in done:
+                if error := task.exception():
+                    if not isinstance(error, (WebSocketDisconnect, WebSocketException)):
+                        logger.error(
+                            "realtime relay for %s failed",
+                            interview_id,
+                            exc_info=error,
+                        )
+    finally:
+        for turn in collector.finish():
+            transcript_writer.add((interview_id, turn))
+            index_turn(interview_id, timer.next_index, turn["user"])
+            timer.record(turn["time_stamp"])
+        if websocket.client_state != WebSocketState.DISCONNECTED:
+            await websocket.close()
+        # make the transcript complete before /abrupt or /graceful reads it;
+        # on failure the turns stay buffered for the next background flush
+        try:
+            await transcript_writer.flush()
+            await question_timing.flush()
+        except Exception:
+            logger.exception("could not flush transcript for %s", interview_id)
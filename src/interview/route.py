@@ -1,31 +1,78 @@
-from fastapi import APIRouter, Depends, Request
-
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, WebSocket
+
+from src.interview.annotations import get_response_version, list_response_versions
+from src.interview.audio import (
+    abort_audio_upload,
+    complete_audio_upload,
+    create_audio_upload,
+    get_audio_upload,
+    upload_audio_part,
+)
+from src.interview.events import interview_events
 from src.interview.model import (
+    BatchEditConversationRequest,
+    CompleteAudioUploadRequest,
     ConversationRequest,
+    CreateAudioUploadRequest,
     EditConversationRequest,
     PatchInterviewViolation,
 )
+from src.interview.relay import relay_realtime_session
 from src.interview.service import (
+    batch_edit_conversation,
     edit_conversation,
     get_conversation,
     insert_conversation,
     interview_detail,
     list_interview,
+    list_requisition_interviews,
     start_interview,
     update_interview_status,
     update_interview_status_to_complete,
     update_interview_violation,
 )
 from src.shared.db import get_connection
-from src.shared.dependency import has_access
+from src.shared.dependency import has_access, has_admin_access, has_stream_access
+from src.shared.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.shared.tracing import TracedRoute
 
-route = APIRouter()
+route = APIRouter(route_class=TracedRoute)
 PROTECTED = [Depends(has_access)]
+# there is no recruiter role yet
+ADMIN = [Depends(has_admin_access)]
+
+InterviewStatus = Literal["pending", "in_progress", "completed", "terminated"]
+InterviewMode = Literal["prescreen", "technical"]
 
 
 @route.get("/", dependencies=PROTECTED)
-async def interview_list_route(request: Request, db=Depends(get_connection)):
-    return await list_interview(request.state.user, db)
+async def interview_list_route(
+    request: Request,
+    status: InterviewStatus | None = None,
+    mode: InterviewMode | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_connection),
+):
+    return await list_interview(request.state.user, status, mode, cursor, limit, db)
+
+
+# declared before /{interview_id}, which would otherwise match it
+@route.get("/requisitions", dependencies=ADMIN)
+async def requisition_interview_list_route(
+    requisition_id: list[UUID] | None = Query(None),
+    status: InterviewStatus | None = None,
+    mode: InterviewMode | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db=Depends(get_connection),
+):
+    return await list_requisition_interviews(
+        requisition_id, status, mode, cursor, limit, db
+    )
 
 
 @route.get("/{interview_id}", dependencies=PROTECTED)
@@ -35,6 +82,12 @@ async def interview_detail_route(
     return await interview_detail(interview_id, request.state.user, db)
 
 
+# EventSource can't send an Authorization header; ?token= is accepted too
+@route.get("/{interview_id}/events", dependencies=[Depends(has_stream_access)])
+async def interview_events_route(interview_id: str):
+    return await interview_events(interview_id)
+
+
 @route.get("/{interview_id}/start", dependencies=PROTECTED)
 async def start_interview_route(
     interview_id: str, request: Request, db=Depends(get_connection)
@@ -42,6 +95,14 @@ async def start_interview_route(
     return await start_interview(interview_id, request.state.user, db)
 
 
+@route.websocket("/{interview_id}/realtime")
+async def realtime_relay_route(
+    websocket: WebSocket, interview_id: str, token: str = ""
+):
+    # browsers can't set headers on a WebSocket, so the JWT comes as ?token=
+    await relay_realtime_session(websocket, interview_id, token)
+
+
 @route.post("/{interview_id}/conversation", dependencies=PROTECTED)
 async def insert_conversation_route(
     interview_id: str,
@@ -66,25 +127,61 @@ async def update_interview_status_complete_route(
 
 
 @route.get("/{interview_id}/conversation", dependencies=PROTECTED)
-async def get_conversation_route(interview_id: str, db=Depends(get_connection)):
-    return await get_conversation(interview_id, db)
+async def get_conversation_route(
+    interview_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=1000),
+    view: Literal["both", "original", "annotated"] = "both",
+    if_none_match: str | None = Header(None),
+    db=Depends(get_connection),
+):
+    return await get_conversation(interview_id, offset, limit, view, if_none_match, db)
+
+
+@route.get("/{interview_id}/conversation/versions", dependencies=PROTECTED)
+async def list_response_versions_route(interview_id: str, db=Depends(get_connection)):
+    return await list_response_versions(interview_id, db)
+
+
+@route.get("/{interview_id}/conversation/versions/{version}", dependencies=PROTECTED)
+async def get_response_version_route(
+    interview_id: str, version: int = Path(ge=0), db=Depends(get_connection)
+):
+    return await get_response_version(interview_id, version, db)
+
+
+@route.patch("/{interview_id}/conversation", dependencies=PROTECTED)
+async def batch_edit_conversation_route(
+    interview_id: str,
+    body: BatchEditConversationRequest,
+    request: Request,
+    if_match: str | None = Header(None),
+    db=Depends(get_connection),
+):
+    return await batch_edit_conversation(
+        interview_id, body, request.state.user, if_match, db
+    )
 
 
 @route.patch("/{interview_id}/conversation/{index}", dependencies=PROTECTED)
 async def edit_conversation_route(
     interview_id: str,
     index: int,
-    request: EditConversationRequest,
+    body: EditConversationRequest,
+    request: Request,
+    if_match: str | None = Header(None),
     db=Depends(get_connection),
 ):
-    return await edit_conversation(interview_id, index, request.user, db)
+    return await edit_conversation(
+        interview_id, index, body.user, request.state.user, if_match, db
+    )
 
 
 @route.post("/{interview_id}/violation", dependencies=PROTECTED)
 async def update_interview_violation_route(
-    interview_id: str, request: PatchInterviewViolation, db=Depends(get_connection)
+    interview_id: str, request: PatchInterviewViolation
 ):
-    return await update_interview_violation(interview_id, request, db)
+    return await update_interview_violation(interview_id, request)
 
 
 @route.post("/{interview_id}/complete", dependencies=PROTECTED)
@@ -94,3 +191,53 @@ async def update_interview_status_to_complete_route(
     return await update_interview_status_to_complete(
         interview_id, request.state.user, db
     )
+
+
+@route.post("/{interview_id}/audio/uploads", dependencies=PROTECTED)
+async def create_audio_upload_route(
+    interview_id: str, request: CreateAudioUploadRequest, db=Depends(get_connection)
+):
+    return await create_audio_upload(interview_id, request, db)
+
+
+# no get_connection here: the body streams without holding a pool connection
+@route.put(
+    "/{interview_id}/audio/uploads/{upload_id}/parts/{part_number}",
+    dependencies=PROTECTED,
+)
+async def upload_audio_part_route(
+    interview_id: str,
+    upload_id: UUID,
+    part_number: int,
+    request: Request,
+    x_chunk_sha256: str = Header(),
+):
+    return await upload_audio_part(
+        interview_id, upload_id, part_number, request, x_chunk_sha256
+    )
+
+
+@route.get("/{interview_id}/audio/uploads/{upload_id}", dependencies=PROTECTED)
+async def get_audio_upload_route(
+    interview_id: str, upload_id: UUID, db=Depends(get_connection)
+):
+    return await get_audio_upload(interview_id, upload_id, db)
+
+
+@route.post(
+    "/{interview_id}/audio/uploads/{upload_id}/complete", dependencies=PROTECTED
+)
+async def complete_audio_upload_route(
+    interview_id: str,
+    upload_id: UUID,
+    request: CompleteAudioUploadRequest,
+    db=Depends(get_connection),
+):
+    return await complete_audio_upload(interview_id, upload_id, request, db)
+
+
+@route.delete("/{interview_id}/audio/uploads/{upload_id}", dependencies=PROTECTED)
+async def abort_audio_upload_route(
+    interview_id: str, upload_id: UUID, db=Depends(get_connection)
+):
+    return await abort_audio_upload(interview_id, upload_id, db)
@@ -1,16 +1,31 @@
 import datetime
+import functools
 import json
-import os
 import re
+import time
+from uuid import UUID
 
-import httpx
-import openai
-from dotenv import load_dotenv
 from fastapi import HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from psycopg.types.json import Jsonb
 
+from src.interview.annotations import (
+    CONVERSATION_ETAG_SQL,
+    apply_annotation_edits,
+    entity_tags,
+    materialize,
+    reconstruction_conflict,
+)
+from src.interview.archive import (
+    NEEDS_READ_MARK_SQL,
+    mark_interview_read,
+    rehydrate_interview,
+)
+from src.interview.context import resolve_prompt_contexts
+from src.interview.credits import reserve_interview_credit, settle_interview_credit
+from src.interview.ledger import LLMPurpose, llm_error, record_llm_call
 from src.interview.model import (
+    BatchEditConversationRequest,
     ConversationRequest,
     PatchInterviewViolation,
 )
@@ -20,12 +35,41 @@ from src.interview.prompts import (
     get_base_instructions,
     get_evaluation_prompt,
 )
+from src.interview.questions import prescreen_questions
+from src.interview.timing import QuestionTimer
+from src.interview.transcript_codec import encode_transcript, load_transcript
+from src.interview.violations import record_violation
+from src.search.index import index_turn
+from src.shared.batch import flush_all_workers
+from src.shared.config import settings
 from src.shared.dependency import UserPayload
+from src.shared.pagination import keyset_condition, keyset_page
+from src.shared.tracing import traced
+
+JSON_OBJECT_PATTERN = re.compile(r"\{[\s\S]*\}")
+JSON_VALUE_PATTERN = re.compile(r"(\{[\s\S]*\}|\[[\s\S]*\])")
+
+
+def _extract_json(txt: str, pattern: re.Pattern):
+    """Parses the outermost JSON object/array embedded in model output."""
+    match = pattern.search(txt)
+    if not match:
+        raise ValueError(f"Invalid model output, JSON not found:\n{txt}")
+    return json.loads(match.group())
+
 
-load_dotenv()
-AZURE_OPENAI_REALTIME_ENDPOINT = os.getenv("AZURE_OPENAI_REALTIME_ENDPOINT")
-AZURE_OPENAI_REALTIME_API_KEY = os.getenv("AZURE_OPENAI_REALTIME_API_KEY")
-AZURE_OPENAI_REALTIME_VERSION = os.getenv("AZURE_OPENAI_REALTIME_VERSION")
+def _as_turns(reconstruction):
+    """
+    The reconstructed conversation as a list of turns. The reply is parsed
+    with ``JSON_VALUE_PATTERN``, so the model may wrap the list in an
+    object (``{"conversation": [...]}``); that list is unwrapped. Anything
+    else is stored as returned, and the conversation endpoints answer 409.
+    """
+    if isinstance(reconstruction, dict):
+        lists = [value for value in reconstruction.values() if isinstance(value, list)]
+        if len(lists) == 1:
+            return lists[0]
+    return reconstruction
 
 
 def _normalize_highlights(highlights: list) -> list:
@@ -52,64 +96,76 @@ def _normalize_highlights(highlights: list) -> list:
     return normalized
 
 
+@functools.cache
 def _build_client(api_key: str | None = None):
     """Construct OpenAI client for GPT-4o evaluation.
 
     Uses AZURE_OPENAI_EVAL_* or AZURE_OPENAI_* env vars (separate from realtime creds).
+    The client is built once per worker; ``openai`` is imported here rather
+    than at module level since it dominates import time and auth-only
+    workers never need it.
     """
-    # GPT-4o evaluation endpoint (separate from realtime endpoint)
-    azure_endpoint = (
-        (
-            os.getenv("AZURE_OPENAI_EVAL_ENDPOINT")
-            or os.getenv("AZURE_OPENAI_ENDPOINT")
-            or ""
-        )
-        .rstrip("/")
-        .strip("'")
-    )
-    azure_key = (
-        os.getenv("AZURE_OPENAI_EVAL_API_KEY")
-        or os.getenv("AZURE_OPENAI_API_KEY")
-        or api_key
-    )
-    azure_version = (
-        os.getenv("AZURE_OPENAI_EVAL_VERSION")
-        or os.getenv("OPENAI_API_VERSION")
-        or "2024-05-01-preview"
-    )
+    import openai
 
-    if azure_endpoint and azure_key:
+    azure_key = settings.azure_openai_eval_api_key or api_key
+    if settings.azure_openai_eval_endpoint and azure_key:
         return openai.AzureOpenAI(
             api_key=azure_key,
-            api_version=azure_version,
-            azure_endpoint=azure_endpoint,
+            api_version=settings.azure_openai_eval_version,
+            azure_endpoint=settings.azure_openai_eval_endpoint,
         )
 
     return openai.OpenAI(api_key=api_key)
 
 
-def call_open_ai(messages):
+def _create_chat_completion(messages, interview_id: str | None, purpose: LLMPurpose):
+    """
+    Runs a GPT-4o chat completion and records its usage in the LLM ledger.
+
+    Returns:
+        The parsed ChatCompletion response.
+    """
+    client = _build_client()
+
+    raw = resp = error = None
+    started = time.perf_counter()
+    try:
+        raw = client.chat.completions.with_raw_response.create(
+            model="gpt-4o", messages=messages, temperature=0.3, max_tokens=2500
+        )
+        resp = raw.parse()
+        return resp
+    except BaseException as exc:
+        error = llm_error(exc)
+        raise
+    finally:
+        record_llm_call(
+            interview_id,
+            purpose,
+            getattr(resp, "model", None) or "gpt-4o",
+            (time.perf_counter() - started) * 1000,
+            usage=getattr(resp, "usage", None),
+            retries=getattr(raw, "retries_taken", 0),
+            error=error,
+        )
+
+
+@traced()
+def call_open_ai(messages, interview_id: str | None = None):
     """
     Sends messages to OpenAI, extracts JSON, and adds evaluation metadata.
 
     Args:
         messages: List of chat messages to send to the model.
+        interview_id: Interview being evaluated, recorded in the usage ledger.
 
     Returns:
         dict: The parsed JSON response with normalized highlights and timestamps.
     """
-    client = _build_client()
-
-    resp = client.chat.completions.create(
-        model="gpt-4o", messages=messages, temperature=0.3, max_tokens=2500
-    )
+    resp = _create_chat_completion(messages, interview_id, LLMPurpose.EVALUATION)
     txt = resp.choices[0].message.content.strip()
 
-    match = re.search(r"\{[\s\S]*\}", txt)
-    if not match:
-        raise ValueError(f"Invalid model output, JSON not found:\n{txt}")
-
-    data = json.loads(match.group())
+    data = _extract_json(txt, JSON_OBJECT_PATTERN)
 
     if isinstance(data, dict) and "highlights" in data:
         data["highlights"] = _normalize_highlights(data["highlights"])
@@ -122,42 +178,35 @@ def call_open_ai(messages):
     return data
 
 
-async def call_open_ai_evaluation(messages):
+@traced()
+async def call_open_ai_evaluation(messages, interview_id: str | None = None):
     """
     Calls OpenAI to retrieve and parse a raw JSON response.
 
     Args:
         messages: List of chat messages to send to the model.
+        interview_id: Interview being reconstructed, recorded in the usage ledger.
 
     Returns:
         dict | list: The parsed JSON content (supports both objects and arrays).
     """
-    client = _build_client()
-
-    resp = client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        temperature=0.3,
-        max_tokens=2500,
-    )
+    resp = _create_chat_completion(messages, interview_id, LLMPurpose.RECONSTRUCTION)
 
     txt = resp.choices[0].message.content.strip()
 
-    match = re.search(r"(\{[\s\S]*\}|\[[\s\S]*\])", txt)
-    if not match:
-        raise ValueError(f"Invalid model output, JSON not found:\n{txt}")
-
-    parsed = json.loads(match.group())
+    parsed = _extract_json(txt, JSON_VALUE_PATTERN)
 
     return parsed
 
 
-async def create_ai_session(prompt: str):
+@traced()
+async def create_ai_session(prompt: str, interview_id: str | None = None):
     """
     Initiates a realtime Azure OpenAI session with the specified instructions.
 
     Args:
         prompt: The system instructions (persona/guidelines) for the AI.
+        interview_id: Interview the session is for, recorded in the usage ledger.
 
     Returns:
         dict: The created session details including connection tokens.
@@ -165,6 +214,7 @@ async def create_ai_session(prompt: str):
     Raises:
         HTTPException: If the Azure API request fails.
     """
+    import httpx
 
     async with httpx.AsyncClient(timeout=10) as client:
         session_config = {
@@ -179,14 +229,30 @@ async def create_ai_session(prompt: str):
                 },
             },
         }
-        response = await client.post(
-            AZURE_OPENAI_REALTIME_ENDPOINT,
-            headers={
-                "Authorization": f"Bearer {AZURE_OPENAI_REALTIME_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            json=session_config,
-        )
+        error = None
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                settings.azure_openai_realtime_endpoint,
+                headers={
+                    "Authorization": f"Bearer {settings.azure_openai_realtime_api_key}",
+                    "Content-Type": "application/json",
+                },
+                json=session_config,
+            )
+            if response.status_code != 200:
+                error = f"HTTP {response.status_code}"
+        except BaseException as exc:
+            error = llm_error(exc)
+            raise
+        finally:
+            record_llm_call(
+                interview_id,
+                LLMPurpose.REALTIME_SESSION,
+                "gpt-realtime",
+                (time.perf_counter() - started) * 1000,
+                error=error,
+            )
 
         if response.status_code != 200:
             raise HTTPException(
@@ -200,10 +266,49 @@ async def create_ai_session(prompt: str):
         return response.json()
 
 
-async def list_interview(user: UserPayload, db):
+def _interview_filters(
+    interview_status: str | None, interview_mode: str | None, params: dict
+) -> str:
+    """
+    The ``AND ...`` clauses for the optional status and mode filters, with
+    their values added to ``params``. An unset filter is left out rather
+    than switched off with ``IS NULL OR``, as in ``keyset_condition``.
+    """
+    clauses = []
+    if interview_status is not None:
+        params["status"] = interview_status
+        clauses.append("AND ciqs.status = %(status)s")
+    if interview_mode is not None:
+        params["interview_mode"] = interview_mode
+        clauses.append("AND ciqs.interview_mode = %(interview_mode)s")
+    return "\n".join(clauses)
+
+
+async def list_interview(
+    user: UserPayload,
+    interview_status: str | None,
+    interview_mode: str | None,
+    cursor: str | None,
+    limit: int,
+    db,
+):
+    """
+    A page of the user's interviews, newest first. Pages are keyset
+    paginated on ``(created_at, id)``, so each one reads ``limit`` index
+    entries however many interviews the user has.
+    """
     conn, cur = db
+    params = {"user_id": user.user_id, "limit": limit + 1}
+    filters = _interview_filters(interview_status, interview_mode, params)
+    try:
+        after_cursor = keyset_condition("ciqs", cursor, params)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
 
-    get_interview_query = """
+    get_interview_query = f"""
     SELECT
         ciqs.created_at,
         ciqs.status,
@@ -219,12 +324,107 @@ async def list_interview(user: UserPayload, db):
         job_description jd ON jr.job_description_id = jd.id
     WHERE
         ciqs.resume_detail_id = %(user_id)s
+        {filters}
+        {after_cursor}
+    ORDER BY
+        ciqs.created_at DESC, ciqs.id DESC
+    LIMIT %(limit)s
     """
 
-    await cur.execute(get_interview_query, {"user_id": user.user_id})
+    await cur.execute(get_interview_query, params)
     interviews = await cur.fetchall()
 
-    return interviews
+    return keyset_page(interviews, limit, "interviews")
+
+
+async def list_requisition_interviews(
+    requisition_ids: list[UUID] | None,
+    interview_status: str | None,
+    interview_mode: str | None,
+    cursor: str | None,
+    limit: int,
+    db,
+):
+    """
+    The recruiter's view: interviews across the given requisitions (all of
+    them when None), newest first, keyset paginated like ``list_interview``.
+
+    Each requisition's newest ``limit + 1`` interviews are read off its own
+    ``(job_requisition_id, created_at, id)`` index range and only those are
+    merged, so a page costs ``limit`` entries per requisition rather than a
+    sort of every interview they hold.
+    """
+    conn, cur = db
+    params = {"limit": limit + 1}
+    filters = _interview_filters(interview_status, interview_mode, params)
+    try:
+        after_cursor = keyset_condition("ciqs", cursor, params)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Invalid cursor"},
+        )
+
+    if requisition_ids is None:
+        sessions = "candidate_interview_question_session ciqs"
+        where = f"WHERE TRUE {filters} {after_cursor}"
+    else:
+        params["requisition_ids"] = list(dict.fromkeys(requisition_ids))
+        sessions = f"""unnest(%(requisition_ids)s::uuid[]) AS requisition(id)
+    CROSS JOIN LATERAL (
+        SELECT
+            ciqs.id,
+            ciqs.created_at,
+            ciqs.status,
+            ciqs.job_requisition_id,
+            ciqs.resume_detail_id,
+            ciqs.interview_mode,
+            ciqs.start_time,
+            ciqs.end_time,
+            ciqs.termination_reason
+        FROM
+            candidate_interview_question_session ciqs
+        WHERE
+            ciqs.job_requisition_id = requisition.id
+            {filters}
+            {after_cursor}
+        ORDER BY
+            ciqs.created_at DESC, ciqs.id DESC
+        LIMIT %(limit)s
+    ) ciqs"""
+        where = ""
+
+    get_interview_query = f"""
+    SELECT
+        ciqs.created_at,
+        ciqs.status,
+        ciqs.id,
+        ciqs.job_requisition_id,
+        jd.job_title AS title,
+        ciqs.resume_detail_id,
+        rd.name AS candidate_name,
+        UPPER(ciqs.interview_mode) AS interview_type,
+        ciqs.start_time,
+        ciqs.end_time,
+        ciqs.termination_reason
+    FROM
+        {sessions}
+    LEFT JOIN
+        job_requisition jr ON ciqs.job_requisition_id = jr.id
+    LEFT JOIN
+        job_description jd ON jr.job_description_id = jd.id
+    LEFT JOIN
+        resume_detail rd ON rd.id = ciqs.resume_detail_id
+    {where}
+    ORDER BY
+        ciqs.created_at DESC, ciqs.id DESC
+    LIMIT %(limit)s
+    """
+
+    await cur.execute(get_interview_query, params)
+    interviews = await cur.fetchall()
+
+    return keyset_page(interviews, limit, "interviews")
 
 
 async def interview_detail(interview_id: str, user: UserPayload, db):
@@ -237,7 +437,8 @@ async def interview_detail(interview_id: str, user: UserPayload, db):
         jd.job_title AS title,
         'Ylogx' AS company_name,
         ciqs.id,
-        UPPER(ciqs.interview_mode) AS interview_type
+        UPPER(ciqs.interview_mode) AS interview_type,
+        ciqs.time_spent_per_question
     FROM
         candidate_interview_question_session ciqs
     LEFT JOIN
@@ -258,10 +459,11 @@ async def interview_detail(interview_id: str, user: UserPayload, db):
     return interview
 
 
+@traced()
 async def get_interview_details(interview_id: str, db):
     conn, cur = db
 
-    get_interview_query = """
+    get_interview_query = f"""
     SELECT
     ciqs.id,
     ciqs.created_at,
@@ -272,33 +474,18 @@ async def get_interview_details(interview_id: str, db):
     ciqs.interview_mode,
     jd.job_title,
     ciqs.transcript,
+    ciqs.transcript_blob,
+    ciqs.archived_at IS NOT NULL AS archived,
+    {NEEDS_READ_MARK_SQL} AS needs_read_mark,
     ciqs.start_time,
     ciqs.end_time,
-    jd.job_description,
-
-
-    -- Resume Data (Bundled as JSON Dict)
-    jsonb_build_object(
-        'name', rd.name,
-        'raw_text', rd.cf_text,
-        'skills', rd.skill_set,
-        'experience', rd.work_experience,
-        'details', rd.details
-    ) AS candidate_resume,
-
-    -- Prescreening Questions (Aggregated into a List of JSON Objects)
-    (
-        SELECT jsonb_agg(
-            jsonb_build_object(
-                'question_text', sub_cqp.question_text,
-                'preferred_answer', sub_cqp.preferred_answer,
-                'is_mandatory', sub_cqp.is_mandatory,
-                'created_by', sub_cqp.created_by
-            )
-        )
-        FROM candidate_question_prescreening sub_cqp
-        WHERE sub_cqp.job_requisition_id = ciqs.job_requisition_id
-    ) AS prescreen_questions
+    ciqs.resume_detail_id,
+    ciqs.job_description_id,
+
+    -- Condensed prompt contexts; NULL when missing or stale
+    pcj.context AS job_description,
+    pcr.context AS candidate_resume,
+    ciqs.job_requisition_id
 
     FROM
         candidate_interview_question_session ciqs
@@ -306,16 +493,58 @@ async def get_interview_details(interview_id: str, db):
         job_description jd ON ciqs.job_description_id = jd.id
     LEFT JOIN
         resume_detail rd ON ciqs.resume_detail_id = rd.id
+    LEFT JOIN
+        prompt_context pcj ON pcj.source = 'job_description'
+        AND pcj.source_id = jd.id
+        AND pcj.source_updated_at IS NOT DISTINCT FROM jd.updated_at
+    LEFT JOIN
+        prompt_context pcr ON pcr.source = 'resume'
+        AND pcr.source_id = rd.id
+        AND pcr.source_updated_at IS NOT DISTINCT FROM rd.updated_at
     WHERE
         ciqs.id = %(interview_id)s;
     """
 
     await cur.execute(get_interview_query, {"interview_id": interview_id})
     interview_data = await cur.fetchone()
+    if interview_data:
+        if interview_data["archived"] and await rehydrate_interview(interview_id, db):
+            return await get_interview_details(interview_id, db)
+        if interview_data.pop("needs_read_mark"):
+            await mark_interview_read(interview_id, db)
+        del interview_data["archived"]
+        # compacted once the interview closed
+        interview_data["transcript"] = await load_transcript(interview_data, db)
+        del interview_data["transcript_blob"]
+        await resolve_prompt_contexts(interview_data, db)
+        # identical for every candidate on the requisition; served from cache
+        interview_data["prescreen_questions"] = (
+            await prescreen_questions.get(interview_data["job_requisition_id"], db)
+            if interview_data["job_requisition_id"]
+            else None
+        )
 
     return interview_data
 
 
+async def get_interview_status(interview_id: str, db):
+    conn, cur = db
+
+    get_interview_status_query = """
+    SELECT
+        id,
+        status,
+        termination_reason,
+        ai_detected_response IS NOT NULL AS reconstructed
+    FROM
+        candidate_interview_question_session
+    WHERE
+        id = %(interview_id)s
+    """
+    await cur.execute(get_interview_status_query, {"interview_id": interview_id})
+    return await cur.fetchone()
+
+
 async def get_ephemeral_token(interview: dict, db):
     job_title = interview["job_title"]
     job_description = interview["job_description"]
@@ -330,16 +559,12 @@ async def get_ephemeral_token(interview: dict, db):
         "None",
         "None",
     )
-    response = await create_ai_session(instructions)
+    response = await create_ai_session(instructions, str(interview["id"]))
     return response, instructions
 
 
-async def start_interview(interview_id: str, user: UserPayload, db):
+async def mark_interview_started(interview_id: str, db):
     conn, cur = db
-    interview = await get_interview_details(interview_id, db)
-    if interview and interview["status"] != "pending":
-        return {"message": "Token Already generated"}
-    token, instructions = await get_ephemeral_token(interview, db)
     insert_into_interview_query = """
     UPDATE
         candidate_interview_question_session
@@ -354,6 +579,16 @@ async def start_interview(interview_id: str, user: UserPayload, db):
         insert_into_interview_query,
         {"interview_id": interview_id},
     )
+    await reserve_interview_credit(interview_id, db)
+
+
+async def start_interview(interview_id: str, user: UserPayload, db):
+    conn, cur = db
+    interview = await get_interview_details(interview_id, db)
+    if interview and interview["status"] != "pending":
+        return {"message": "Token Already generated"}
+    token, instructions = await get_ephemeral_token(interview, db)
+    await mark_interview_started(interview_id, db)
 
     # Need this code if status history is required
 
@@ -402,7 +637,14 @@ async def insert_conversation(
         updated_at = CURRENT_TIMESTAMP
     WHERE
         id = %(interview_id)s
-    RETURNING id;
+        -- a compacted or archived transcript is no longer in this column
+        AND transcript_blob IS NULL
+        AND archived_at IS NULL
+    RETURNING
+        id,
+        jsonb_array_length(transcript) - 1 AS turn_index,
+        transcript -> -2 ->> 'time_stamp' AS previous_time_stamp,
+        start_time;
     """
 
     await cur.execute(
@@ -415,16 +657,38 @@ async def insert_conversation(
 
     updated = await cur.fetchone()
     if not updated:
+        check_interview_query = """
+        SELECT
+            id
+        FROM
+            candidate_interview_question_session
+        WHERE
+            id = %(interview_id)s
+        """
+        await cur.execute(check_interview_query, {"interview_id": interview_id})
+        if await cur.fetchone():
+            return JSONResponse(
+                status_code=status.HTTP_409_CONFLICT,
+                content={"message": "Interview Transcript Already Compacted"},
+            )
         return JSONResponse(
             status_code=status.HTTP_404_NOT_FOUND,
             content={"message": "Interview Not Found"},
         )
+    QuestionTimer(
+        interview_id,
+        updated["turn_index"],
+        updated["previous_time_stamp"] or updated["start_time"],
+    ).record(data["time_stamp"])
+    index_turn(interview_id, updated["turn_index"], request.user)
 
     return {"message": "Conversation Updated"}
 
 
 async def update_interview_status(interview_id: str, interview_status: str, db):
     conn, cur = db
+    # turns, violations and timings may sit in any worker's buffers
+    await flush_all_workers()
     check_interview_query = """
     SELECT
         id,
@@ -445,7 +709,15 @@ async def update_interview_status(interview_id: str, interview_status: str, db):
 
     messages = conversation_reconstruct_prompt(conversation)
 
-    ai_detected_response = await call_open_ai_evaluation(messages)
+    ai_detected_response = _as_turns(
+        await call_open_ai_evaluation(messages, interview_id)
+    )
+    # no turns are appended once end_time is set below
+    transcript_blob = (
+        await encode_transcript(conversation, db)
+        if settings.transcript_compact_on_close and conversation
+        else None
+    )
 
     update_interview_status_query = """
     UPDATE
@@ -453,7 +725,17 @@ async def update_interview_status(interview_id: str, interview_status: str, db):
     SET
         termination_reason = %(interview_status)s,
         ai_detected_response = %(ai_detected_response)s,
-        annotated_response = %(ai_detected_response)s,
+        -- a turn appended while the evaluation ran is not in the blob:
+        -- keep the JSONB then
+        transcript_blob = CASE
+            WHEN jsonb_array_length(transcript) = %(turn_count)s
+            THEN %(transcript_blob)s::bytea
+        END,
+        transcript = CASE
+            WHEN %(transcript_blob)s::bytea IS NULL
+                OR jsonb_array_length(transcript) <> %(turn_count)s
+            THEN transcript
+        END,
         end_time = CURRENT_TIMESTAMP,
         total_duration_minutes = EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - start_time)) / 60
 
@@ -468,50 +750,102 @@ async def update_interview_status(interview_id: str, interview_status: str, db):
             "interview_status": interview_status,
             "interview_id": interview_id,
             "ai_detected_response": Jsonb(ai_detected_response),
+            "transcript_blob": transcript_blob,
+            "turn_count": len(conversation or []),
         },
     )
+    await settle_interview_credit(interview_id, db)
 
     return {"message": "Interview Status Updated"}
 
 
-async def get_conversation(interview_id: str, db):
-    conn, cur = db
-    check_interview_available_query = """
-    SELECT
-
-        i.ai_detected_response,
-        i.annotated_response
-
-    FROM
-        candidate_interview_question_session i
-    WHERE
-        i.id = %(interview_id)s
+async def get_conversation(
+    interview_id: str,
+    offset: int,
+    limit: int | None,
+    view: str,
+    if_none_match: str | None,
+    db,
+):
     """
-    await cur.execute(check_interview_available_query, {"interview_id": interview_id})
-    interview = await cur.fetchone()
-    if not interview:
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content={"message": "Interview Not Found"},
-        )
-
-    await cur.execute(check_interview_available_query, {"interview_id": interview_id})
-    conversations = await cur.fetchone()
+    Turns ``offset`` to ``offset + limit`` of the reconstructed transcript
+    (``view="original"``), the annotated one (``"annotated"``) or both.
 
-    return conversations
-
-
-async def edit_conversation(interview_id: str, index: int, conversation: str, db):
+    Answers ``If-None-Match`` with 304 from the same query without
+    reading the transcript, and rehydrates an archived interview first.
+    """
     conn, cur = db
-    get_interview_query = """
+    get_conversation_query = f"""
     SELECT
-        ai_detected_response
-    FROM
-        candidate_interview_question_session
-    WHERE
-        id = %(interview_id)s
+        i.etag,
+        i.not_modified,
+        i.archived,
+        i.needs_read_mark,
+        i.annotation_version,
+        i.response_type,
+        CASE WHEN NOT i.not_modified AND i.response_type = 'array' THEN
+            jsonb_array_length(i.ai_detected_response)
+        END AS total_turns,
+        CASE WHEN NOT i.not_modified AND i.response_type = 'array' THEN
+            COALESCE(
+                (
+                    SELECT
+                        jsonb_agg(t.turn ORDER BY t.position)
+                    FROM
+                        jsonb_array_elements(i.ai_detected_response)
+                            WITH ORDINALITY AS t(turn, position)
+                    WHERE
+                        t.position > %(offset)s
+                        AND (
+                            %(limit)s::int IS NULL
+                            OR t.position <= %(offset)s + %(limit)s::int
+                        )
+                ),
+                '[]'::jsonb
+            )
+        END AS ai_detected_response,
+        CASE WHEN NOT i.not_modified AND %(annotated)s THEN
+            (
+                SELECT
+                    jsonb_object_agg(p.key, p.value)
+                FROM
+                    jsonb_each(i.annotation_patch) AS p
+                WHERE
+                    p.key::int >= %(offset)s
+                    AND (
+                        %(limit)s::int IS NULL
+                        OR p.key::int < %(offset)s + %(limit)s::int
+                    )
+            )
+        END AS annotation_patch
+    FROM (
+        SELECT
+            ai_detected_response,
+            annotation_patch,
+            annotation_version,
+            jsonb_typeof(ai_detected_response) AS response_type,
+            archived_at IS NOT NULL AS archived,
+            {NEEDS_READ_MARK_SQL} AS needs_read_mark,
+            {CONVERSATION_ETAG_SQL} AS etag,
+            COALESCE(
+                {CONVERSATION_ETAG_SQL} = ANY(%(if_none_match)s::text[]), FALSE
+            ) AS not_modified
+        FROM
+            candidate_interview_question_session
+        WHERE
+            id = %(interview_id)s
+    ) i
     """
-    await cur.execute(get_interview_query, {"interview_id": interview_id})
+    await cur.execute(
+        get_conversation_query,
+        {
+            "interview_id": interview_id,
+            "offset": offset,
+            "limit": limit,
+            "annotated": view != "original",
+            "if_none_match": entity_tags(if_none_match, weak=True),
+        },
+    )
     interview = await cur.fetchone()
     if not interview:
         return JSONResponse(
@@ -519,61 +853,77 @@ async def edit_conversation(interview_id: str, index: int, conversation: str, db
             content={"message": "Interview Not Found"},
         )
 
-    transcript = interview["ai_detected_response"]
-    if index < 0 or index >= len(transcript):
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={"message": "Invalid conversation index"},
+    # reviewers reopen the same interview often; let clients revalidate
+    headers = {"ETag": interview["etag"], "Cache-Control": "private, no-cache"}
+    if interview["needs_read_mark"]:
+        await mark_interview_read(interview_id, db)
+    if interview["not_modified"]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if interview["archived"] and await rehydrate_interview(interview_id, db):
+        return await get_conversation(
+            interview_id, offset, limit, view, if_none_match, db
         )
+    if interview["response_type"] not in (None, "array"):
+        return reconstruction_conflict()
 
-    updated_transcript = transcript.copy()
-    updated_transcript[index] = {
-        **updated_transcript[index],
-        "user": conversation,
-        "edited_at": str(datetime.datetime.now()),
+    conversation = {
+        "annotation_version": interview["annotation_version"],
+        "total_turns": interview["total_turns"],
+        "offset": offset,
     }
-    update_interview_query = """
-    UPDATE
-        candidate_interview_question_session
-    SET
-        annotated_response = %(updated_transcript)s
-    WHERE
-        id = %(interview_id)s
+    if view != "annotated":
+        conversation["ai_detected_response"] = interview["ai_detected_response"]
+    if view != "original":
+        conversation["annotated_response"] = materialize(
+            interview["ai_detected_response"], interview["annotation_patch"], offset
+        )
+    return JSONResponse(content=conversation, headers=headers)
 
-    """
-    await cur.execute(
-        update_interview_query,
-        {"updated_transcript": Jsonb(updated_transcript), "interview_id": interview_id},
+
+async def edit_conversation(
+    interview_id: str,
+    index: int,
+    conversation: str,
+    user: UserPayload,
+    if_match: str | None,
+    db,
+):
+    # only the edited turn is written, as a patch over ai_detected_response
+    return await apply_annotation_edits(
+        interview_id, {index: conversation}, user.user_id, if_match, db
     )
-    return {"message": "Conversation Updated"}
 
 
-async def update_interview_violation(
-    interview_id: str, request: PatchInterviewViolation, db
+async def batch_edit_conversation(
+    interview_id: str,
+    request: BatchEditConversationRequest,
+    user: UserPayload,
+    if_match: str | None,
+    db,
 ):
-    conn, cur = db
-    update_termination_reason_query = """
-    INSERT INTO
-        interview_violation
-    (interview_session_id,violation_type,description)
-    VALUES(
-        %(interview_id)s,%(violation_type)s,%(description)s
-    )
+    # a later edit of the same turn wins
+    edits = {edit.index: edit.user for edit in request.edits}
+    return await apply_annotation_edits(interview_id, edits, user.user_id, if_match, db)
 
-    """
-    await cur.execute(
-        update_termination_reason_query,
-        {
-            "violation_type": request.violation,
-            "interview_id": interview_id,
-            "description": request.description,
-        },
-    )
+
+async def update_interview_violation(
+    interview_id: str, request: PatchInterviewViolation
+):
+    # buffered and bulk-inserted by violation_buffer
+    try:
+        UUID(interview_id)
+    except ValueError:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Interview Not Found"},
+        )
+    record_violation(interview_id, request.violation, request.description)
     return {"message": "Termination Details Updated"}
 
 
 async def update_interview_status_to_complete(interview_id: str, user: UserPayload, db):
     conn, cur = db
+    await flush_all_workers()
     interview_data = await get_interview_details(interview_id, db)
     if interview_data["interview_mode"] == "prescreen":
         prompt = await get_evaluation_prompt(
@@ -598,7 +948,7 @@ async def update_interview_status_to_complete(interview_id: str, user: UserPaylo
             },
             {"role": "user", "content": prompt},
         ]
-        response = call_open_ai(messages)
+        response = call_open_ai(messages, interview_id)
 
     else:
         prompt = await get_evaluation_prompt(
@@ -624,7 +974,7 @@ async def update_interview_status_to_complete(interview_id: str, user: UserPaylo
             },
             {"role": "user", "content": prompt},
         ]
-        response = call_open_ai(messages)
+        response = call_open_ai(messages, interview_id)
     update_interview_pre_evaluation_query = """
         INSERT INTO
             candidate_ai_interview_evaluation
@@ -663,4 +1013,5 @@ async def update_interview_status_to_complete(interview_id: str, user: UserPaylo
             "interview_id": interview_id,
         },
     )
+    await settle_interview_credit(interview_id, db)
     return {"message": "Interview Status Updated"}
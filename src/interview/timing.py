@@ -0,0 +1,75 @@
+import datetime
+from collections import defaultdict
+
+from psycopg.types.json import Jsonb
+
+from src.shared.batch import BatchWriter
+
+
+def _parse_time_stamp(value) -> datetime.datetime | None:
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(value)
+
+
+class QuestionTimer:
+    """
+    Derives per-question durations from the stream of turn time stamps.
+
+    A turn's ``time_stamp`` marks when its answer was captured, so the time
+    spent on question ``n`` is the gap since turn ``n - 1`` (or since the
+    interview started, for the first question). Only the previous time
+    stamp is kept, so nothing re-reads the transcript.
+
+    Args:
+        interview_id: Interview the turns belong to.
+        next_index: Transcript index of the next turn.
+        last_time_stamp: Time stamp of the previous turn, or the interview
+            start time when there is none.
+    """
+
+    def __init__(self, interview_id: str, next_index: int, last_time_stamp=None):
+        self.interview_id = interview_id
+        self.next_index = next_index
+        self.last_time_stamp = _parse_time_stamp(last_time_stamp)
+
+    def record(self, time_stamp) -> None:
+        """Queues the duration of the turn captured at ``time_stamp``."""
+        current = _parse_time_stamp(time_stamp)
+        index, self.next_index = self.next_index, self.next_index + 1
+        previous, self.last_time_stamp = self.last_time_stamp, current
+        if previous is None:
+            return
+        seconds = max((current - previous).total_seconds(), 0.0)
+        question_timing.add((self.interview_id, str(index), round(seconds, 1)))
+
+
+class QuestionTimingWriter(BatchWriter):
+    """
+    Merges ``{question index: seconds}`` into ``time_spent_per_question``;
+    one UPDATE per interview per flush.
+    """
+
+    async def write(self, cur, items: list) -> None:
+        durations_by_interview = defaultdict(dict)
+        for interview_id, index, seconds in items:
+            durations_by_interview[interview_id][index] = seconds
+
+        merge_durations_query = """
+        UPDATE candidate_interview_question_session
+        SET
+            time_spent_per_question =
+                COALESCE(time_spent_per_question, '{}'::jsonb) || %(durations)s
+        WHERE
+            id = %(interview_id)s
+        """
+        await cur.executemany(
+            merge_durations_query,
+            [
+                {"interview_id": interview_id, "durations": Jsonb(durations)}
+                for interview_id, durations in durations_by_interview.items()
+            ],
+        )
+
+
+question_timing = QuestionTimingWriter(flush_interval=2.0)
@@ -0,0 +1,345 @@
+"""
+Compact storage format for interview transcripts.
+
+A transcript is a list of ``{"ai", "user", "time_stamp"}`` turns, which as
+JSONB repeats every key in every turn and keeps the timestamp as a string.
+``encode`` lays a transcript out column by column instead: one flag byte
+per turn, timestamps as microsecond deltas, the length of every text, then
+every ``ai`` text followed by every ``user`` text. Anything else a turn carries
+(other keys, non-string values, timestamps ``str(datetime)`` would not
+reproduce) goes into a small JSON side column, so decoding is lossless.
+
+The columns are compressed with zstd when ``zstandard`` is installed,
+optionally with a dictionary trained on our own transcripts
+(``transcript_codec_dictionary``), and with zlib otherwise. The header
+records which, so blobs stay readable whatever wrote them.
+
+Dictionaries are trained from recent transcripts with:
+
+    python -m src.interview.transcript_codec --samples 2000
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import struct
+import zlib
+
+import psycopg
+from psycopg.rows import dict_row
+
+from src.shared.config import settings
+
+try:
+    import zstandard
+except ImportError:  # optional; zlib is used without it
+    zstandard = None
+
+MAGIC = b"TC"
+FORMAT_VERSION = 1
+CODEC_ZLIB = 0
+CODEC_ZSTD = 1
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+DICTIONARY_SIZE = 32 * 1024
+
+# magic, format version, codec, dictionary id (0: none)
+HEADER = struct.Struct("<2sBBI")
+COUNTS = struct.Struct("<II")
+
+HAS_AI = 1
+HAS_USER = 2
+HAS_TIME_STAMP = 4
+
+EPOCH = datetime.datetime(1970, 1, 1)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def _time_stamp_micros(value) -> int | None:
+    """``value`` as microseconds since the epoch, if decoding gives it back."""
+    if not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None or str(parsed) != value:
+        return None
+    return (parsed - EPOCH) // MICROSECOND
+
+
+def _time_stamps(deltas) -> list[str]:
+    """Microsecond deltas (an int64 array) back to ``str(datetime)``, all at once."""
+    import numpy as np
+
+    stamps = np.datetime_as_string(np.cumsum(deltas).astype("datetime64[us]"))
+    # str(datetime) leaves out a zero fraction
+    return [
+        stamp[:-7].replace("T", " ")
+        if stamp.endswith(".000000")
+        else stamp.replace("T", " ")
+        for stamp in stamps.tolist()
+    ]
+
+
+def _columns(turns: list[dict]) -> bytes:
+    # numpy is imported on first use rather than at startup, like openai
+    import numpy as np
+
+    flags = bytearray()
+    micros = []
+    ai_texts, user_texts = [], []
+    extras = {}
+    for index, turn in enumerate(turns):
+        flag = 0
+        rest = {}
+        for key, value in turn.items():
+            if key == "ai" and isinstance(value, str):
+                flag |= HAS_AI
+                ai_texts.append(value)
+            elif key == "user" and isinstance(value, str):
+                flag |= HAS_USER
+                user_texts.append(value)
+            elif (
+                key == "time_stamp" and (stamp := _time_stamp_micros(value)) is not None
+            ):
+                flag |= HAS_TIME_STAMP
+                micros.append(stamp)
+            else:
+                rest[key] = value
+        if rest:
+            extras[index] = rest
+        flags.append(flag)
+    # lengths count characters, so the text decodes in one go
+    lengths = np.array([len(text) for text in ai_texts + user_texts], dtype=np.uint32)
+    extras_json = json.dumps(extras, separators=(",", ":")).encode() if extras else b""
+    return b"".join(
+        [
+            COUNTS.pack(len(turns), len(extras_json)),
+            flags,
+            np.diff(np.array(micros, dtype=np.int64), prepend=0).tobytes(),
+            lengths.tobytes(),
+            "".join(ai_texts + user_texts).encode(),
+            extras_json,
+        ]
+    )
+
+
+def _turns(body: bytes) -> list[dict]:
+    import numpy as np
+
+    count, extras_size = COUNTS.unpack_from(body)
+    offset = COUNTS.size
+    flags = np.frombuffer(body, dtype=np.uint8, count=count, offset=offset)
+    offset += count
+    stamp_count = int(np.count_nonzero(flags & HAS_TIME_STAMP))
+    ai_count = int(np.count_nonzero(flags & HAS_AI))
+    text_count = ai_count + int(np.count_nonzero(flags & HAS_USER))
+    deltas = np.frombuffer(body, dtype=np.int64, count=stamp_count, offset=offset)
+    offset += deltas.nbytes
+    lengths = np.frombuffer(body, dtype=np.uint32, count=text_count, offset=offset)
+    offset += lengths.nbytes
+    text = body[offset : len(body) - extras_size].decode()
+    extras = json.loads(body[len(body) - extras_size :]) if extras_size else {}
+
+    ends = np.cumsum(lengths, dtype=np.int64).tolist()
+    texts = [text[start:end] for start, end in zip([0, *ends], ends)]
+    ai, user = texts[:ai_count], texts[ai_count:]
+    stamps = _time_stamps(deltas)
+    if not extras and count == ai_count == stamp_count == len(user):
+        return [
+            {"ai": a, "user": u, "time_stamp": t} for a, u, t in zip(ai, user, stamps)
+        ]
+
+    turns = []
+    ai, user, stamps = iter(ai), iter(user), iter(stamps)
+    for index, flag in enumerate(flags.tolist()):
+        turn = {}
+        if flag & HAS_AI:
+            turn["ai"] = next(ai)
+        if flag & HAS_USER:
+            turn["user"] = next(user)
+        if flag & HAS_TIME_STAMP:
+            turn["time_stamp"] = next(stamps)
+        turn.update(extras.get(str(index), {}))
+        turns.append(turn)
+    return turns
+
+
+class TranscriptCodec:
+    """
+    Encodes and decodes transcripts; holds the zstd dictionaries blobs
+    refer to by id. ``dictionary_id`` is the one new blobs are written
+    with (the newest loaded).
+    """
+
+    def __init__(self, use_zstd: bool = zstandard is not None):
+        self.use_zstd = use_zstd
+        self._dictionaries: dict[int, "zstandard.ZstdCompressionDict"] = {}
+        self.dictionary_id = 0
+
+    def add_dictionary(self, dictionary_id: int, dictionary: bytes) -> None:
+        if zstandard is None:
+            return
+        self._dictionaries[dictionary_id] = zstandard.ZstdCompressionDict(dictionary)
+        self.dictionary_id = max(self.dictionary_id, dictionary_id)
+
+    def has_dictionary(self, dictionary_id: int) -> bool:
+        return dictionary_id == 0 or dictionary_id in self._dictionaries
+
+    def encode(self, turns: list[dict]) -> bytes:
+        body = _columns(turns)
+        if not self.use_zstd:
+            return HEADER.pack(MAGIC, FORMAT_VERSION, CODEC_ZLIB, 0) + zlib.compress(
+                body, ZLIB_LEVEL
+            )
+        dictionary = self._dictionaries.get(self.dictionary_id)
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary)
+        header = HEADER.pack(
+            MAGIC, FORMAT_VERSION, CODEC_ZSTD, self.dictionary_id if dictionary else 0
+        )
+        return header + compressor.compress(body)
+
+    def decode(self, blob: bytes) -> list[dict]:
+        """
+        The transcript in its JSONB shape.
+
+        Raises:
+            ValueError: If ``blob`` is not a transcript, or needs zstd or a
+                dictionary that is not available.
+        """
+        magic, version, codec, dictionary_id = HEADER.unpack_from(blob)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not an encoded transcript")
+        payload = memoryview(blob)[HEADER.size :]
+        if codec == CODEC_ZLIB:
+            return _turns(zlib.decompress(payload))
+        if zstandard is None:
+            raise ValueError("Transcript is zstd-compressed; install zstandard")
+        if not self.has_dictionary(dictionary_id):
+            raise ValueError(f"Unknown transcript dictionary {dictionary_id}")
+        decompressor = zstandard.ZstdDecompressor(
+            dict_data=self._dictionaries.get(dictionary_id)
+        )
+        return _turns(decompressor.decompress(payload))
+
+
+def train_dictionary(
+    transcripts: list[list[dict]], size: int = DICTIONARY_SIZE
+) -> bytes:
+    """A zstd dictionary for the column layout of ``transcripts``."""
+    if zstandard is None:
+        raise RuntimeError("Training a transcript dictionary needs zstandard")
+    samples = [_columns(turns) for turns in transcripts if turns]
+    return zstandard.train_dictionary(size, samples).as_bytes()
+
+
+transcript_codec = TranscriptCodec()
+
+
+async def _ensure_dictionary(dictionary_id: int, db) -> None:
+    conn, cur = db
+    get_dictionary_query = """
+    SELECT
+        dictionary
+    FROM
+        transcript_codec_dictionary
+    WHERE
+        id = %(dictionary_id)s
+    """
+    await cur.execute(get_dictionary_query, {"dictionary_id": dictionary_id})
+    row = await cur.fetchone()
+    if row:
+        transcript_codec.add_dictionary(dictionary_id, row["dictionary"])
+
+
+async def load_dictionaries(db) -> None:
+    """Loads the newest dictionary, which new blobs are written with."""
+    conn, cur = db
+    get_dictionary_query = """
+    SELECT
+        id,
+        dictionary
+    FROM
+        transcript_codec_dictionary
+    ORDER BY
+        id DESC
+    LIMIT 1
+    """
+    await cur.execute(get_dictionary_query)
+    row = await cur.fetchone()
+    if row:
+        transcript_codec.add_dictionary(row["id"], row["dictionary"])
+
+
+async def encode_transcript(turns: list[dict], db) -> bytes:
+    if zstandard is not None and not transcript_codec.dictionary_id:
+        await load_dictionaries(db)
+    return transcript_codec.encode(turns)
+
+
+async def load_transcript(interview: dict, db) -> list | None:
+    """
+    The transcript of an interview row, from ``transcript`` or, once
+    compacted, decoded from ``transcript_blob``.
+    """
+    if interview.get("transcript") is not None or not interview.get("transcript_blob"):
+        return interview.get("transcript")
+    blob = bytes(interview["transcript_blob"])
+    dictionary_id = HEADER.unpack_from(blob)[3]
+    if zstandard is not None and not transcript_codec.has_dictionary(dictionary_id):
+        await _ensure_dictionary(dictionary_id, db)
+    return transcript_codec.decode(blob)
+
+
+async def train_and_store_dictionary(samples: int) -> dict:
+    """Trains a dictionary on the latest transcripts and stores it."""
+    get_samples_query = """
+    SELECT
+        transcript
+    FROM
+        candidate_interview_question_session
+    WHERE
+        transcript IS NOT NULL
+    ORDER BY
+        created_at DESC
+    LIMIT %(samples)s
+    """
+    insert_dictionary_query = """
+    INSERT INTO
+        transcript_codec_dictionary
+    (dictionary, sample_count)
+    VALUES
+        (%(dictionary)s, %(sample_count)s)
+    RETURNING
+        id
+    """
+    async with await psycopg.AsyncConnection.connect(
+        settings.database_url, row_factory=dict_row
+    ) as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(get_samples_query, {"samples": samples})
+            transcripts = [row["transcript"] for row in await cur.fetchall()]
+            dictionary = await asyncio.to_thread(train_dictionary, transcripts)
+            await cur.execute(
+                insert_dictionary_query,
+                {"dictionary": dictionary, "sample_count": len(transcripts)},
+            )
+            dictionary_id = (await cur.fetchone())["id"]
+    return {
+        "dictionary_id": dictionary_id,
+        "samples": len(transcripts),
+        "bytes": len(dictionary),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--samples", type=int, default=2000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(train_and_store_dictionary(args.samples))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import datetime
+import logging
+from collections import Counter
+
+from src.shared.batch import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+# violation types counted into candidate_interview_question_session.tab_switch_count
+TAB_SWITCH_VIOLATIONS = frozenset({"tab_switch", "focus_loss"})
+
+
+class ViolationBuffer(BatchWriter):
+    """
+    Buffers proctoring events and writes them in one bulk insert per flush.
+
+    Tab switches and focus loss fire many times a minute, so the route only
+    queues the event. Each flush inserts every buffered row with a single
+    ``unnest`` statement and adds the per-interview tab-switch counts to
+    ``tab_switch_count`` in the same transaction, so the counter always
+    matches the stored rows. Events for unknown interviews are dropped
+    rather than failing the whole batch.
+    """
+
+    async def write(self, cur, items: list) -> None:
+        insert_violations_query = """
+        INSERT INTO
+            interview_violation
+        (interview_session_id, violation_type, description, created_at)
+        SELECT
+            v.interview_id, v.violation_type, v.description, v.created_at
+        FROM
+            unnest(
+                %(interview_ids)s::uuid[],
+                %(violation_types)s::text[],
+                %(descriptions)s::text[],
+                %(created_ats)s::timestamptz[]
+            ) AS v(interview_id, violation_type, description, created_at)
+            JOIN candidate_interview_question_session ciqs
+                ON ciqs.id = v.interview_id
+        """
+        await cur.execute(
+            insert_violations_query,
+            {
+                "interview_ids": [item["interview_id"] for item in items],
+                "violation_types": [item["violation_type"] for item in items],
+                "descriptions": [item["description"] for item in items],
+                "created_ats": [item["created_at"] for item in items],
+            },
+        )
+
+        tab_switches = Counter(
+            item["interview_id"]
+            for item in items
+            if item["violation_type"] in TAB_SWITCH_VIOLATIONS
+        )
+        if not tab_switches:
+            return
+        increment_tab_switch_query = """
+        UPDATE
+            candidate_interview_question_session ciqs
+        SET
+            tab_switch_count = COALESCE(ciqs.tab_switch_count, 0) + c.switches
+        FROM
+            unnest(%(interview_ids)s::uuid[], %(switches)s::int[])
+                AS c(interview_id, switches)
+        WHERE
+            ciqs.id = c.interview_id
+        """
+        await cur.execute(
+            increment_tab_switch_query,
+            {
+                "interview_ids": list(tab_switches),
+                "switches": list(tab_switches.values()),
+            },
+        )
+
+
+violation_buffer = ViolationBuffer(flush_interval=2.0)
+
+
+def record_violation(interview_id: str, violation_type: str, description: str):
+    """Queues a violation event; never blocks the caller."""
+    violation_buffer.add(
+        {
+            "interview_id": interview_id,
+            "violation_type": violation_type,
+            "description": description,
+            "created_at": datetime.datetime.now(datetime.UTC),
+        }
+    )
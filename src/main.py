@@ -2,16 +2,48 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
+from src.interview.archive import interview_archiver
+from src.interview.credits import credit_rollup
+from src.interview.ledger import ledger
+from src.interview.relay import transcript_writer
+from src.interview.timing import question_timing
+from src.interview.violations import violation_buffer
+from src.matching.duplicates import duplicate_detector
 from src.router import router
-from src.shared.db import pool
+from src.search.index import search_indexer
+from src.shared import profiler, tracing
+from src.shared.config import settings
+from src.shared.db import explainer, pool
+from src.shared.notify import listener
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await pool.open()  # initialize PostgreSQL async pool
+    ledger.start()  # background flush of LLM usage rows
+    listener.start()  # LISTEN connection feeding the SSE streams
+    transcript_writer.start()  # turns captured by the realtime relay
+    violation_buffer.start()  # proctoring events
+    question_timing.start()  # per-question durations
+    search_indexer.start()  # incremental full-text index
+    duplicate_detector.start()  # near-duplicate resumes
+    credit_rollup.start()  # folds credit deltas into interview_credits
+    interview_archiver.start()  # partitions ahead, cold JSONB to the archive
     yield
+    await listener.stop()
+    await transcript_writer.stop()
+    await violation_buffer.stop()
+    await question_timing.stop()
+    await search_indexer.stop()
+    await duplicate_detector.stop()
+    await credit_rollup.stop()
+    await interview_archiver.stop()
+    await ledger.stop()
+    await explainer.close()
     await pool.close()  # close pool safely
+    tracing.shutdown()  # flush buffered spans
 
 
 app = FastAPI(lifespan=lifespan)
@@ -27,6 +59,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# transcripts compress well; text/event-stream is left alone
+app.add_middleware(GZipMiddleware, minimum_size=1024)  # ty:ignore[invalid-argument-type]
+
+if settings.profiler_enabled:
+    app.add_middleware(profiler.RequestProfilerMiddleware)
+
 
 @app.get("/api/status/")
 def root():
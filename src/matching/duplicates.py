@@ -0,0 +1,469 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH buckets.
+
+Each resume's ``cf_text`` is reduced to a MinHash signature of its word
+shingles; resumes whose signatures agree on any LSH band become candidates
+and are confirmed on estimated Jaccard similarity. Confirmed duplicates get
+``duplicate_flag`` and a shared ``duplicate_group_id``; groups only grow
+here, ``duplicate_resolution`` is left to the recruiter.
+
+Resumes are checked as they are inserted or their text changes (the
+``resume_dedupe`` notification). The whole table can be (re)processed
+across a process pool:
+
+    python -m src.matching.duplicates --processes 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import re
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+import psycopg
+from psycopg.rows import dict_row
+
+from src.shared.batch import BatchWriter
+from src.shared.config import settings
+from src.shared.notify import listener
+
+# numpy is imported on first use: this module loads at startup, most
+# workers never sign a resume
+if TYPE_CHECKING:
+    import numpy as np
+
+RESUME_DEDUPE_CHANNEL = "resume_dedupe"
+# serialises group assignment between workers and the batch rebuild
+DEDUPE_LOCK = 0xD0B1E5
+
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 128
+# 16 bands of 8 rows: pairs at 0.8 Jaccard collide in some band ~95% of
+# the time, pairs at 0.5 about 6% of the time
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+DUPLICATE_THRESHOLD = 0.8
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_SHINGLE_MULTIPLIER = 0x9E3779B97F4A7C15
+
+
+@functools.cache
+def _permutations() -> tuple[np.ndarray, np.ndarray]:
+    """
+    ``(a, b)`` columns of the multiply-shift hashes, h(x) = ((a * x + b)
+    mod 2^64) >> 32 with odd a; fixed seed: signatures are stored and
+    compared across processes.
+    """
+    import numpy as np
+
+    a, b = np.random.default_rng(0x5EED).integers(
+        0, 1 << 64, size=(2, NUM_PERMUTATIONS), dtype=np.uint64, endpoint=False
+    )
+    return (a | np.uint64(1))[:, None], b[:, None]
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """Distinct 32-bit hashes of the text's ``SHINGLE_SIZE``-word shingles."""
+    import numpy as np
+
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if not tokens:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.fromiter((zlib.crc32(token.encode()) for token in tokens), np.uint64)
+    width = min(SHINGLE_SIZE, len(hashes))
+    count = len(hashes) - width + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(width):
+        # wrapping multiply-add over uint64; the high half is well mixed
+        combined = (
+            combined * np.uint64(_SHINGLE_MULTIPLIER) + hashes[offset : offset + count]
+        )
+    return np.unique(combined >> np.uint64(32))
+
+
+def minhash(text: str | None) -> np.ndarray | None:
+    """The text's MinHash signature, or None when it has no words."""
+    import numpy as np
+
+    shingles = shingle_hashes(text or "")
+    if not len(shingles):
+        return None
+    permutation_a, permutation_b = _permutations()
+    permuted = permutation_a * shingles
+    permuted += permutation_b
+    # the shift is monotonic, so it can wait until after the min
+    return (permuted.min(axis=1) >> np.uint64(32)).astype(np.uint32)
+
+
+def band_keys(signature: np.ndarray) -> list[int]:
+    """One signed 64-bit bucket key per LSH band."""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(band.tobytes(), digest_size=8).digest(), signed=True
+        )
+        for band in signature.reshape(BANDS, ROWS_PER_BAND)
+    ]
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    import numpy as np
+
+    return float(np.count_nonzero(first == second)) / NUM_PERMUTATIONS
+
+
+def content_hash(text: str | None) -> str:
+    return hashlib.md5((text or "").encode()).hexdigest()
+
+
+def _signatures(resumes: list[tuple[str, str | None]]) -> list[tuple]:
+    """
+    ``(id, content_hash, signature bytes, band keys)`` per resume; signature
+    and keys are None for empty text. Runs in pool processes.
+    """
+    results = []
+    for resume_id, text in resumes:
+        signature = minhash(text)
+        if signature is None:
+            results.append((resume_id, content_hash(text), None, None))
+        else:
+            keys = band_keys(signature)
+            results.append((resume_id, content_hash(text), signature.tobytes(), keys))
+    return results
+
+
+class LshIndex:
+    """In-memory LSH buckets, for the batch rebuild and benchmarks."""
+
+    def __init__(self):
+        self.signatures: dict[str, np.ndarray] = {}
+        self._buckets: dict[tuple[int, int], list[str]] = {}
+
+    def add(self, key: str, signature: np.ndarray, bands: list[int]) -> list[str]:
+        """Indexes ``key``; returns the already indexed keys it duplicates."""
+        candidates = set()
+        for band, bucket_key in enumerate(bands):
+            bucket = self._buckets.setdefault((band, bucket_key), [])
+            candidates.update(bucket)
+            bucket.append(key)
+        self.signatures[key] = signature
+        return [
+            candidate
+            for candidate in candidates
+            if similarity(signature, self.signatures[candidate]) >= DUPLICATE_THRESHOLD
+        ]
+
+
+def _components(pairs) -> list[set]:
+    """Connected components (of two or more members) of an edge list."""
+    parent = {}
+
+    def find(node):
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for first, second in pairs:
+        parent[find(first)] = find(second)
+    groups = {}
+    for node in list(parent):
+        groups.setdefault(find(node), set()).add(node)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+async def _save_signatures(cur, results: list[tuple]) -> None:
+    save_signatures_query = """
+    INSERT INTO
+        resume_minhash
+    (resume_detail_id, signature, content_hash)
+    SELECT
+        *
+    FROM
+        unnest(%(ids)s::uuid[], %(signatures)s::bytea[], %(content_hashes)s::text[])
+    ON CONFLICT (resume_detail_id) DO UPDATE
+    SET
+        signature = EXCLUDED.signature,
+        content_hash = EXCLUDED.content_hash,
+        updated_at = CURRENT_TIMESTAMP
+    """
+    await cur.execute(
+        save_signatures_query,
+        {
+            "ids": [result[0] for result in results],
+            "signatures": [result[2] for result in results],
+            "content_hashes": [result[1] for result in results],
+        },
+    )
+    await cur.execute(
+        "DELETE FROM resume_lsh_bucket WHERE resume_detail_id = ANY(%(ids)s::uuid[])",
+        {"ids": [result[0] for result in results]},
+    )
+    bands, buckets, ids = [], [], []
+    for resume_id, _, _, keys in results:
+        for band, bucket_key in enumerate(keys or ()):
+            bands.append(band)
+            buckets.append(bucket_key)
+            ids.append(resume_id)
+    save_buckets_query = """
+    INSERT INTO
+        resume_lsh_bucket
+    (band, bucket, resume_detail_id)
+    SELECT
+        *
+    FROM
+        unnest(%(bands)s::smallint[], %(buckets)s::bigint[], %(ids)s::uuid[])
+    ON CONFLICT DO NOTHING
+    """
+    if ids:
+        await cur.execute(
+            save_buckets_query, {"bands": bands, "buckets": buckets, "ids": ids}
+        )
+
+
+async def _assign_groups(cur, components: list[set], existing: dict) -> None:
+    """
+    Flags each component and gives it one group: the smallest group id a
+    member already has (merging the others into it), or a new one.
+    """
+    ids, group_ids, merged_from, merged_into = [], [], [], []
+    for members in components:
+        groups = sorted({existing[m] for m in members if m in existing})
+        group_id = groups[0] if groups else str(uuid.uuid4())
+        merged_from += groups[1:]
+        merged_into += [group_id] * len(groups[1:])
+        ids += sorted(members)
+        group_ids += [group_id] * len(members)
+
+    merge_groups_query = """
+    UPDATE
+        resume_detail rd
+    SET
+        duplicate_group_id = u.group_id
+    FROM
+        unnest(%(merged_from)s::uuid[], %(merged_into)s::uuid[])
+            AS u(old_group_id, group_id)
+    WHERE
+        rd.duplicate_group_id = u.old_group_id
+    """
+    if merged_from:
+        await cur.execute(
+            merge_groups_query,
+            {"merged_from": merged_from, "merged_into": merged_into},
+        )
+    flag_duplicates_query = """
+    UPDATE
+        resume_detail rd
+    SET
+        duplicate_flag = TRUE,
+        duplicate_group_id = u.group_id
+    FROM
+        unnest(%(ids)s::uuid[], %(group_ids)s::uuid[]) AS u(id, group_id)
+    WHERE
+        rd.id = u.id
+    """
+    if ids:
+        await cur.execute(flag_duplicates_query, {"ids": ids, "group_ids": group_ids})
+
+
+class DuplicateDetector(BatchWriter):
+    """
+    Checks new or edited resumes against the stored LSH buckets.
+
+    Items are resume ids. Every worker hears the notification, so resumes
+    whose text hash matches their stored signature are skipped.
+    """
+
+    async def write(self, cur, items: list) -> None:
+        import numpy as np
+
+        await cur.execute("SELECT pg_advisory_xact_lock(%s)", (DEDUPE_LOCK,))
+        get_resumes_query = """
+        SELECT
+            rd.id,
+            rd.cf_text,
+            m.content_hash
+        FROM
+            resume_detail rd
+            LEFT JOIN resume_minhash m ON m.resume_detail_id = rd.id
+        WHERE
+            rd.id = ANY(%(ids)s::uuid[])
+        """
+        await cur.execute(get_resumes_query, {"ids": sorted(set(items))})
+        changed = [
+            (str(row["id"]), row["cf_text"])
+            for row in await cur.fetchall()
+            if row["content_hash"] != content_hash(row["cf_text"])
+        ]
+        if not changed:
+            return
+        results = await asyncio.to_thread(_signatures, changed)
+        await _save_signatures(cur, results)
+
+        find_candidates_query = """
+        SELECT
+            pairs.id,
+            pairs.candidate_id,
+            m.signature,
+            rd.duplicate_group_id
+        FROM (
+            SELECT DISTINCT
+                b.resume_detail_id AS id,
+                n.resume_detail_id AS candidate_id
+            FROM
+                resume_lsh_bucket b
+                JOIN resume_lsh_bucket n
+                    ON n.band = b.band
+                    AND n.bucket = b.bucket
+                    AND n.resume_detail_id <> b.resume_detail_id
+            WHERE
+                b.resume_detail_id = ANY(%(ids)s::uuid[])
+        ) pairs
+            JOIN resume_minhash m ON m.resume_detail_id = pairs.candidate_id
+            JOIN resume_detail rd ON rd.id = pairs.candidate_id
+        """
+        await cur.execute(
+            find_candidates_query, {"ids": [result[0] for result in results]}
+        )
+        signatures = {
+            result[0]: np.frombuffer(result[2], dtype=np.uint32)
+            for result in results
+            if result[2] is not None
+        }
+        pairs = []
+        existing = {}
+        for row in await cur.fetchall():
+            candidate = np.frombuffer(row["signature"], dtype=np.uint32)
+            resume_id, candidate_id = str(row["id"]), str(row["candidate_id"])
+            if similarity(signatures[resume_id], candidate) >= DUPLICATE_THRESHOLD:
+                pairs.append((resume_id, candidate_id))
+                if row["duplicate_group_id"]:
+                    existing[candidate_id] = str(row["duplicate_group_id"])
+        components = _components(pairs)
+        if not components:
+            return
+
+        get_groups_query = """
+        SELECT
+            id,
+            duplicate_group_id
+        FROM
+            resume_detail
+        WHERE
+            id = ANY(%(ids)s::uuid[])
+        """
+        await cur.execute(get_groups_query, {"ids": list(signatures)})
+        for row in await cur.fetchall():
+            if row["duplicate_group_id"]:
+                existing[str(row["id"])] = str(row["duplicate_group_id"])
+        await _assign_groups(cur, components, existing)
+
+
+duplicate_detector = DuplicateDetector(flush_interval=5.0, max_batch=200)
+
+
+def check_duplicates(resume_id) -> None:
+    """Queues a resume to be signed and checked for near-duplicates."""
+    duplicate_detector.add(str(resume_id))
+
+
+def _on_resume_changed(payload: str | None) -> None:
+    # resumes missed while disconnected are caught up by the batch rebuild
+    if payload is not None:
+        check_duplicates(json.loads(payload)["id"])
+
+
+listener.register(RESUME_DEDUPE_CHANNEL, _on_resume_changed)
+
+
+async def rebuild_duplicates(processes: int, chunk_size: int = 1000) -> dict:
+    """
+    Signs every resume across a process pool and regroups duplicates.
+
+    Resumes are streamed from a server-side cursor; signatures are stored
+    chunk by chunk as they come back, then the groups are assigned in one
+    transaction.
+    """
+    import numpy as np
+
+    loop = asyncio.get_running_loop()
+    index = LshIndex()
+    pairs = []
+    existing = {}
+    signed = 0
+    async with (
+        await psycopg.AsyncConnection.connect(
+            settings.database_url, row_factory=dict_row
+        ) as reader,
+        await psycopg.AsyncConnection.connect(
+            settings.database_url, row_factory=dict_row
+        ) as writer,
+    ):
+        with ProcessPoolExecutor(processes) as executor:
+            pending = set()
+
+            async def collect(wait_for) -> None:
+                nonlocal signed
+                done, _ = await asyncio.wait(pending, return_when=wait_for)
+                for future in done:
+                    pending.discard(future)
+                    results = future.result()
+                    async with writer.cursor() as cur:
+                        await _save_signatures(cur, results)
+                    await writer.commit()
+                    for resume_id, _, signature, keys in results:
+                        if signature is None:
+                            continue
+                        signature = np.frombuffer(signature, dtype=np.uint32)
+                        for duplicate in index.add(resume_id, signature, keys):
+                            pairs.append((resume_id, duplicate))
+                    signed += len(results)
+
+            async with reader.cursor(name="resume_dedupe_scan") as cur:
+                await cur.execute(
+                    "SELECT id, cf_text, duplicate_group_id FROM resume_detail"
+                )
+                while rows := await cur.fetchmany(chunk_size):
+                    chunk = []
+                    for row in rows:
+                        chunk.append((str(row["id"]), row["cf_text"]))
+                        if row["duplicate_group_id"]:
+                            existing[str(row["id"])] = str(row["duplicate_group_id"])
+                    pending.add(loop.run_in_executor(executor, _signatures, chunk))
+                    if len(pending) >= 2 * processes:
+                        await collect(asyncio.FIRST_COMPLETED)
+            if pending:
+                await collect(asyncio.ALL_COMPLETED)
+
+        components = _components(pairs)
+        async with writer.cursor() as cur:
+            await cur.execute("SELECT pg_advisory_xact_lock(%s)", (DEDUPE_LOCK,))
+            await _assign_groups(cur, components, existing)
+        await writer.commit()
+    return {
+        "resumes": signed,
+        "duplicate_pairs": len(pairs),
+        "groups": len(components),
+        "flagged": sum(len(members) for members in components),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(rebuild_duplicates(args.processes, args.chunk_size))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+import asyncio
+import time
+
+import numpy as np
+
+# marks the entries of an overwritten resume until they are compacted away
+DEAD_SKILL = -1
+# initial room for skill entries per row of capacity
+SKILLS_PER_ROW = 16
+# postings are rebuilt once the entries appended since are over 1/N of all
+POSTINGS_REBUILD_FRACTION = 4
+MUST_HAVE_FLAG = 1
+NICE_TO_HAVE_FLAG = 2
+MUST_HAVE_WEIGHT = 0.6
+NICE_TO_HAVE_WEIGHT = 0.25
+YOE_WEIGHT = 0.15
+# score given for YOE when a resume has none recorded
+UNKNOWN_YOE_FIT = 0.5
+REFRESH_SECONDS = 30.0
+# updated_at is the writing transaction's start time, so a slow transaction
+# can commit rows older than the watermark; re-read this far back each time
+REFRESH_OVERLAP_SECONDS = 300
+REFRESH_YIELD_EVERY = 2000
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+class SkillVocabulary:
+    """Maps normalized skill names to indices shared by all resumes and jobs."""
+
+    def __init__(self):
+        self._index: dict[str, int] = {}
+        self.skills: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def add(self, skills) -> list[int]:
+        indices = []
+        for skill in skills or ():
+            name = normalize_skill(skill)
+            if not name:
+                continue
+            if name not in self._index:
+                self._index[name] = len(self.skills)
+                self.skills.append(name)
+            indices.append(self._index[name])
+        return indices
+
+    def lookup(self, skills) -> tuple[list[int], list[str]]:
+        """Splits job skills into known indices and skills no resume has."""
+        known, unknown = [], []
+        for name in dict.fromkeys(normalize_skill(skill) for skill in skills or ()):
+            if not name:
+                continue
+            if name in self._index:
+                known.append(self._index[name])
+            else:
+                unknown.append(name)
+        return known, unknown
+
+
+class CandidatePool:
+    """
+    Every resume's skills as a run of vocabulary indices, plus its YOE.
+
+    The runs sit back to back in one flat array (``skills``, with the row
+    each entry belongs to in ``skill_rows``), so memory follows the skills
+    resumes actually list rather than resumes times vocabulary. Postings,
+    the entries sorted by skill, let a job touch only the entries of the
+    handful of skills it names; coverage is a count of those per row.
+    Rows are appended or overwritten in place as resumes change, and
+    entries appended since the postings were built are scanned until there
+    are enough of them to rebuild; ``refresh`` pulls those changes from
+    ``resume_detail``.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.vocabulary = SkillVocabulary()
+        self.ids: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.skills = np.full(capacity * SKILLS_PER_ROW, DEAD_SKILL, dtype=np.int32)
+        self.skill_rows = np.zeros(capacity * SKILLS_PER_ROW, dtype=np.int32)
+        self.used = 0
+        self.dead = 0
+        self.start = np.zeros(capacity, dtype=np.int64)
+        self.length = np.zeros(capacity, dtype=np.int32)
+        self.yoe = np.full(capacity, np.nan, dtype=np.float32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._reset_postings()
+        self.watermark = None
+        self._refreshed_at = 0.0
+        self._refresh_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        capacity = len(self.yoe)
+        if rows <= capacity:
+            return
+        new_capacity = max(capacity * 2, rows)
+        self.start = np.resize(self.start, new_capacity)
+        self.length = np.resize(self.length, new_capacity)
+        self.length[capacity:] = 0
+        self.yoe = np.resize(self.yoe, new_capacity)
+        self.yoe[capacity:] = np.nan
+        self.active = np.resize(self.active, new_capacity)
+        self.active[capacity:] = False
+
+    def _ensure_entries(self, entries: int) -> None:
+        capacity = len(self.skills)
+        if entries <= capacity:
+            return
+        new_capacity = max(capacity * 2, entries)
+        self.skills = np.resize(self.skills, new_capacity)
+        self.skills[capacity:] = DEAD_SKILL
+        self.skill_rows = np.resize(self.skill_rows, new_capacity)
+
+    def _entries_of(self, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Positions in ``skills`` of the runs of ``rows``, and each run's length."""
+        lengths = self.length[rows]
+        offsets = np.cumsum(lengths) - lengths
+        entries = np.repeat(self.start[rows] - offsets, lengths)
+        return entries + np.arange(len(entries)), lengths
+
+    def _reset_postings(self) -> None:
+        self._postings = np.zeros(0, dtype=np.int32)
+        self._bounds = np.zeros(1, dtype=np.int64)
+        self._indexed = 0
+
+    def build_postings(self) -> None:
+        """Sorts every entry by skill; scoring only scans entries added since."""
+        skills = self.skills[: self.used]
+        self._postings = np.argsort(skills, kind="stable").astype(np.int32)
+        self._bounds = np.searchsorted(
+            skills[self._postings], np.arange(len(self.vocabulary) + 1)
+        )
+        self._indexed = self.used
+
+    def _entries_with(self, skills: list[int], flags: np.ndarray) -> np.ndarray:
+        """Positions in ``skills`` of entries that may be one of ``skills``."""
+        if self.used - self._indexed > self.used // POSTINGS_REBUILD_FRACTION:
+            self.build_postings()
+        runs = [
+            self._postings[self._bounds[skill] : self._bounds[skill + 1]]
+            for skill in set(skills)
+            if skill + 1 < len(self._bounds)
+        ]
+        tail = self.skills[self._indexed : self.used]
+        return np.concatenate([*runs, self._indexed + np.flatnonzero(flags[tail])])
+
+    def _compact(self) -> None:
+        rows = np.arange(len(self.ids))
+        entries, lengths = self._entries_of(rows)
+        live = len(entries)
+        self.skills[:live] = self.skills[entries]
+        self.skills[live:] = DEAD_SKILL
+        self.skill_rows[:live] = np.repeat(rows, lengths)
+        self.start[rows] = np.cumsum(lengths) - lengths
+        self.used = live
+        self.dead = 0
+        self._reset_postings()
+
+    def upsert(self, resume_id, skills, yoe: float | None, active: bool = True) -> None:
+        resume_id = str(resume_id)
+        indices = np.unique(np.array(self.vocabulary.add(skills), dtype=np.int32))
+        row = self.rows.get(resume_id)
+        if row is None:
+            row = len(self.ids)
+            self._ensure_capacity(row + 1)
+            self.ids.append(resume_id)
+            self.rows[resume_id] = row
+        else:
+            # the old run is left behind and skipped until it is compacted away
+            start = self.start[row]
+            self.skills[start : start + self.length[row]] = DEAD_SKILL
+            self.dead += int(self.length[row])
+            self.length[row] = 0
+            if self.dead > self.used // 2:
+                self._compact()
+        self._ensure_entries(self.used + len(indices))
+        self.skills[self.used : self.used + len(indices)] = indices
+        self.skill_rows[self.used : self.used + len(indices)] = row
+        self.start[row] = self.used
+        self.length[row] = len(indices)
+        self.used += len(indices)
+        self.yoe[row] = np.nan if yoe is None else yoe
+        self.active[row] = active
+
+    def _yoe_fit(self, yoe: np.ndarray, min_yoe, max_yoe) -> np.ndarray:
+        fit = np.ones(len(yoe), dtype=np.float32)
+        if min_yoe:
+            fit = np.where(yoe < min_yoe, np.clip(yoe / min_yoe, 0, 1), fit)
+        if max_yoe:
+            # overqualified is a softer miss than underqualified
+            over = np.clip(1 - (yoe - max_yoe) / (2 * max(max_yoe, 1)), 0, 1)
+            fit = np.where(yoe > max_yoe, over, fit)
+        return np.where(np.isnan(yoe), np.float32(UNKNOWN_YOE_FIT), fit)
+
+    def score(
+        self,
+        must_have: list[str],
+        nice_to_have: list[str],
+        min_yoe: float | None,
+        max_yoe: float | None,
+        rows: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Scores ``rows`` (default: every resume) against a job.
+
+        Returns:
+            The row numbers with their total score, must-have coverage and
+            nice-to-have coverage, each in [0, 1]. Inactive resumes are
+            dropped from ``rows`` when given and scored -1 otherwise.
+        """
+        count = len(self.ids)
+        if rows is not None:
+            rows = rows[self.active[rows]]
+            count = len(rows)
+        must_known, must_unknown = self.vocabulary.lookup(must_have)
+        nice_known, nice_unknown = self.vocabulary.lookup(nice_to_have)
+        must_total = len(must_known) + len(must_unknown)
+        nice_total = len(nice_known) + len(nice_unknown)
+
+        must_hits = np.zeros(count, dtype=np.uint16)
+        nice_hits = np.zeros(count, dtype=np.uint16)
+        if must_known or nice_known:
+            # one flag byte per skill, and a trailing 0 that DEAD_SKILL maps to
+            flags = np.zeros(len(self.vocabulary) + 1, dtype=np.uint8)
+            flags[must_known] |= MUST_HAVE_FLAG
+            flags[nice_known] |= NICE_TO_HAVE_FLAG
+            if rows is None:
+                entries = self._entries_with(must_known + nice_known, flags)
+                entry_rows = self.skill_rows[entries]
+            else:
+                # a requisition's applicants: their own runs are fewer entries
+                entries, lengths = self._entries_of(rows)
+                entry_rows = np.repeat(np.arange(count), lengths)
+            # entries of overwritten resumes are DEAD_SKILL now and unflagged
+            entry_flags = flags[self.skills[entries]]
+            for flag, hits in (
+                (MUST_HAVE_FLAG, must_hits),
+                (NICE_TO_HAVE_FLAG, nice_hits),
+            ):
+                hits += np.bincount(
+                    entry_rows[(entry_flags & flag) != 0], minlength=count
+                ).astype(np.uint16)
+
+        components = []
+        if must_total:
+            must_coverage = must_hits * np.float32(1 / must_total)
+            components.append((MUST_HAVE_WEIGHT, must_coverage))
+        else:
+            must_coverage = np.ones(count, dtype=np.float32)
+        if nice_total:
+            nice_coverage = nice_hits * np.float32(1 / nice_total)
+            components.append((NICE_TO_HAVE_WEIGHT, nice_coverage))
+        else:
+            nice_coverage = np.zeros(count, dtype=np.float32)
+        if min_yoe or max_yoe:
+            yoe = self.yoe[:count] if rows is None else self.yoe[rows]
+            components.append((YOE_WEIGHT, self._yoe_fit(yoe, min_yoe, max_yoe)))
+
+        # weights of the parts a job leaves out go to the parts it has
+        total_weight = sum(weight for weight, _ in components)
+        scores = np.zeros(count, dtype=np.float32)
+        for weight, values in components:
+            scores += np.float32(weight / total_weight) * values
+        if rows is None:
+            rows = np.arange(count)
+            scores[~self.active[:count]] = -1
+        return rows, scores, must_coverage, nice_coverage
+
+    def top_k(
+        self, k: int, *job, rows: np.ndarray | None = None
+    ) -> tuple[list[dict], int]:
+        """The ``k`` best matches for a job, and how many resumes were scored."""
+        rows, scores, must_coverage, nice_coverage = self.score(*job, rows=rows)
+        if len(rows) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(rows))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        best = best[scores[best] >= 0]
+        matches = []
+        for i in best:
+            yoe = self.yoe[rows[i]]
+            matches.append(
+                {
+                    "resume_detail_id": self.ids[rows[i]],
+                    "score": round(float(scores[i]), 4),
+                    "must_have_coverage": round(float(must_coverage[i]), 4),
+                    "nice_to_have_coverage": round(float(nice_coverage[i]), 4),
+                    "yoe": None if np.isnan(yoe) else float(yoe),
+                }
+            )
+        scored = int(np.count_nonzero(self.active[rows])) if len(rows) else 0
+        return matches, scored
+
+    def skills_of(self, resume_id: str, skills: list[str]) -> list[str]:
+        """Which of ``skills`` the resume lists."""
+        row = self.rows[str(resume_id)]
+        start = self.start[row]
+        listed = set(self.skills[start : start + self.length[row]].tolist())
+        known, _ = self.vocabulary.lookup(skills)
+        return [self.vocabulary.skills[index] for index in known if index in listed]
+
+    def rows_for(self, resume_ids) -> np.ndarray:
+        rows = (self.rows.get(str(resume_id)) for resume_id in resume_ids)
+        return np.fromiter((row for row in rows if row is not None), dtype=np.intp)
+
+    async def refresh(self, db, force: bool = False) -> None:
+        """Loads resumes changed since the last refresh; at most every 30 s."""
+        if not force and time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+            return
+        async with self._refresh_lock:
+            if not force and time.monotonic() - self._refreshed_at < REFRESH_SECONDS:
+                return
+            conn, cur = db
+            changed_resumes_query = """
+            SELECT
+                id,
+                normalized_skills,
+                yoe,
+                updated_at,
+                archived_at IS NULL
+                    AND applicant_status IS DISTINCT FROM 'archived' AS active
+            FROM
+                resume_detail
+            WHERE
+                %(watermark)s::timestamp IS NULL
+                OR updated_at >= %(watermark)s::timestamp
+                    - make_interval(secs => %(overlap)s)
+            ORDER BY
+                updated_at
+            """
+            await cur.execute(
+                changed_resumes_query,
+                {"watermark": self.watermark, "overlap": REFRESH_OVERLAP_SECONDS},
+            )
+            for number, resume in enumerate(await cur.fetchall(), start=1):
+                if number % REFRESH_YIELD_EVERY == 0:
+                    # the first load is every resume; keep serving meanwhile
+                    await asyncio.sleep(0)
+                self.upsert(
+                    resume["id"],
+                    resume["normalized_skills"],
+                    resume["yoe"],
+                    resume["active"],
+                )
+                if resume["updated_at"] is not None:
+                    self.watermark = resume["updated_at"]
+            if self.used - self._indexed > self.used // POSTINGS_REBUILD_FRACTION:
+                self.build_postings()
+            self._refreshed_at = time.monotonic()
+
+
+candidate_pool = CandidatePool()
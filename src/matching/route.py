@@ -0,0 +1,23 @@
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from src.matching.service import get_matching_candidates
+from src.shared.db import get_connection
+from src.shared.dependency import has_admin_access
+from src.shared.tracing import TracedRoute
+
+route = APIRouter(route_class=TracedRoute)
+# ranks resumes across candidates; there is no recruiter role yet
+ADMIN = [Depends(has_admin_access)]
+
+
+@route.get("/requisitions/{requisition_id}/candidates", dependencies=ADMIN)
+async def matching_candidates_route(
+    requisition_id: UUID,
+    k: int = Query(20, ge=1, le=500),
+    scope: Literal["applied", "all"] = "applied",
+    db=Depends(get_connection),
+):
+    return await get_matching_candidates(str(requisition_id), k, scope, db)
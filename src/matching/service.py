@@ -0,0 +1,93 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from src.shared.tracing import traced
+
+
+@traced()
+async def get_matching_candidates(requisition_id: str, k: int, scope: str, db):
+    """
+    Ranks resumes against a requisition's job description.
+
+    ``scope="applied"`` ranks only the resumes with an interview for the
+    requisition; ``"all"`` ranks every active resume, for sourcing.
+    """
+    # numpy-backed; loaded on the first match rather than at startup
+    from src.matching.engine import candidate_pool, normalize_skill
+
+    conn, cur = db
+    get_job_query = """
+    SELECT
+        jd.must_have_skills,
+        jd.nice_to_have_skills,
+        jd.min_yoe,
+        jd.max_yoe
+    FROM
+        job_requisition jr
+        JOIN job_description jd ON jd.id = jr.job_description_id
+    WHERE
+        jr.id = %(requisition_id)s
+    """
+    await cur.execute(get_job_query, {"requisition_id": requisition_id})
+    job = await cur.fetchone()
+    if not job:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"message": "Job requisition not found"},
+        )
+
+    await candidate_pool.refresh(db)
+    rows = None
+    if scope == "applied":
+        get_applicants_query = """
+        SELECT DISTINCT
+            resume_detail_id
+        FROM
+            candidate_interview_question_session
+        WHERE
+            job_requisition_id = %(requisition_id)s
+            AND resume_detail_id IS NOT NULL
+        """
+        await cur.execute(get_applicants_query, {"requisition_id": requisition_id})
+        rows = candidate_pool.rows_for(
+            row["resume_detail_id"] for row in await cur.fetchall()
+        )
+
+    must_have = job["must_have_skills"] or []
+    nice_to_have = job["nice_to_have_skills"] or []
+    matches, scored = candidate_pool.top_k(
+        k, must_have, nice_to_have, job["min_yoe"], job["max_yoe"], rows=rows
+    )
+
+    required = list(dict.fromkeys(filter(None, map(normalize_skill, must_have))))
+    # details only for the handful returned, not for everything scored
+    get_names_query = """
+    SELECT
+        id,
+        name
+    FROM
+        resume_detail
+    WHERE
+        id = ANY(%(ids)s::uuid[])
+    """
+    await cur.execute(
+        get_names_query, {"ids": [match["resume_detail_id"] for match in matches]}
+    )
+    names = {str(row["id"]): row["name"] for row in await cur.fetchall()}
+    for match in matches:
+        resume_id = match["resume_detail_id"]
+        matched = candidate_pool.skills_of(resume_id, must_have)
+        match["candidate_name"] = names.get(resume_id)
+        match["matched_must_have"] = matched
+        match["missing_must_have"] = [
+            skill for skill in required if skill not in matched
+        ]
+        match["matched_nice_to_have"] = candidate_pool.skills_of(
+            resume_id, nice_to_have
+        )
+    return {
+        "job_requisition_id": requisition_id,
+        "scope": scope,
+        "candidates_scored": scored,
+        "results": matches,
+    }
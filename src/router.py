@@ -1,7 +1,10 @@
 from fastapi import APIRouter
 
+from src.admin.route import route as admin_route
 from src.auth.route import route as auth_route
 from src.interview.route import route as interview_route
+from src.matching.route import route as matching_route
+from src.search.route import route as search_route
 from src.user.route import route as user_route
 
 router = APIRouter()
@@ -9,3 +12,6 @@ router = APIRouter()
 router.include_router(auth_route, prefix="/auth")
 router.include_router(interview_route, prefix="/interview")
 router.include_router(user_route, prefix="/user")
+router.include_router(admin_route, prefix="/admin")
+router.include_router(search_route, prefix="/search")
+router.include_router(matching_route, prefix="/matching")
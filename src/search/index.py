@@ -0,0 +1,483 @@
+import hashlib
+import json
+import re
+from collections import defaultdict
+
+from src.interview.archive import unpack
+from src.interview.transcript_codec import load_transcript
+from src.shared.batch import BatchWriter
+from src.shared.notify import listener
+
+SEARCH_REINDEX_CHANNEL = "search_reindex"
+SOURCES = ("transcript", "resume")
+
+# serialises index flushes across workers; postings and term counts are
+# hot rows that concurrent flushes would otherwise deadlock on
+SEARCH_INDEX_LOCK = 0x5EA2C4
+# positions skipped between turns so phrases never match across two turns
+TURN_POSITION_GAP = 100
+MAX_TERM_LENGTH = 40
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from had has have he her his i if in is "
+    "it its me my of on or our she so that the their them they this to was we "
+    "were what will with you your".split()
+)
+
+
+def _stem(token: str) -> str:
+    # plural folding only; enough for "days"/"day", "services"/"service"
+    if (
+        len(token) > 3
+        and token.endswith("s")
+        and not token.endswith(("ss", "us", "is"))
+    ):
+        return token[:-1]
+    return token
+
+
+def analyze(text: str) -> tuple[list[tuple[int, str]], int]:
+    """
+    Splits text into ``(position, term)`` pairs.
+
+    Stopwords are dropped but still take up a position, so phrase offsets
+    stay right. Returns the pairs and the number of positions used.
+    """
+    terms = []
+    position = -1
+    for position, token in enumerate(TOKEN_PATTERN.findall(text.lower())):
+        if token not in STOPWORDS and len(token) <= MAX_TERM_LENGTH:
+            terms.append((position, _stem(token)))
+    return terms, position + 1
+
+
+def _postings(segments: list[str]) -> tuple[dict, int, int]:
+    """
+    Term positions of consecutive text segments (turns), counted from 0.
+    Returns them with the indexed length and the positions spanned.
+    """
+    positions = defaultdict(list)
+    length = 0
+    offset = 0
+    for segment in segments:
+        terms, span = analyze(segment)
+        for position, term in terms:
+            positions[term].append(offset + position)
+        length += len(terms)
+        offset += span + TURN_POSITION_GAP
+    return positions, length, offset
+
+
+def _content_hash(segments: list[str]) -> str:
+    return hashlib.md5("\x1e".join(segments).encode()).hexdigest()
+
+
+async def _stored_answers(row: dict, db) -> list:
+    """The candidate's answers of a compacted or archived transcript."""
+    transcript = None
+    if row["payload"] is not None:
+        transcript = unpack(row["payload"]).get("transcript")
+    if transcript is None:
+        transcript = await load_transcript(
+            {"transcript": None, "transcript_blob": row["transcript_blob"]}, db
+        )
+    if not isinstance(transcript, list):
+        return []
+    return [turn.get("user") for turn in transcript if isinstance(turn, dict)]
+
+
+class SearchIndexer(BatchWriter):
+    """
+    Maintains the BM25 inverted index (``search_document``,
+    ``search_posting``, ``search_term``, ``search_corpus_stats``).
+
+    Items are ``("append", source, source_id, turn_index, text)`` for a new
+    transcript turn, indexed after the turns already there, and
+    ``("rebuild", source, source_id)`` to re-read a transcript or resume
+    from where it is stored, e.g. after a resume changed. Each flush applies
+    the whole batch in a few set-based statements.
+
+    Appends are buffered per worker while rebuilds are broadcast, so a
+    rebuild can read a turn before its append is flushed. A rebuild records
+    how many turns it read (``rebuilt_turns``) and appends of those turns
+    are dropped, so no turn is counted twice.
+    """
+
+    async def write(self, cur, items: list) -> None:
+        await cur.execute("SELECT pg_advisory_xact_lock(%s)", (SEARCH_INDEX_LOCK,))
+
+        rebuild = {(item[1], str(item[2])) for item in items if item[0] == "rebuild"}
+        appends = defaultdict(list)
+        for item in items:
+            key = (item[1], str(item[2]))
+            # a rebuild re-reads everything, including the appended turns
+            if item[0] == "append" and key not in rebuild:
+                appends[key].append((item[3], item[4]))
+
+        documents = {}
+        if appends:
+            rebuilt_turns = await self._rebuilt_turns(cur, list(appends))
+            for key, turns in appends.items():
+                segments = [
+                    text
+                    for turn_index, text in sorted(turns)
+                    if turn_index >= rebuilt_turns.get(key, 0)
+                ]
+                if segments:
+                    documents[key] = (segments, None, 0)
+        if rebuild:
+            documents.update(await self._rebuild_documents(cur, rebuild))
+        if documents:
+            await self._index(cur, documents)
+
+    async def _rebuilt_turns(self, cur, keys: list) -> dict:
+        """How many leading turns of each document its last rebuild read."""
+        get_rebuilt_turns_query = """
+        SELECT
+            source,
+            source_id,
+            rebuilt_turns
+        FROM
+            search_document
+        WHERE
+            (source, source_id) IN (
+                SELECT * FROM unnest(%(sources)s::text[], %(source_ids)s::uuid[])
+            )
+        """
+        await cur.execute(
+            get_rebuilt_turns_query,
+            {
+                "sources": [source for source, _ in keys],
+                "source_ids": [source_id for _, source_id in keys],
+            },
+        )
+        return {
+            (row["source"], str(row["source_id"])): row["rebuilt_turns"]
+            for row in await cur.fetchall()
+        }
+
+    async def _rebuild_documents(self, cur, keys: set) -> dict:
+        """Reads the current text of ``keys``; removes the stale ones from the index."""
+        by_source = defaultdict(list)
+        for source, source_id in keys:
+            by_source[source].append(source_id)
+
+        texts = {}
+        if by_source["transcript"]:
+            # closed interviews keep their transcript in transcript_blob, and
+            # archived ones in interview_session_archive
+            get_transcripts_query = """
+            SELECT
+                ciqs.id,
+                jsonb_path_query_array(ciqs.transcript, '$[*].user') AS segments,
+                jsonb_array_length(ciqs.transcript) AS turns,
+                COALESCE(ciqs.transcript_blob, a.transcript_blob) AS transcript_blob,
+                a.payload
+            FROM
+                candidate_interview_question_session ciqs
+            LEFT JOIN
+                interview_session_archive a
+                ON ciqs.archived_at IS NOT NULL AND a.interview_session_id = ciqs.id
+            WHERE
+                ciqs.id = ANY(%(ids)s::uuid[])
+            """
+            await cur.execute(get_transcripts_query, {"ids": by_source["transcript"]})
+            for row in await cur.fetchall():
+                segments, turns = row["segments"], row["turns"]
+                if segments is None:
+                    segments = await _stored_answers(row, (None, cur))
+                    turns = len(segments)
+                texts[("transcript", str(row["id"]))] = (
+                    [text for text in segments if isinstance(text, str)],
+                    turns,
+                )
+        if by_source["resume"]:
+            get_resumes_query = """
+            SELECT
+                id,
+                cf_text
+            FROM
+                resume_detail
+            WHERE
+                id = ANY(%(ids)s::uuid[])
+            """
+            await cur.execute(get_resumes_query, {"ids": by_source["resume"]})
+            for row in await cur.fetchall():
+                texts[("resume", str(row["id"]))] = ([row["cf_text"] or ""], 1)
+
+        get_hashes_query = """
+        SELECT
+            source,
+            source_id,
+            content_hash
+        FROM
+            search_document
+        WHERE
+            (source, source_id) IN (
+                SELECT * FROM unnest(%(sources)s::text[], %(source_ids)s::uuid[])
+            )
+        """
+        await cur.execute(
+            get_hashes_query,
+            {
+                "sources": [source for source, _ in keys],
+                "source_ids": [source_id for _, source_id in keys],
+            },
+        )
+        indexed = {
+            (row["source"], str(row["source_id"])): row["content_hash"]
+            for row in await cur.fetchall()
+        }
+
+        documents = {}
+        stale = []
+        for key in keys:
+            segments, turns = texts.get(key, (None, 0))
+            content_hash = _content_hash(segments) if segments is not None else None
+            if key in indexed and indexed[key] == content_hash:
+                continue  # every worker gets the NOTIFY; only the first rebuilds
+            if key in indexed:
+                stale.append(key)
+            if segments is not None:
+                documents[key] = (segments, content_hash, turns)
+        if stale:
+            await self._remove(cur, stale)
+        return documents
+
+    async def _remove(self, cur, keys: list) -> None:
+        remove_documents_query = """
+        WITH removed AS (
+            DELETE FROM search_document
+            WHERE (source, source_id) IN (
+                SELECT * FROM unnest(%(sources)s::text[], %(source_ids)s::uuid[])
+            )
+            RETURNING id, source, length
+        ),
+        corpus AS (
+            UPDATE search_corpus_stats s
+            SET
+                document_count = s.document_count - r.documents,
+                total_length = s.total_length - r.total_length
+            FROM (
+                SELECT source, COUNT(*) AS documents, SUM(length) AS total_length
+                FROM removed
+                GROUP BY source
+            ) r
+            WHERE s.source = r.source
+        ),
+        postings AS (
+            DELETE FROM search_posting p
+            USING removed r
+            WHERE p.document_id = r.id
+            RETURNING r.source, p.term
+        )
+        UPDATE search_term t
+        SET document_frequency = t.document_frequency - c.documents
+        FROM (
+            SELECT source, term, COUNT(*) AS documents
+            FROM postings
+            GROUP BY source, term
+        ) c
+        WHERE t.source = c.source AND t.term = c.term
+        """
+        await cur.execute(
+            remove_documents_query,
+            {
+                "sources": [source for source, _ in keys],
+                "source_ids": [source_id for _, source_id in keys],
+            },
+        )
+
+    async def _index(self, cur, documents: dict) -> None:
+        keys = sorted(documents)
+        analyzed = {key: _postings(documents[key][0]) for key in keys}
+
+        upsert_documents_query = """
+        INSERT INTO
+            search_document
+        (source, source_id, length, next_position, content_hash, rebuilt_turns)
+        SELECT
+            *
+        FROM
+            unnest(
+                %(sources)s::text[],
+                %(source_ids)s::uuid[],
+                %(lengths)s::int[],
+                %(spans)s::int[],
+                %(content_hashes)s::text[],
+                %(rebuilt_turns)s::int[]
+            )
+        ON CONFLICT (source, source_id) DO UPDATE
+        SET
+            length = search_document.length + EXCLUDED.length,
+            next_position = search_document.next_position + EXCLUDED.next_position,
+            content_hash = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        RETURNING id, source, source_id, next_position, (xmax = 0) AS inserted
+        """
+        await cur.execute(
+            upsert_documents_query,
+            {
+                "sources": [source for source, _ in keys],
+                "source_ids": [source_id for _, source_id in keys],
+                "lengths": [analyzed[key][1] for key in keys],
+                "spans": [analyzed[key][2] for key in keys],
+                "content_hashes": [documents[key][1] for key in keys],
+                "rebuilt_turns": [documents[key][2] for key in keys],
+            },
+        )
+        upserted = {
+            (row["source"], str(row["source_id"])): row for row in await cur.fetchall()
+        }
+
+        terms, document_ids, frequencies, positions = [], [], [], []
+        corpus = defaultdict(lambda: [0, 0])
+        for key in keys:
+            row = upserted[key]
+            term_positions, length, span = analyzed[key]
+            # appended turns continue after the positions already indexed
+            base = row["next_position"] - span
+            for term in sorted(term_positions):
+                term_list = term_positions[term]
+                terms.append(term)
+                document_ids.append(row["id"])
+                frequencies.append(len(term_list))
+                positions.append("{" + ",".join(str(base + p) for p in term_list) + "}")
+            corpus[key[0]][0] += row["inserted"]
+            corpus[key[0]][1] += length
+
+        upsert_postings_query = """
+        WITH upserted AS (
+            INSERT INTO
+                search_posting
+            (term, document_id, term_frequency, positions)
+            SELECT
+                term, document_id, term_frequency, positions::int[]
+            FROM
+                unnest(
+                    %(terms)s::text[],
+                    %(document_ids)s::bigint[],
+                    %(frequencies)s::int[],
+                    %(positions)s::text[]
+                ) AS u(term, document_id, term_frequency, positions)
+            ON CONFLICT (term, document_id) DO UPDATE
+            SET
+                term_frequency = search_posting.term_frequency
+                    + EXCLUDED.term_frequency,
+                positions = search_posting.positions || EXCLUDED.positions
+            RETURNING term, document_id, (xmax = 0) AS inserted
+        )
+        INSERT INTO
+            search_term
+        (source, term, document_frequency)
+        SELECT
+            d.source, u.term, COUNT(*)
+        FROM
+            upserted u
+            JOIN search_document d ON d.id = u.document_id
+        WHERE
+            u.inserted
+        GROUP BY
+            d.source, u.term
+        ON CONFLICT (source, term) DO UPDATE
+        SET
+            document_frequency = search_term.document_frequency
+                + EXCLUDED.document_frequency
+        """
+        if terms:
+            await cur.execute(
+                upsert_postings_query,
+                {
+                    "terms": terms,
+                    "document_ids": document_ids,
+                    "frequencies": frequencies,
+                    "positions": positions,
+                },
+            )
+
+        update_corpus_query = """
+        INSERT INTO
+            search_corpus_stats
+        (source, document_count, total_length)
+        VALUES
+            (%(source)s, %(documents)s, %(total_length)s)
+        ON CONFLICT (source) DO UPDATE
+        SET
+            document_count = search_corpus_stats.document_count
+                + EXCLUDED.document_count,
+            total_length = search_corpus_stats.total_length + EXCLUDED.total_length
+        """
+        await cur.executemany(
+            update_corpus_query,
+            [
+                {"source": source, "documents": documents, "total_length": length}
+                for source, (documents, length) in corpus.items()
+            ],
+        )
+
+
+search_indexer = SearchIndexer(flush_interval=5.0, max_batch=2000)
+
+
+def index_turn(interview_id: str, turn_index: int, user_text: str) -> None:
+    """
+    Queues the candidate's answer of transcript turn ``turn_index`` for
+    indexing; never blocks the caller.
+    """
+    if user_text:
+        search_indexer.add(
+            ("append", "transcript", interview_id, turn_index, user_text)
+        )
+
+
+def reindex(source: str, source_id) -> None:
+    """Queues a transcript or resume to be re-read and re-indexed."""
+    search_indexer.add(("rebuild", source, str(source_id)))
+
+
+def _on_reindex(payload: str | None) -> None:
+    # notifications missed while disconnected are caught up by the backfill
+    if payload is not None:
+        event = json.loads(payload)
+        reindex(event["source"], event["id"])
+
+
+listener.register(SEARCH_REINDEX_CHANNEL, _on_reindex)
+
+
+async def backfill_search_index(limit: int, db) -> dict:
+    """Queues up to ``limit`` unindexed transcripts and resumes per source."""
+    conn, cur = db
+    unindexed_queries = {
+        "transcript": """
+        SELECT ciqs.id
+        FROM candidate_interview_question_session ciqs
+        LEFT JOIN search_document d
+            ON d.source = 'transcript' AND d.source_id = ciqs.id
+        WHERE
+            (
+                ciqs.transcript IS NOT NULL
+                OR ciqs.transcript_blob IS NOT NULL
+                OR ciqs.archived_at IS NOT NULL
+            )
+            AND d.id IS NULL
+        LIMIT %(limit)s
+        """,
+        "resume": """
+        SELECT rd.id
+        FROM resume_detail rd
+        LEFT JOIN search_document d
+            ON d.source = 'resume' AND d.source_id = rd.id
+        WHERE rd.cf_text IS NOT NULL AND d.id IS NULL
+        LIMIT %(limit)s
+        """,
+    }
+    queued = {}
+    for source, query in unindexed_queries.items():
+        await cur.execute(query, {"limit": limit})
+        rows = await cur.fetchall()
+        for row in rows:
+            reindex(source, row["id"])
+        queued[source] = len(rows)
+    return queued
@@ -0,0 +1,29 @@
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from src.search.service import search
+from src.shared.db import get_connection
+from src.shared.dependency import has_admin_access
+from src.shared.tracing import TracedRoute
+
+route = APIRouter(route_class=TracedRoute)
+# transcripts span every candidate; there is no recruiter role yet
+ADMIN = [Depends(has_admin_access)]
+
+
+@route.get("/", dependencies=ADMIN)
+async def search_route(
+    q: str,
+    source: Literal["transcript", "resume"] = "transcript",
+    requisition_id: UUID | None = None,
+    status: str | None = None,
+    match: Literal["all", "any"] = "all",
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db=Depends(get_connection),
+):
+    return await search(
+        q, source, requisition_id, status, match == "all", limit, offset, db
+    )
@@ -0,0 +1,201 @@
+import re
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from src.search.index import analyze
+from src.shared.tracing import traced
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_QUERY_TERMS = 16
+PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+
+
+def parse_query(query: str) -> tuple[list[str], list[list[tuple[int, str]]]]:
+    """
+    Splits a query into its distinct terms and its quoted phrases.
+
+    ``kubernetes "30-day notice"`` gives the terms ``kubernetes``, ``30``,
+    ``day`` and ``notice`` and one phrase, ``[(0, "30"), (1, "day"),
+    (2, "notice")]``, whose offsets must line up in a matching document.
+    """
+    phrases = []
+    for text in PHRASE_PATTERN.findall(query):
+        terms, _ = analyze(text)
+        if len(terms) > 1:
+            start = terms[0][0]
+            phrases.append([(position - start, term) for position, term in terms])
+    loose, _ = analyze(PHRASE_PATTERN.sub(" ", query))
+    terms = [term for _, term in loose]
+    terms += [term for phrase in phrases for _, term in phrase]
+    return list(dict.fromkeys(terms)), phrases
+
+
+def _phrase_condition(phrase: list[tuple[int, str]], number: int, params: dict) -> str:
+    """An EXISTS clause matching ``phrase`` at consecutive positions in ``d``."""
+    (_, first), rest = phrase[0], phrase[1:]
+    params[f"phrase_{number}_0"] = first
+    followers = []
+    for index, (offset, term) in enumerate(rest, start=1):
+        params[f"phrase_{number}_{index}"] = term
+        params[f"phrase_{number}_{index}_offset"] = offset
+        followers.append(
+            f"""
+            AND EXISTS (
+                SELECT 1 FROM search_posting p{index}
+                WHERE p{index}.term = %(phrase_{number}_{index})s
+                    AND p{index}.document_id = d.id
+                    AND anchor.position + %(phrase_{number}_{index}_offset)s
+                        = ANY(p{index}.positions)
+            )"""
+        )
+    return f"""
+    AND EXISTS (
+        SELECT 1
+        FROM search_posting p0, unnest(p0.positions) AS anchor(position)
+        WHERE p0.term = %(phrase_{number}_0)s AND p0.document_id = d.id
+        {"".join(followers)}
+    )"""
+
+
+@traced()
+async def search(
+    query: str,
+    source: str,
+    requisition_id: str | None,
+    interview_status: str | None,
+    match_all: bool,
+    limit: int,
+    offset: int,
+    db,
+):
+    """
+    Ranks transcripts or resumes against ``query`` with BM25.
+
+    With ``match_all`` every term must occur; quoted phrases must always
+    occur verbatim. Requisition and status filters apply to the interview
+    (for resumes: to any interview of that resume).
+    """
+    conn, cur = db
+    terms, phrases = parse_query(query)
+    if not terms:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": "Query has no searchable terms"},
+        )
+    if len(terms) > MAX_QUERY_TERMS:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={"message": f"Query is limited to {MAX_QUERY_TERMS} terms"},
+        )
+
+    params = {
+        "source": source,
+        "terms": terms,
+        "required_terms": len(terms) if match_all else 1,
+        "k1": BM25_K1,
+        "b": BM25_B,
+        "requisition_id": requisition_id,
+        "status": interview_status,
+        "limit": limit,
+        "offset": offset,
+    }
+    phrase_conditions = "".join(
+        _phrase_condition(phrase, number, params)
+        for number, phrase in enumerate(phrases)
+    )
+    if source == "transcript":
+        result_columns = """
+        ciqs.id AS interview_id,
+        ciqs.resume_detail_id,
+        ciqs.job_requisition_id,
+        ciqs.status,
+        rd.name AS candidate_name
+        """
+        joins = """
+        JOIN candidate_interview_question_session ciqs ON ciqs.id = d.source_id
+        LEFT JOIN resume_detail rd ON rd.id = ciqs.resume_detail_id
+        """
+        filters = """
+        AND (%(requisition_id)s::uuid IS NULL
+             OR ciqs.job_requisition_id = %(requisition_id)s::uuid)
+        AND (%(status)s::text IS NULL OR ciqs.status = %(status)s::text)
+        """
+    else:
+        result_columns = """
+        rd.id AS resume_detail_id,
+        rd.name AS candidate_name
+        """
+        joins = """
+        JOIN resume_detail rd ON rd.id = d.source_id
+        """
+        filters = """
+        AND (
+            (%(requisition_id)s::uuid IS NULL AND %(status)s::text IS NULL)
+            OR EXISTS (
+                SELECT 1 FROM candidate_interview_question_session ciqs
+                WHERE ciqs.resume_detail_id = rd.id
+                    AND (%(requisition_id)s::uuid IS NULL
+                         OR ciqs.job_requisition_id = %(requisition_id)s::uuid)
+                    AND (%(status)s::text IS NULL OR ciqs.status = %(status)s::text)
+            )
+        )
+        """
+
+    search_query = f"""
+    WITH corpus AS (
+        SELECT
+            document_count::float8 AS documents,
+            total_length::float8 / GREATEST(document_count, 1) AS average_length
+        FROM
+            search_corpus_stats
+        WHERE
+            source = %(source)s
+    ),
+    query_terms AS (
+        SELECT
+            t.term,
+            ln(1 + (c.documents - t.document_frequency + 0.5)
+                / (t.document_frequency + 0.5)) AS idf
+        FROM
+            search_term t, corpus c
+        WHERE
+            t.source = %(source)s AND t.term = ANY(%(terms)s::text[])
+    ),
+    scored AS (
+        SELECT
+            p.document_id,
+            SUM(
+                q.idf * p.term_frequency * (%(k1)s + 1)
+                / (p.term_frequency + %(k1)s
+                   * (1 - %(b)s + %(b)s * d.length / c.average_length))
+            ) AS score
+        FROM
+            query_terms q
+            JOIN search_posting p ON p.term = q.term
+            JOIN search_document d ON d.id = p.document_id AND d.source = %(source)s
+            CROSS JOIN corpus c
+        GROUP BY
+            p.document_id
+        HAVING
+            COUNT(*) >= %(required_terms)s
+    )
+    SELECT
+        {result_columns},
+        s.score
+    FROM
+        scored s
+        JOIN search_document d ON d.id = s.document_id
+        {joins}
+    WHERE
+        TRUE
+        {filters}
+        {phrase_conditions}
+    ORDER BY
+        s.score DESC, d.id
+    LIMIT %(limit)s
+    OFFSET %(offset)s
+    """
+    await cur.execute(search_query, params)
+    return {"query": query, "terms": terms, "results": await cur.fetchall()}
@@ -0,0 +1,229 @@
+"""
+Production entry point: a pre-forking supervisor running N uvicorn workers.
+
+The supervisor binds the listening socket, imports the app (configuration,
+prompts, routers) and the LLM client libraries once, then forks the workers
+so they share those pages copy-on-write and start serving immediately. Each
+worker's DB pool size is derived from ``DB_CONNECTION_BUDGET`` (see
+``src.shared.config``) so N workers, plus the replacement a rolling restart
+runs alongside them, never exceed what Postgres allows.
+
+Signals:
+    SIGHUP   rolling restart: one worker at a time, start a replacement,
+             wait until it serves, then drain and stop the old one.
+    SIGTERM  graceful shutdown: workers stop accepting, finish in-flight
+             requests (up to ``--graceful-timeout``) and run their lifespan
+             shutdown (flushing ledger rows and spans).
+
+Workers that die unexpectedly are replaced. Code changes need a full
+restart of the supervisor since workers are forked from the preloaded app.
+
+Usage:
+    python -m src.serve --workers 4 --port 8000 --db-connection-budget 90
+"""
+
+import argparse
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import time
+
+import uvicorn
+
+logger = logging.getLogger("uvicorn.error")
+
+READY_TIMEOUT_SECONDS = 30.0
+
+
+class _WorkerServer(uvicorn.Server):
+    """Reports readiness to the supervisor once the lifespan has started."""
+
+    def __init__(self, config: uvicorn.Config, ready_fd: int):
+        super().__init__(config)
+        self.ready_fd = ready_fd
+
+    async def startup(self, sockets=None) -> None:
+        await super().startup(sockets=sockets)
+        os.write(self.ready_fd, b"1")
+        os.close(self.ready_fd)
+
+
+class Supervisor:
+    def __init__(
+        self, config: uvicorn.Config, sock: socket.socket, workers: int
+    ) -> None:
+        self.config = config
+        self.sock = sock
+        self.worker_count = workers
+        self.workers: set[int] = set()
+        self.pending_signals: list[int] = []
+
+    def spawn(self) -> int | None:
+        """Forks a worker and returns its pid once it is serving."""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            self._run_worker(write_fd)
+
+        os.close(write_fd)
+        try:
+            ready, _, _ = select.select([read_fd], [], [], READY_TIMEOUT_SECONDS)
+            started = bool(ready) and os.read(read_fd, 1) == b"1"
+        finally:
+            os.close(read_fd)
+
+        if not started:
+            logger.error("Worker [%d] failed to start", pid)
+            self._stop_worker(pid)
+            return None
+        self.workers.add(pid)
+        return pid
+
+    def _run_worker(self, ready_fd: int) -> None:
+        # uvicorn installs its own SIGTERM/SIGINT handlers while serving and
+        # re-raises captured signals afterwards; ignoring them outside that
+        # window keeps the inherited supervisor handlers from ever running here
+        for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_IGN)
+        code = 0
+        try:
+            _WorkerServer(self.config, ready_fd).run(sockets=[self.sock])
+        except BaseException:
+            logger.exception("Worker [%d] crashed", os.getpid())
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _stop_worker(self, pid: int) -> None:
+        """Sends SIGTERM and waits for the worker to drain, then kills it."""
+        self.workers.discard(pid)
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        self._wait({pid}, time.monotonic() + self.config.timeout_graceful_shutdown + 5)
+
+    def _wait(self, pids: set[int], deadline: float) -> None:
+        pids = set(pids)
+        while pids and time.monotonic() < deadline:
+            for pid in list(pids):
+                if os.waitpid(pid, os.WNOHANG)[0]:
+                    pids.discard(pid)
+            time.sleep(0.05)
+        for pid in pids:
+            logger.warning("Worker [%d] did not drain in time, killing", pid)
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+
+    def rolling_restart(self) -> None:
+        logger.info("Rolling restart of %d workers", len(self.workers))
+        for old in list(self.workers):
+            if self.spawn() is None:
+                logger.error("Rolling restart aborted, keeping remaining workers")
+                return
+            self._stop_worker(old)
+
+    def shutdown(self) -> None:
+        logger.info("Shutting down %d workers", len(self.workers))
+        for pid in self.workers:
+            os.kill(pid, signal.SIGTERM)
+        self._wait(
+            self.workers, time.monotonic() + self.config.timeout_graceful_shutdown + 5
+        )
+        self.workers.clear()
+
+    def _reap(self) -> None:
+        """Replaces workers that exited without being asked to."""
+        for pid in list(self.workers):
+            done, status = os.waitpid(pid, os.WNOHANG)
+            if not done:
+                continue
+            self.workers.discard(pid)
+            logger.error(
+                "Worker [%d] exited with %s, replacing it",
+                pid,
+                os.waitstatus_to_exitcode(status),
+            )
+            self.spawn()
+
+    def run(self) -> None:
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda signum, _: self.pending_signals.append(signum))
+
+        for _ in range(self.worker_count):
+            self.spawn()
+        logger.info(
+            "Supervisor [%d] serving with %d workers", os.getpid(), len(self.workers)
+        )
+
+        while True:
+            while self.pending_signals:
+                if self.pending_signals.pop(0) == signal.SIGHUP:
+                    self.rolling_restart()
+                else:
+                    self.shutdown()
+                    return
+            self._reap()
+            time.sleep(0.2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--db-connection-budget",
+        type=int,
+        help="Postgres connections all workers may use together "
+        "(default: DB_CONNECTION_BUDGET)",
+    )
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    # must be in the environment before src.shared.config is first imported
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+    if args.db_connection_budget:
+        os.environ["DB_CONNECTION_BUDGET"] = str(args.db_connection_budget)
+
+    # preload everything workers need; forked children share it copy-on-write
+    import httpx  # noqa: F401
+    import numpy  # noqa: F401
+    import openai  # noqa: F401
+
+    from src.main import app
+    from src.shared.config import settings
+
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+    )
+    logger.info(
+        "DB pool: %d connections per worker x %d workers (budget %s)",
+        settings.db_pool_max_size,
+        args.workers,
+        settings.db_connection_budget or "unset",
+    )
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    # keep preloaded objects out of the collector so refcount/GC passes in the
+    # workers don't dirty the shared pages
+    gc.freeze()
+    Supervisor(config, sock, args.workers).run()
+
+
+if __name__ == "__main__":
+    main()
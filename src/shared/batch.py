@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from uuid import uuid4
+
+from psycopg.rows import dict_row
+
+from src.shared.config import settings
+from src.shared.db import pool
+from src.shared.notify import listener
+
+logger = logging.getLogger(__name__)
+
+FLUSH_CHANNEL = "batch_flush"
+FLUSHED_CHANNEL = "batch_flushed"
+FLUSH_TIMEOUT_SECONDS = 3.0
+
+
+class BatchWriter:
+    """
+    Buffers rows in memory and writes them to Postgres in bulk from a
+    background task, so request handlers never wait on the write.
+
+    Subclasses implement ``write`` (and may override ``add`` to coalesce
+    items). The writer is started and stopped from the application lifespan;
+    ``stop`` performs a final flush.
+
+    Args:
+        flush_interval: Seconds between background flushes.
+        max_batch: Buffer size that triggers an early flush.
+    """
+
+    def __init__(self, flush_interval: float = 2.0, max_batch: int = 500):
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._buffer: list = []
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def add(self, item) -> None:
+        self._buffer.append(item)
+        if len(self._buffer) >= self.max_batch:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        _running.append(self)
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+            _running.remove(self)
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("%s flush failed", type(self).__name__)
+
+    def _take(self) -> list:
+        items, self._buffer = self._buffer, []
+        return items
+
+    def _restore(self, items: list) -> None:
+        # keep failed items for the next flush, bounded so an outage can't
+        # grow the buffer without limit
+        self._buffer[:0] = items[-self.max_batch * 10 :]
+
+    async def flush(self) -> None:
+        async with self._lock:
+            items = self._take()
+            if not items:
+                return
+            try:
+                async with pool.connection() as conn:
+                    conn.row_factory = dict_row
+                    async with conn.cursor() as cur:
+                        await self.write(cur, items)
+            except BaseException:
+                self._restore(items)
+                raise
+
+    async def write(self, cur, items: list) -> None:
+        raise NotImplementedError
+
+
+# started writers of this worker, flushed together by flush_all_workers
+_running: list[BatchWriter] = []
+# flush token -> (workers yet to acknowledge, set once all have)
+_pending: dict[str, list] = {}
+_flush_tasks: set[asyncio.Task] = set()
+
+
+async def _flush_running() -> None:
+    for writer in list(_running):
+        try:
+            await writer.flush()
+        except Exception:
+            logger.exception("%s flush failed", type(writer).__name__)
+
+
+async def _notify(channel: str, payload: str) -> None:
+    async with pool.connection() as conn:
+        await conn.execute("SELECT pg_notify(%s, %s)", (channel, payload))
+
+
+async def _flush_and_acknowledge(token: str) -> None:
+    await _flush_running()
+    await _notify(FLUSHED_CHANNEL, token)
+
+
+def _on_flush_requested(token: str | None) -> None:
+    if token is None:
+        # reconnected: the request, if any, has timed out already
+        return
+    task = asyncio.create_task(_flush_and_acknowledge(token))
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+def _on_flushed(token: str | None) -> None:
+    if waiter := _pending.get(token):
+        waiter[0] -= 1
+        if waiter[0] <= 0:
+            waiter[1].set()
+
+
+async def flush_all_workers(timeout: float = FLUSH_TIMEOUT_SECONDS) -> bool:
+    """
+    Flushes the running writers of every worker, not just this one.
+
+    Rows are buffered by whichever worker received them, which under
+    several workers is rarely the one closing the interview. A ``NOTIFY``
+    asks every worker to flush and acknowledge; this waits for
+    ``WEB_CONCURRENCY`` acknowledgements, at most ``timeout`` seconds.
+
+    Returns:
+        bool: False if not every worker acknowledged in time; this worker's
+        own writers are flushed regardless, and the others' background
+        flushes still write their rows within one interval.
+    """
+    token = uuid4().hex
+    done = asyncio.Event()
+    _pending[token] = [settings.web_concurrency, done]
+    try:
+        await _notify(FLUSH_CHANNEL, token)
+        async with asyncio.timeout(timeout):
+            await done.wait()
+        return True
+    except TimeoutError:
+        logger.warning("not every worker flushed within %.1f s", timeout)
+    except Exception:
+        logger.exception("could not ask the workers to flush")
+    finally:
+        del _pending[token]
+    await _flush_running()
+    return False
+
+
+listener.register(FLUSH_CHANNEL, _on_flush_requested)
+listener.register(FLUSHED_CHANNEL, _on_flushed)
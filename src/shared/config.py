@@ -0,0 +1,154 @@
+import os
+from dataclasses import dataclass
+
+from dotenv import load_dotenv
+
+# connections a worker holds outside its pool (slow-query explainer and
+# LISTEN connection)
+WORKER_SIDE_CONNECTIONS = 2
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    return os.getenv(name, str(default)).lower() == "true"
+
+
+def _db_pool_max_size(web_concurrency: int) -> int:
+    """
+    Explicit ``DB_POOL_MAX_SIZE`` wins. Otherwise, when a Postgres
+    ``DB_CONNECTION_BUDGET`` is given, it is split evenly across
+    ``WEB_CONCURRENCY + 1`` workers after reserving each worker's side
+    connections: a rolling restart (``src.serve``) starts each replacement
+    before stopping the worker it replaces, so one extra worker runs at a
+    time.
+    """
+    if explicit := os.getenv("DB_POOL_MAX_SIZE"):
+        return int(explicit)
+    budget = int(os.getenv("DB_CONNECTION_BUDGET", "0"))
+    if not budget:
+        return 10
+    return max(2, budget // (web_concurrency + 1) - WORKER_SIDE_CONNECTIONS)
+
+
+def _env_first(*names: str, default: str = "") -> str:
+    """Returns the first of ``names`` that is set and non-empty."""
+    for name in names:
+        if value := os.getenv(name):
+            return value
+    return default
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Process-wide configuration, read from the environment (and ``.env``)
+    exactly once at import time.
+
+    Modules read ``settings.<field>`` instead of calling ``os.getenv`` so
+    every worker parses its configuration a single time and the full set of
+    knobs lives in one place.
+    """
+
+    web_concurrency: int
+
+    database_url: str
+    db_connection_budget: int
+    db_pool_max_size: int
+    slow_query_threshold_ms: float
+    slow_query_explain_sample_rate: float
+
+    jwt_secret: str
+    admin_api_token: str
+
+    azure_openai_realtime_endpoint: str
+    azure_openai_realtime_api_key: str
+    azure_openai_realtime_version: str
+    realtime_relay_enabled: bool
+    azure_openai_realtime_ws_endpoint: str
+    azure_openai_eval_endpoint: str
+    azure_openai_eval_api_key: str
+    azure_openai_eval_version: str
+
+    tracing_enabled: bool
+    trace_sample_ratio: float
+    trace_export_path: str
+    trace_collector_endpoint: str
+
+    profiler_enabled: bool
+    profiler_interval_ms: float
+    profiler_output_dir: str
+
+    storage_backend: str
+    storage_local_root: str
+    storage_public_url: str
+    prescreen_cache_ttl_seconds: float
+    interview_archive_after_days: int
+    transcript_compact_on_close: bool
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        load_dotenv()
+        web_concurrency = int(os.getenv("WEB_CONCURRENCY", "1"))
+        return cls(
+            web_concurrency=web_concurrency,
+            database_url=os.getenv("DATABASE_URL", ""),
+            db_connection_budget=int(os.getenv("DB_CONNECTION_BUDGET", "0")),
+            db_pool_max_size=_db_pool_max_size(web_concurrency),
+            slow_query_threshold_ms=float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500")),
+            slow_query_explain_sample_rate=float(
+                os.getenv("SLOW_QUERY_EXPLAIN_SAMPLE_RATE", "0.1")
+            ),
+            jwt_secret=os.getenv("JWT_SECRET", ""),
+            admin_api_token=os.getenv("ADMIN_API_TOKEN", ""),
+            azure_openai_realtime_endpoint=os.getenv(
+                "AZURE_OPENAI_REALTIME_ENDPOINT", ""
+            ),
+            azure_openai_realtime_api_key=os.getenv(
+                "AZURE_OPENAI_REALTIME_API_KEY", ""
+            ),
+            azure_openai_realtime_version=os.getenv(
+                "AZURE_OPENAI_REALTIME_VERSION", ""
+            ),
+            realtime_relay_enabled=_env_bool("REALTIME_RELAY_ENABLED"),
+            # e.g. wss://<resource>.openai.azure.com/openai/v1/realtime?model=gpt-realtime
+            azure_openai_realtime_ws_endpoint=os.getenv(
+                "AZURE_OPENAI_REALTIME_WS_ENDPOINT", ""
+            ),
+            # GPT-4o evaluation endpoint (separate from realtime endpoint)
+            azure_openai_eval_endpoint=_env_first(
+                "AZURE_OPENAI_EVAL_ENDPOINT", "AZURE_OPENAI_ENDPOINT"
+            )
+            .rstrip("/")
+            .strip("'"),
+            azure_openai_eval_api_key=_env_first(
+                "AZURE_OPENAI_EVAL_API_KEY", "AZURE_OPENAI_API_KEY"
+            ),
+            azure_openai_eval_version=_env_first(
+                "AZURE_OPENAI_EVAL_VERSION",
+                "OPENAI_API_VERSION",
+                default="2024-05-01-preview",
+            ),
+            tracing_enabled=_env_bool("TRACING_ENABLED"),
+            trace_sample_ratio=float(os.getenv("TRACE_SAMPLE_RATIO", "1.0")),
+            trace_export_path=os.getenv("TRACE_EXPORT_PATH", "traces.jsonl"),
+            trace_collector_endpoint=os.getenv("TRACE_COLLECTOR_ENDPOINT", ""),
+            profiler_enabled=_env_bool("PROFILER_ENABLED"),
+            profiler_interval_ms=float(os.getenv("PROFILER_INTERVAL_MS", "5")),
+            # request profiles are written here so any worker can serve them
+            profiler_output_dir=os.getenv("PROFILER_OUTPUT_DIR", "profiles"),
+            storage_backend=os.getenv("STORAGE_BACKEND", "local"),
+            storage_local_root=os.getenv("STORAGE_LOCAL_ROOT", "storage"),
+            # where clients fetch stored objects (e.g. a CDN in front of the
+            # bucket); when empty, API responses carry the bare object key
+            storage_public_url=os.getenv("STORAGE_PUBLIC_URL", "").rstrip("/"),
+            prescreen_cache_ttl_seconds=float(
+                os.getenv("PRESCREEN_CACHE_TTL_SECONDS", "300")
+            ),
+            # 0 disables archival
+            interview_archive_after_days=int(
+                os.getenv("INTERVIEW_ARCHIVE_AFTER_DAYS", "90")
+            ),
+            transcript_compact_on_close=_env_bool("TRANSCRIPT_COMPACT_ON_CLOSE"),
+        )
+
+
+settings = Settings.from_env()
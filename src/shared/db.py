@@ -1,19 +1,202 @@
-import os
+import asyncio
+import json
+import logging
+import random
+import re
+import sys
+import time
+from contextlib import asynccontextmanager
 
-from dotenv import load_dotenv
+import psycopg
 from psycopg.rows import dict_row
 from psycopg_pool import AsyncConnectionPool
 
-load_dotenv()
-DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+from src.shared.config import settings
+from src.shared.tracing import span
+
+logger = logging.getLogger(__name__)
 
 pool = AsyncConnectionPool(
-    conninfo=DATABASE_URL,
+    conninfo=settings.database_url,
     open=False,  # start pool manually
-    max_size=10,  # number of connections
+    max_size=settings.db_pool_max_size,  # number of connections
+)
+
+_QUERY_TARGET = re.compile(
+    r"^\s*(?:--[^\n]*\n\s*)*(SELECT|INSERT\s+INTO|UPDATE|DELETE\s+FROM|WITH)\b"
+    r"(?:[\s\S]*?\bFROM\s+([\w.]+))?",
+    re.IGNORECASE,
+)
+
+
+def query_name(query: str, caller: str) -> str:
+    """
+    Builds a stable, low-cardinality name for a SQL statement.
+
+    Combines the calling service function with the statement's operation and
+    target table, e.g. ``update_interview_status:UPDATE
+    candidate_interview_question_session``.
+    """
+    query = str(query)
+    match = _QUERY_TARGET.match(query)
+    if not match:
+        return caller
+    operation = match.group(1).split()[0].upper()
+    if operation in ("UPDATE", "INSERT", "DELETE"):
+        table = query[match.end(1) :].split(None, 1)[0]
+    else:
+        table = match.group(2) or ""
+    return f"{caller}:{operation} {table}".rstrip()
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w%])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_PLAIN_SELECT = re.compile(r"^\s*(?:--[^\n]*\n\s*)*SELECT\b", re.IGNORECASE)
+# locking reads, advisory locks and sequence bumps: replaying them with
+# ANALYZE would take the locks again, or wait on the request's own
+_SIDE_EFFECTS = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(?:KEY\s+)?SHARE\b"
+    r"|\bpg_\w+\s*\(|\b(?:nextval|setval)\s*\(",
+    re.IGNORECASE,
 )
 
 
+def sanitize_query(query: str) -> str:
+    """Collapses whitespace and masks inline literals so logs carry no data."""
+    query = _STRING_LITERAL.sub("?", str(query))
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def safe_to_analyze(query: str) -> bool:
+    """Whether ``query`` is a plain SELECT that takes no locks when re-run."""
+    query = str(query)
+    return bool(_PLAIN_SELECT.match(query)) and not _SIDE_EFFECTS.search(query)
+
+
+class QueryExplainer:
+    """
+    Captures plans for slow statements on a dedicated side connection, in
+    the spirit of ``auto_explain``.
+
+    Plain, lock-free SELECTs are re-run under ``EXPLAIN (ANALYZE,
+    BUFFERS)``; everything else (writes, ``FOR UPDATE``, advisory locks)
+    only gets a plain ``EXPLAIN``, so nothing is applied or locked twice
+    while the original transaction may still be open. At most
+    one plan is captured at a time and samples arriving meanwhile are
+    dropped, so a burst of slow queries can't pile load onto the database.
+    """
+
+    def __init__(self):
+        self._conn: psycopg.AsyncConnection | None = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    def submit(self, name: str, query, params) -> None:
+        if (
+            self._lock.locked()
+            or random.random() >= settings.slow_query_explain_sample_rate
+        ):
+            return
+        task = asyncio.create_task(self._explain(name, query, params))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _connection(self) -> psycopg.AsyncConnection:
+        if self._conn is None or self._conn.closed:
+            self._conn = await psycopg.AsyncConnection.connect(
+                settings.database_url,
+                autocommit=True,
+                # interpolate parameters client-side: EXPLAIN is a utility
+                # statement and can't take server-side bind parameters
+                cursor_factory=psycopg.AsyncClientCursor,
+            )
+            await self._conn.execute("SET statement_timeout = '30s'")
+            # never queue behind the locks the explained request still holds
+            await self._conn.execute("SET lock_timeout = '1s'")
+        return self._conn
+
+    async def _explain(self, name: str, query, params) -> None:
+        async with self._lock:
+            options = (
+                "ANALYZE, BUFFERS, FORMAT JSON"
+                if safe_to_analyze(query)
+                else "FORMAT JSON"
+            )
+            try:
+                conn = await self._connection()
+                async with conn.cursor() as cur:
+                    await cur.execute(f"EXPLAIN ({options}) {query}", params)
+                    (plan,) = await cur.fetchone()
+            except Exception:
+                logger.warning("could not capture plan for %s", name, exc_info=True)
+                return
+            logger.warning("plan for slow query %s: %s", name, json.dumps(plan))
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+
+explainer = QueryExplainer()
+
+
+class InstrumentedCursor:
+    """
+    Thin proxy around an AsyncCursor that names and times every statement.
+
+    The query name is taken from the service function that issued the
+    ``execute`` call, so existing ``await cur.execute(...)`` call sites need
+    no changes. Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are
+    logged in sanitized form and sampled for a plan by ``explainer``.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, query, params=None, **kwargs):
+        caller = sys._getframe(1).f_code.co_name
+        return self._execute(query_name(query, caller), query, params, **kwargs)
+
+    def executemany(self, query, params_seq, **kwargs):
+        caller = sys._getframe(1).f_code.co_name
+        return self._executemany(query_name(query, caller), query, params_seq, **kwargs)
+
+    async def _execute(self, name: str, query, params, **kwargs):
+        with span(name, kind="client", **{"db.system": "postgresql"}):
+            started = time.perf_counter()
+            await self._cursor.execute(query, params, **kwargs)
+            self._check_slow(name, started, query, params)
+        return self
+
+    async def _executemany(self, name: str, query, params_seq, **kwargs):
+        with span(name, kind="client", **{"db.system": "postgresql"}):
+            started = time.perf_counter()
+            await self._cursor.executemany(query, params_seq, **kwargs)
+            # a batch has no single parameter set to explain with
+            self._check_slow(name, started, query, params_seq, explain=False)
+        return self
+
+    def _check_slow(
+        self, name: str, started: float, query, params, explain: bool = True
+    ) -> None:
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms < settings.slow_query_threshold_ms:
+            return
+        logger.warning(
+            "slow query %s took %.1f ms: %s", name, elapsed_ms, sanitize_query(query)
+        )
+        if explain:
+            explainer.submit(name, query, params)
+
+
 async def get_connection():
     """
     Acquires a database connection and cursor from the global pool.
@@ -28,4 +211,8 @@ async def get_connection():
     async with pool.connection() as conn:
         conn.row_factory = dict_row
         async with conn.cursor() as cur:
-            yield conn, cur
+            yield conn, InstrumentedCursor(cur)
+
+
+# get_connection for code outside FastAPI's dependency injection
+open_connection = asynccontextmanager(get_connection)
@@ -1,15 +1,15 @@
 from uuid import UUID
-import os
+import secrets
 
 import jwt
-from dotenv import load_dotenv
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, Header, HTTPException, Query, Request, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
 
+from src.shared.config import settings
+
 security = HTTPBearer()
-load_dotenv()
-JWT_SECRET: str = os.getenv("JWT_SECRET", "")
+optional_security = HTTPBearer(auto_error=False)
 
 
 class UserPayload(BaseModel):
@@ -25,6 +25,18 @@ class UserPayload(BaseModel):
     user_id: UUID
 
 
+def decode_access_token(token: str) -> UserPayload:
+    """
+    Decodes and validates an access token issued at login.
+
+    Raises:
+        jwt.PyJWTError | pydantic.ValidationError: If the token is invalid,
+            expired, or its payload is malformed.
+    """
+    payload = jwt.decode(token, key=settings.jwt_secret, algorithms=["HS256"])
+    return UserPayload(**payload)
+
+
 async def has_access(
     request: Request, auth_creds: HTTPAuthorizationCredentials = Depends(security)
 ):
@@ -40,11 +52,7 @@ async def has_access(
     """
 
     try:
-        payload = jwt.decode(
-            auth_creds.credentials, key=JWT_SECRET, algorithms=["HS256"]
-        )
-
-        user = UserPayload(**payload)
+        user = decode_access_token(auth_creds.credentials)
 
         request.state.user = user
 
@@ -56,3 +64,47 @@ async def has_access(
             detail="Invalid token",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def has_stream_access(
+    request: Request,
+    token: str = Query(default=""),
+    auth_creds: HTTPAuthorizationCredentials | None = Depends(optional_security),
+):
+    """
+    ``has_access`` for streams a browser opens with ``EventSource``, which
+    can't set headers: the JWT may come as ``?token=`` instead of a Bearer
+    header, as for the realtime relay WebSocket.
+
+    Raises:
+        HTTPException: If neither carries a valid token (401 Unauthorized).
+    """
+
+    try:
+        request.state.user = decode_access_token(
+            auth_creds.credentials if auth_creds else token
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def has_admin_access(x_admin_token: str = Header(default="")):
+    """
+    Guards operational endpoints with the shared ``ADMIN_API_TOKEN``.
+
+    Raises:
+        HTTPException: If no admin token is configured or it does not match
+            the ``X-Admin-Token`` header (403 Forbidden).
+    """
+
+    if not settings.admin_api_token or not secrets.compare_digest(
+        x_admin_token, settings.admin_api_token
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+
+import psycopg
+from psycopg import sql
+
+from src.shared.config import settings
+
+logger = logging.getLogger(__name__)
+
+RECONNECT_MAX_SECONDS = 30.0
+
+
+class NotificationListener:
+    """
+    A single ``LISTEN`` connection per worker that fans Postgres ``NOTIFY``
+    payloads out to in-process handlers.
+
+    The connection lives outside the pool, so any number of subscribers
+    waiting on events cost no pool checkouts. Handlers run on the event loop
+    and must not block. Notifications sent while the connection is down are
+    lost; after every reconnect each handler is called with ``None`` so it
+    can resynchronise from the database.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[Callable[[str | None], None]]] = defaultdict(
+            list
+        )
+        self._task: asyncio.Task | None = None
+
+    def register(self, channel: str, handler: Callable[[str | None], None]) -> None:
+        self._handlers[channel].append(handler)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        delay = 1.0
+        reconnecting = False
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    settings.database_url, autocommit=True
+                ) as conn:
+                    for channel in self._handlers:
+                        await conn.execute(
+                            sql.SQL("LISTEN {}").format(sql.Identifier(channel))
+                        )
+                    delay = 1.0
+                    if reconnecting:
+                        self._dispatch_all(None)
+                    async for notify in conn.notifies():
+                        self._dispatch(notify.channel, notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "notification listener disconnected, retrying in %.0f s",
+                    delay,
+                    exc_info=True,
+                )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_SECONDS)
+            # anything published while we were away is gone
+            reconnecting = True
+
+    def _dispatch(self, channel: str, payload: str | None) -> None:
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("notification handler for %s failed", channel)
+
+    def _dispatch_all(self, payload: str | None) -> None:
+        for channel in self._handlers:
+            self._dispatch(channel, payload)
+
+
+listener = NotificationListener()
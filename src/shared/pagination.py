@@ -0,0 +1,60 @@
+import base64
+import datetime
+import json
+from uuid import UUID
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime.datetime, row_id) -> str:
+    """An opaque cursor pointing just after the row ``(created_at, row_id)``."""
+    key = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime.datetime, UUID]:
+    """
+    The ``(created_at, id)`` a cursor points after.
+
+    Raises:
+        ValueError: If the cursor was not produced by ``encode_cursor``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.datetime.fromisoformat(created_at), UUID(row_id)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def keyset_condition(alias: str, cursor: str | None, params: dict) -> str:
+    """
+    The ``AND ...`` clause seeking past ``cursor`` in ``created_at DESC,
+    id DESC`` order, with its values added to ``params``; empty for the
+    first page.
+
+    The clause is left out rather than switched off with ``IS NULL OR`` so
+    the row comparison always bounds the index scan.
+
+    Raises:
+        ValueError: If the cursor is invalid.
+    """
+    if cursor is None:
+        return ""
+    params["after_created_at"], params["after_id"] = decode_cursor(cursor)
+    return (
+        f"AND ({alias}.created_at, {alias}.id) < (%(after_created_at)s, %(after_id)s)"
+    )
+
+
+def keyset_page(rows: list, limit: int, key: str) -> dict:
+    """
+    A page of ``rows`` fetched with ``LIMIT limit + 1``; the extra row only
+    tells whether there is a next page.
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return {key: rows, "next_cursor": next_cursor}
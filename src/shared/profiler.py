@@ -0,0 +1,197 @@
+import asyncio
+import os
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from src.shared.config import settings
+
+PROFILER_MAX_SECONDS = 60
+PROFILE_REQUEST_HEADER = b"x-profile-request"
+KEPT_REQUEST_PROFILES = 20
+PROFILE_ID_PATTERN = re.compile(r"[0-9a-f]{16}")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler running in its own thread.
+
+    Every ``interval`` it snapshots the stacks of all other threads via
+    ``sys._current_frames`` and counts them in collapsed form
+    (``thread;outer;...;inner``), which flamegraph.pl / speedscope read
+    directly. Nothing is installed in the profiled code, so the overhead is
+    just the sampling thread itself.
+
+    Args:
+        interval: Seconds between samples.
+        thread_id: Only sample this thread (default: all threads).
+        anchor_frame: Only keep samples whose stack passes through this
+            frame; used to isolate one request on the event loop thread.
+    """
+
+    def __init__(
+        self, interval: float, thread_id: int | None = None, anchor_frame=None
+    ):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.anchor_frame = anchor_frame
+        self.samples: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.anchor_frame = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                if self.thread_id is not None and thread_id != self.thread_id:
+                    continue
+                stack = []
+                anchored = self.anchor_frame is None
+                while frame is not None:
+                    if frame is self.anchor_frame:
+                        anchored = True
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                if not anchored:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.items())
+
+
+_worker_lock = asyncio.Lock()
+
+
+async def profile_worker(seconds: float) -> str:
+    """
+    Samples every thread of this worker for ``seconds`` and returns the
+    collapsed stacks. Only one worker profile runs at a time.
+    """
+    seconds = min(seconds, PROFILER_MAX_SECONDS)
+    async with _worker_lock:
+        profiler = SamplingProfiler(settings.profiler_interval_ms / 1000)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.to_thread(profiler.stop)
+    return profiler.collapsed()
+
+
+def _profile_path(profile_id: str) -> Path:
+    return Path(settings.profiler_output_dir) / f"{profile_id}.collapsed"
+
+
+def _save_request_profile(profile_id: str, profile: str) -> None:
+    """
+    Writes a request profile where every worker can read it, keeping the
+    newest ``KEPT_REQUEST_PROFILES`` across all workers.
+    """
+    path = _profile_path(profile_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix(f".{os.getpid()}.tmp")
+    temp.write_text(profile)
+    os.replace(temp, path)
+    kept = []
+    for old in path.parent.glob("*.collapsed"):
+        try:
+            kept.append((old.stat().st_mtime, old))
+        except FileNotFoundError:
+            pass  # another worker pruned it meanwhile
+    for _, old in sorted(kept, reverse=True)[KEPT_REQUEST_PROFILES:]:
+        old.unlink(missing_ok=True)
+
+
+async def get_request_profile(profile_id: str) -> str | None:
+    """A request profile recorded by any worker; None if unknown or pruned."""
+    if not PROFILE_ID_PATTERN.fullmatch(profile_id):
+        return None
+    try:
+        return await asyncio.to_thread(_profile_path(profile_id).read_text)
+    except FileNotFoundError:
+        return None
+
+
+class RequestProfilerMiddleware:
+    """
+    Profiles a single request end-to-end when it carries the
+    ``X-Profile-Request`` header together with a valid admin token.
+
+    Only samples taken while the event loop is running this request's
+    coroutine chain are kept. The collapsed stacks are written to
+    ``PROFILER_OUTPUT_DIR`` under the id returned in the ``X-Profile-Id``
+    response header, so the admin profile endpoint serves them from
+    whichever worker the fetch lands on. Installed only when
+    ``PROFILER_ENABLED`` is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._is_tagged(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = secrets.token_hex(8)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = SamplingProfiler(
+            settings.profiler_interval_ms / 1000,
+            thread_id=threading.get_ident(),
+            anchor_frame=sys._getframe(),
+        )
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            # joining the sampler can take up to one interval; keep the loop
+            # serving other requests meanwhile
+            await asyncio.to_thread(profiler.stop)
+            await asyncio.to_thread(
+                _save_request_profile,
+                profile_id,
+                f"# {scope['method']} {scope['path']} {elapsed_ms:.1f} ms\n"
+                + profiler.collapsed(),
+            )
+
+    @staticmethod
+    def _is_tagged(scope) -> bool:
+        headers = dict(scope["headers"])
+        if PROFILE_REQUEST_HEADER not in headers or not settings.admin_api_token:
+            return False
+        token = headers.get(b"x-admin-token", b"").decode()
+        return secrets.compare_digest(token, settings.admin_api_token)
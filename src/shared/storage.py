@@ -0,0 +1,241 @@
+import asyncio
+import fcntl
+import hashlib
+import os
+import secrets
+import shutil
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from src.shared.config import settings
+
+
+class ChecksumMismatch(ValueError):
+    pass
+
+
+class PartTooLarge(ValueError):
+    pass
+
+
+class UploadSealed(ValueError):
+    pass
+
+
+class ObjectStore(ABC):
+    """
+    Multipart object storage: parts are streamed in one at a time (in any
+    order, retried freely) and joined into a single object on completion,
+    the model S3 and GCS multipart uploads use. Backends register in
+    ``STORAGE_BACKENDS`` and are selected with ``STORAGE_BACKEND``.
+    """
+
+    @classmethod
+    @abstractmethod
+    def from_settings(cls) -> "ObjectStore":
+        """The backend configured from ``settings``."""
+
+    @abstractmethod
+    async def put_part(
+        self,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+        expected_sha256: str,
+        max_size: int,
+    ) -> int:
+        """
+        Streams one part to storage, verifying its SHA-256 on the way.
+
+        Returns:
+            int: The part size in bytes.
+
+        Raises:
+            ChecksumMismatch: The streamed bytes don't hash to ``expected_sha256``.
+            PartTooLarge: The stream exceeded ``max_size`` bytes.
+            UploadSealed: Completion of the upload has started.
+        """
+
+    @abstractmethod
+    async def complete(self, upload_id: str, part_numbers: list[int], key: str) -> None:
+        """
+        Seals the upload against further parts and joins them, in order,
+        into object ``key``. The parts are kept until ``abort``, so a
+        completion whose bookkeeping fails can be retried.
+        """
+
+    def url(self, key: str) -> str:
+        """
+        Where clients fetch object ``key``: under ``STORAGE_PUBLIC_URL``, or
+        the bare key when that is not set. Never a server-side path.
+        """
+        if settings.storage_public_url:
+            return f"{settings.storage_public_url}/{key}"
+        return key
+
+    @abstractmethod
+    async def abort(self, upload_id: str) -> None:
+        """Discards every stored part of the upload."""
+
+
+def _copy_range(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copies ``size`` bytes in the kernel; reflinks on filesystems that can."""
+    remaining = size
+    try:
+        while remaining:
+            copied = os.copy_file_range(src_fd, dst_fd, remaining)
+            if not copied:
+                break
+            remaining -= copied
+        return
+    except OSError:
+        pass  # e.g. EXDEV on old kernels; fall through with what's left
+    try:
+        while remaining:
+            copied = os.sendfile(dst_fd, src_fd, None, remaining)
+            if not copied:
+                break
+            remaining -= copied
+        return
+    except OSError:
+        pass
+    with (
+        open(src_fd, "rb", closefd=False) as src,
+        open(dst_fd, "wb", closefd=False) as dst,
+    ):
+        shutil.copyfileobj(src, dst)
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Object store on the local filesystem (or a mounted volume).
+
+    Parts live under ``<root>/.uploads/<upload_id>/`` until ``abort``;
+    objects are written to ``<root>/<key>`` via a temp file and an atomic
+    rename, so readers never see a half-assembled object. A ``.sealed``
+    marker, set under an exclusive ``flock`` that part writes take shared,
+    keeps parts from being replaced once completion has started, across
+    worker processes.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    @classmethod
+    def from_settings(cls) -> "LocalObjectStore":
+        return cls(settings.storage_local_root)
+
+    def _parts_dir(self, upload_id: str) -> Path:
+        return self.root / ".uploads" / upload_id
+
+    def _part_path(self, upload_id: str, part_number: int) -> Path:
+        return self._parts_dir(upload_id) / f"{part_number:06d}.part"
+
+    def _sealed(self, upload_id: str) -> Path:
+        return self._parts_dir(upload_id) / ".sealed"
+
+    def _locked(self, upload_id: str, exclusive: bool) -> int:
+        fd = os.open(self._parts_dir(upload_id) / ".lock", os.O_CREAT | os.O_RDWR)
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        return fd
+
+    def _replace_part(self, upload_id: str, temp: Path, target: Path) -> None:
+        try:
+            fd = self._locked(upload_id, exclusive=False)
+        except FileNotFoundError:
+            # the parts were discarded after a completion or abort meanwhile
+            raise UploadSealed(f"upload {upload_id} is closed") from None
+        try:
+            if self._sealed(upload_id).exists():
+                raise UploadSealed(f"upload {upload_id} is being completed")
+            os.replace(temp, target)
+        finally:
+            os.close(fd)
+
+    def _seal(self, upload_id: str) -> None:
+        self._parts_dir(upload_id).mkdir(parents=True, exist_ok=True)
+        # waits for part writes already replacing a file to finish
+        fd = self._locked(upload_id, exclusive=True)
+        try:
+            self._sealed(upload_id).touch()
+        finally:
+            os.close(fd)
+
+    async def put_part(
+        self,
+        upload_id: str,
+        part_number: int,
+        chunks: AsyncIterator[bytes],
+        expected_sha256: str,
+        max_size: int,
+    ) -> int:
+        target = self._part_path(upload_id, part_number)
+        if await asyncio.to_thread(self._sealed(upload_id).exists):
+            raise UploadSealed(f"upload {upload_id} is being completed")
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+        # unique temp name: a retry may race the original attempt
+        temp = target.with_suffix(f".{secrets.token_hex(4)}.tmp")
+        digest = hashlib.sha256()
+        size = 0
+        file = await asyncio.to_thread(open, temp, "wb")
+        try:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > max_size:
+                    raise PartTooLarge(f"part exceeds {max_size} bytes")
+                digest.update(chunk)
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+            if digest.hexdigest() != expected_sha256.lower():
+                raise ChecksumMismatch(
+                    f"part {part_number} sha256 is {digest.hexdigest()}"
+                )
+            await asyncio.to_thread(self._replace_part, upload_id, temp, target)
+        except BaseException:
+            file.close()
+            temp.unlink(missing_ok=True)
+            raise
+        return size
+
+    async def complete(self, upload_id: str, part_numbers: list[int], key: str) -> None:
+        await asyncio.to_thread(self._seal, upload_id)
+        await asyncio.to_thread(
+            self._assemble, upload_id, part_numbers, self.root / key
+        )
+
+    def _assemble(
+        self, upload_id: str, part_numbers: list[int], destination: Path
+    ) -> None:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        temp = destination.with_name(f".{destination.name}.{secrets.token_hex(4)}")
+        try:
+            with open(temp, "wb") as out:
+                for part_number in part_numbers:
+                    part = self._part_path(upload_id, part_number)
+                    with open(part, "rb") as src:
+                        _copy_range(
+                            src.fileno(), out.fileno(), os.fstat(src.fileno()).st_size
+                        )
+            os.replace(temp, destination)
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+
+    async def abort(self, upload_id: str) -> None:
+        await asyncio.to_thread(
+            shutil.rmtree, self._parts_dir(upload_id), ignore_errors=True
+        )
+
+
+STORAGE_BACKENDS: dict[str, type[ObjectStore]] = {"local": LocalObjectStore}
+
+
+def _build_object_store() -> ObjectStore:
+    backend = STORAGE_BACKENDS.get(settings.storage_backend)
+    if backend is None:
+        raise ValueError(f"Unknown STORAGE_BACKEND {settings.storage_backend!r}")
+    return backend.from_settings()
+
+
+object_store = _build_object_store()
@@ -0,0 +1,336 @@
+import contextvars
+import functools
+import inspect
+import json
+import random
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+
+from src.shared.config import settings
+
+SERVICE_NAME = "resume-ai-interview"
+
+# attributes copied from a parent span onto every child span
+INHERITED_ATTRIBUTES = ("interview_id",)
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span:
+    """
+    A single timed operation, shaped after the OpenTelemetry span data model.
+
+    Unsampled spans are still created so the sampling decision propagates to
+    their children, but they are never handed to the exporter.
+    """
+
+    __slots__ = (
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "kind",
+        "attributes",
+        "start_time_unix_nano",
+        "end_time_unix_nano",
+        "status_code",
+        "status_message",
+        "sampled",
+    )
+
+    def __init__(self, name: str, kind: str, parent: "Span | None", sampled: bool):
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else None
+        self.name = name
+        self.kind = kind
+        self.attributes: dict = {}
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: int | None = None
+        self.status_code = "UNSET"
+        self.status_message = ""
+        self.sampled = sampled
+
+        if parent:
+            for key in INHERITED_ATTRIBUTES:
+                if key in parent.attributes:
+                    self.attributes[key] = parent.attributes[key]
+
+    def set_attribute(self, key: str, value) -> None:
+        if value is not None:
+            self.attributes[key] = (
+                value if isinstance(value, (int, float, bool)) else str(value)
+            )
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.status_code = "ERROR"
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def to_dict(self) -> dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "kind": f"SPAN_KIND_{self.kind.upper()}",
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {
+                "code": f"STATUS_CODE_{self.status_code}",
+                "message": self.status_message,
+            },
+        }
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": value}
+
+
+def _resource_spans(spans: list[Span]) -> dict:
+    """Wraps finished spans in an OTLP/JSON ``resourceSpans`` envelope."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": SERVICE_NAME}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [span.to_dict() for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class FileSpanExporter:
+    """Appends one OTLP/JSON document per batch to a local file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: list[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(_resource_spans(spans)) + "\n")
+
+    def shutdown(self) -> None:
+        pass
+
+
+class CollectorSpanExporter:
+    """Posts batches to an OTLP/HTTP collector (``<endpoint>/v1/traces``)."""
+
+    def __init__(self, endpoint: str):
+        import httpx
+
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.client = httpx.Client(timeout=5)
+
+    def export(self, spans: list[Span]) -> None:
+        self.client.post(self.url, json=_resource_spans(spans))
+
+    def shutdown(self) -> None:
+        self.client.close()
+
+
+class BatchSpanProcessor:
+    """
+    Hands finished spans to the exporter from a background thread so that
+    exporting never runs on the event loop.
+    """
+
+    def __init__(self, exporter, max_batch: int = 512, interval: float = 2.0):
+        self.exporter = exporter
+        self.max_batch = max_batch
+        self.interval = interval
+        self.queue: deque[Span] = deque(maxlen=max_batch * 8)
+        self.wakeup = threading.Event()
+        self.stopped = False
+        self.thread = threading.Thread(
+            target=self._run, name="span-export", daemon=True
+        )
+        self.thread.start()
+
+    def on_end(self, span: Span) -> None:
+        self.queue.append(span)
+        if len(self.queue) >= self.max_batch:
+            self.wakeup.set()
+
+    def _drain(self) -> None:
+        while self.queue:
+            batch = []
+            while self.queue and len(batch) < self.max_batch:
+                batch.append(self.queue.popleft())
+            try:
+                self.exporter.export(batch)
+            except Exception:
+                # tracing must never take the API down; drop the batch
+                pass
+
+    def _run(self) -> None:
+        while not self.stopped:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            self._drain()
+
+    def shutdown(self) -> None:
+        self.stopped = True
+        self.wakeup.set()
+        self.thread.join(timeout=5)
+        self._drain()
+        self.exporter.shutdown()
+
+
+_processor: BatchSpanProcessor | None = None
+
+
+def _get_processor() -> BatchSpanProcessor:
+    global _processor
+    if _processor is None:
+        exporter = (
+            CollectorSpanExporter(settings.trace_collector_endpoint)
+            if settings.trace_collector_endpoint
+            else FileSpanExporter(settings.trace_export_path)
+        )
+        _processor = BatchSpanProcessor(exporter)
+    return _processor
+
+
+def shutdown() -> None:
+    """Flushes any buffered spans; called from the application lifespan."""
+    global _processor
+    if _processor is not None:
+        _processor.shutdown()
+        _processor = None
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """
+    Opens a span as a child of the current one.
+
+    Root spans are sampled with probability ``settings.trace_sample_ratio``; children
+    follow their parent's decision. When tracing is disabled this yields
+    ``None`` without touching the context.
+
+    Args:
+        name: Span name, e.g. ``"GET /interview/{interview_id}"``.
+        kind: OpenTelemetry span kind (internal, server, client).
+        **attributes: Initial span attributes.
+    """
+    if not settings.tracing_enabled:
+        yield None
+        return
+
+    parent = _current_span.get()
+    sampled = (
+        parent.sampled if parent else random.random() < settings.trace_sample_ratio
+    )
+    current = Span(name, kind, parent, sampled)
+    for key, value in attributes.items():
+        current.set_attribute(key, value)
+
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.record_exception(exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_time_unix_nano = time.time_ns()
+        if current.sampled:
+            _get_processor().on_end(current)
+
+
+def traced(name: str | None = None):
+    """
+    Decorator wrapping a sync or async function in a span.
+
+    If the function takes an ``interview_id`` argument it is recorded as a
+    span attribute.
+    """
+
+    def decorator(func):
+        span_name = name or func.__name__
+        signature = inspect.signature(func)
+        has_interview_id = "interview_id" in signature.parameters
+
+        def _attributes(args, kwargs) -> dict:
+            if not has_interview_id:
+                return {}
+            bound = signature.bind_partial(*args, **kwargs)
+            return {"interview_id": bound.arguments.get("interview_id")}
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name, **_attributes(args, kwargs)):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **_attributes(args, kwargs)):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute that opens a server span around the whole handler, including
+    dependency setup/teardown, so DB and LLM spans nest underneath it.
+    """
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not settings.tracing_enabled:
+            return handler
+
+        methods = ",".join(sorted(self.methods))
+
+        def _route_template(request) -> str:
+            # routers may be mounted under a prefix; recover it from the
+            # concrete path so the span name stays low-cardinality
+            path = request.scope["path"]
+            suffix = self.path_format.format(**request.path_params)
+            prefix = path[: -len(suffix)] if path.endswith(suffix) else ""
+            return prefix + self.path_format
+
+        async def traced_handler(request):
+            with span(
+                f"{methods} {_route_template(request)}",
+                kind="server",
+                interview_id=request.path_params.get("interview_id"),
+            ) as current:
+                response = await handler(request)
+                current.set_attribute("http.status_code", response.status_code)
+                return response
+
+        return traced_handler
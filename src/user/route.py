@@ -2,9 +2,10 @@ from fastapi import APIRouter, Depends, Request
 
 from src.shared.db import get_connection
 from src.shared.dependency import has_access
+from src.shared.tracing import TracedRoute
 from src.user.service import me
 
-route = APIRouter()
+route = APIRouter(route_class=TracedRoute)
 PROTECTED = [Depends(has_access)]
 
 